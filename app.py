@@ -41,6 +41,7 @@ class BackupWebHandler(BaseHTTPRequestHandler):
     _template_service = None
     _scheduler_service = None
     _handlers = None
+    _backfill_started = False
 
     @classmethod
     def _initialize_services(cls):
@@ -58,17 +59,91 @@ class BackupWebHandler(BaseHTTPRequestHandler):
         config_path = os.environ.get('CONFIG_PATH', '/config/config.yaml')
         cls._backup_config = cls._backup_config or BackupConfig(config_path)
         cls._template_service = cls._template_service or TemplateService(cls._backup_config)
+        # Shared SSH transport settings (multiplexed connections)
+        from services.ssh_transport import SSHTransport
+        SSHTransport.configure(cls._backup_config.config.get('global_settings', {}))
+        # Optional persistent JSON-RPC agents on SSH hosts for interactive filesystem calls
+        from services.remote_agent import RemoteAgentPool
+        RemoteAgentPool.configure(cls._backup_config.config.get('global_settings', {}))
+        # Configured restic image reference (used by the inventory probe and container commands)
+        from services.container_command_builder import ContainerCommandBuilder
+        ContainerCommandBuilder.configure(cls._backup_config.config.get('global_settings', {}))
+        # Snapshot list cache lifetime (backup and maintenance runs refresh it early)
+        from services.snapshot_cache import SnapshotListCache
+        SnapshotListCache.configure(cls._backup_config.config.get('global_settings', {}))
+        # Snapshot tree index location and eviction policy
+        from services.snapshot_index import SnapshotIndex
+        SnapshotIndex.configure(cls._backup_config.config.get('global_settings', {}))
+        # Stall limits for backups, maintenance and restores
+        from services.stall_watchdog import StallWatchdog
+        StallWatchdog.configure(cls._backup_config.config.get('global_settings', {}))
+        # Persistent per-repository restic cache locations and cleanup policy
+        from services.restic_cache import ResticCache
+        ResticCache.configure(cls._backup_config.config.get('global_settings', {}))
+        # Host capability inventory, warmed in the background so lookups rarely wait on a probe
+        from services.host_inventory import HostInventory
+        HostInventory.configure(cls._backup_config.config.get('global_settings', {}))
+        HostInventory.refresh_async(HostInventory.known_targets(cls._backup_config))
+        # Pull the restic image on container hosts ahead of their first backup
+        from services.restic_image_service import ResticImageService
+        ResticImageService.prepull_for_jobs(cls._backup_config)
+
+        # No backup worker survives a restart - drop running-job entries left by the previous process
+        from services.job_process_tracker import JobProcessTracker
+        JobProcessTracker().clear_all()
+
         if cls._scheduler_service is None:
-            cls._scheduler_service = SchedulerService()
+            global_settings = cls._backup_config.config.get('global_settings', {})
+            cls._scheduler_service = SchedulerService(
+                jobstore_path=os.environ.get('SCHEDULER_DB_PATH', '/var/log/highball/scheduler.sqlite'),
+                misfire_grace_time=global_settings.get('scheduler_misfire_grace_time', 14400),
+                coalesce=global_settings.get('scheduler_coalesce', True)
+            )
 
         # Register schedules (do not bring down UI if this fails)
         try:
+            from services.scheduled_tasks import bind_context
             from services.schedule_loader import bootstrap_schedules
+            bind_context(cls._backup_config, cls._scheduler_service)
             count = bootstrap_schedules(cls._backup_config, cls._scheduler_service)
             print(f"Scheduled {count} backup job(s) from config.")
         except Exception as e:
             print(f"[SCHEDULER] disabled at startup: {e}")
 
+        # Repository maintenance schedules (one discard/check per repository)
+        try:
+            from services.maintenance_bootstrap import bootstrap_maintenance_schedules
+            bootstrap_maintenance_schedules(cls._backup_config, cls._scheduler_service)
+        except Exception as e:
+            print(f"[SCHEDULER] maintenance scheduling failed at startup: {e}")
+
+        # Daily restic cache cleanup and snapshot index eviction (the persisted interval survives restarts;
+        # a run missed while down fires on start for up to a day)
+        try:
+            from services.scheduled_tasks import run_restic_cache_cleanup
+            cls._scheduler_service.add_interval_job(
+                run_restic_cache_cleanup, 'restic_cache_cleanup', 86400, misfire_grace_time=86400
+            )
+        except Exception as e:
+            print(f"[SCHEDULER] restic cache cleanup scheduling failed at startup: {e}")
+
+        # Find jobs that missed their cadence while down (before resume, so pending misfires are skipped)
+        backfill_controller, overdue_jobs = None, []
+        if not cls._backfill_started:
+            try:
+                from services.backfill_controller import BackfillController
+                backfill_controller = BackfillController(cls._backup_config, cls._scheduler_service)
+                overdue_jobs = backfill_controller.find_overdue_jobs()
+            except Exception as e:
+                print(f"[SCHEDULER] backfill check failed at startup: {e}")
+
+        # Resume only after reconciliation so persisted misfires fire once against current config
+        cls._scheduler_service.resume()
+
+        if backfill_controller is not None:
+            cls._backfill_started = True
+            backfill_controller.start(overdue_jobs)
+
         # Build handler map last; if this throws, leave _handlers=None so we retry next request
         try:
             cls._handlers = {
@@ -156,7 +231,8 @@ class BackupWebHandler(BaseHTTPRequestHandler):
                 self._handlers['restic'].get_repository_info(self, job_name)
             elif path == '/restic-snapshots':
                 job_name = params.get('job', [''])[0]
-                self._handlers['restic'].list_snapshots(self, job_name)
+                refresh = params.get('refresh', ['0'])[0] == '1'
+                self._handlers['restic'].list_snapshots(self, job_name, refresh)
             elif path == '/restic-snapshot-stats':
                 job_name = params.get('job', [''])[0]
                 snapshot_id = params.get('snapshot', [''])[0]
@@ -182,6 +258,12 @@ class BackupWebHandler(BaseHTTPRequestHandler):
                 self._handlers['config'].download_config_backup(self)
             elif path == '/api/highball/jobs':
                 self._handlers['api'].get_jobs(self)
+            elif path == '/api/highball/conflicts':
+                self._handlers['api'].get_conflicts(self)
+            elif path == '/api/highball/progress':
+                self._handlers['api'].get_progress(self)
+            elif path == '/api/highball/inventory':
+                self._handlers['api'].get_inventory(self)
             else:
                 self._send_404()
         except Exception as e:
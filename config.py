@@ -5,12 +5,18 @@ Handles loading/saving YAML config files
 """
 import os
 import yaml
+from services.job_conflict_manager import ConflictIndex
 class BackupConfig:
     """Manages the backup configuration in YAML format"""
     
     def __init__(self, config_file="/config/config.yaml"):
         self.config_file = config_file
         self.config = self.load_config()
+        self.conflict_index = ConflictIndex(self.get_backup_jobs())
+    
+    def rebuild_conflict_index(self):
+        """Rebuild resource conflict index after the whole config was replaced"""
+        self.conflict_index.rebuild(self.get_backup_jobs())
     
     def load_config(self):
         """Load config from YAML file with robust error handling"""
@@ -103,6 +109,39 @@ class BackupConfig:
                 "enable_conflict_avoidance": True,  # wait for conflicting jobs before running
                 "conflict_check_interval": 300,     # seconds between conflict checks (5 minutes)
                 "delay_notification_threshold": 300,  # seconds delay before sending notification (5 minutes)
+                "scheduler_misfire_grace_time": 14400,  # seconds a missed run may still fire after restart (per-job: misfire_grace_time)
+                "scheduler_coalesce": True,  # collapse several missed runs into one catch-up run (per-job: coalesce)
+                "enable_backfill": True,  # at startup, run jobs whose last success predates their last expected run (per-job: backfill)
+                "backfill_max_concurrent": 1,  # backfill lane concurrency cap, most overdue jobs first
+                "ssh_multiplexing": True,  # reuse one SSH connection per user@host (ControlMaster)
+                "ssh_control_persist_seconds": 300,  # idle SSH master connections close after this long
+                "remote_agent_enabled": False,  # browse/path/overwrite checks via a persistent python3 agent per SSH host
+                "remote_agent_idle_seconds": 600,  # idle remote agents are closed after this long
+                "restic_image": "restic/restic:0.18.0",  # container image for restic on SSH sources (pre-pulled on job save and change)
+                "restic_cache_enabled": True,  # keep a persistent restic cache per repository on each executing host
+                "restic_cache_dir": "/var/cache/highball/restic",  # local cache root (mount a volume here to survive restarts)
+                "restic_cache_remote_dir": ".cache/highball/restic",  # cache root on SSH hosts, relative to the user's home
+                "restic_cache_max_size_mb": 2048,  # per repository; cached data packs are trimmed above this
+                "restic_cache_max_age_days": 30,  # caches unused this long are removed by the daily cleanup
+                "snapshot_cache_ttl_seconds": 900,  # cached snapshot lists are re-read after this long (refreshed after backups/maintenance)
+                "snapshot_index_enabled": True,  # browse restic snapshots from a local tree index built on first browse
+                "snapshot_index_path": "/var/cache/highball/snapshot_index.sqlite",  # SQLite index file
+                "snapshot_index_after_backup": False,  # index each new snapshot right after its backup
+                "snapshot_index_max_snapshots": 20,  # indexed snapshots kept; least recently browsed are dropped first
+                "snapshot_index_max_unused_days": 30,  # indexes not browsed this long are dropped
+                "snapshot_index_full_rebuild_every": 10,  # snapshots are indexed as restic diff deltas on an indexed predecessor; every Nth is a full listing
+                "host_inventory_ttl_seconds": 900,  # cached host tool/runtime inventory is refreshed in the background after this long
+                "bandwidth_budget": 0,  # KiB/s shared by all running backups, 0 = unlimited (per-job cap: bandwidth_limit)
+                "bandwidth_budget_hours": "",  # "HH:MM-HH:MM" window when the budget applies, empty = always
+                "bandwidth_budget_jobs": 2,  # budget/destination caps split into this many slots; the last free slot is halved for later jobs so the total never exceeds the cap
+                "destination_bandwidth_limits": {},  # destination host -> KiB/s cap
+                "restic_repository_performance": {},  # repo_uri -> read_concurrency/pack_size (MiB)/connections/compression (per-job: restic_performance, tuning: restic_autotune)
+                "watchdog": {  # stall limits in seconds per operation type (startup = idle limit before first output; null = no limit)
+                    "backup": {"idle_seconds": 1800, "max_seconds": None},
+                    "maintenance": {"idle_seconds": 3600, "max_seconds": 14400},
+                    "restore": {"startup_seconds": 30, "idle_seconds": 60, "max_seconds": None}
+                },
+                "rsync_parallel_paths": 2,  # rsync source paths transferred at once per job (per-job: parallel_paths)
                 "notification": {
                     "telegram": {
                         "enabled": False,          # enable/disable telegram notifications globally
@@ -124,6 +163,9 @@ class BackupConfig:
                 "maintenance": {
                     "discard_schedule": "0 3 * * *",         # daily at 3am - combines forget+prune operations
                     "check_schedule": "0 2 * * 0",           # weekly Sunday 2am (staggered from backups)
+                    "retry_base_delay_minutes": 5,           # first retry when deferred by conflicts, doubles per attempt
+                    "retry_max_delay_minutes": 120,          # backoff ceiling
+                    "retry_max_attempts": 8,                 # then wait for the next scheduled run
                     "retention_policy": {
                         "keep_last": 7,        # always keep last 7 snapshots regardless of age
                         "keep_hourly": 6,      # keep 6 most recent hourly snapshots (6 hours coverage)
@@ -166,12 +208,14 @@ class BackupConfig:
         if 'backup_jobs' not in self.config:
             self.config['backup_jobs'] = {}
         self.config['backup_jobs'][job_name] = job_config
+        self.conflict_index.update_job(job_name, job_config)
         self.save_config()
     
     def delete_backup_job(self, job_name):
         """Delete a backup job"""
         if 'backup_jobs' in self.config and job_name in self.config['backup_jobs']:
             del self.config['backup_jobs'][job_name]
+            self.conflict_index.remove_job(job_name)
             self.save_config()
             return True
         return False
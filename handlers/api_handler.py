@@ -51,6 +51,58 @@ class ApiHandler:
         except Exception as e:
             self._send_error_response(handler, f'API error: {str(e)}')
     
+    def get_conflicts(self, handler):
+        """GET /api/highball/conflicts - Return resource conflict graph between jobs"""
+        try:
+            graph = self.backup_config.conflict_index.get_conflict_graph()
+            self._send_json_response(handler, {
+                'success': True,
+                'data': graph,
+                'api_version': '1.0'
+            })
+        except Exception as e:
+            self._send_error_response(handler, f'API error: {str(e)}')
+    
+    def get_progress(self, handler):
+        """GET /api/highball/progress - Return live progress for running backups (optional ?job=name)"""
+        try:
+            from services.backup_progress import BackupProgressTracker
+            
+            params = parse_qs(urlparse(handler.path).query)
+            job_name = params.get('job', [None])[0]
+            
+            if job_name:
+                data = BackupProgressTracker.get(job_name)
+            else:
+                data = BackupProgressTracker.get_all()
+            
+            self._send_json_response(handler, {
+                'success': True,
+                'data': data,
+                'api_version': '1.0'
+            })
+        except Exception as e:
+            self._send_error_response(handler, f'API error: {str(e)}')
+    
+    def get_inventory(self, handler):
+        """GET /api/highball/inventory - Return cached host capabilities and running remote agents (?refresh=1 re-probes in the background)"""
+        try:
+            from services.host_inventory import HostInventory
+            from services.remote_agent import RemoteAgentPool
+            
+            params = parse_qs(urlparse(handler.path).query)
+            if params.get('refresh', ['0'])[0] == '1':
+                HostInventory.refresh_async(HostInventory.known_targets(self.backup_config))
+            
+            self._send_json_response(handler, {
+                'success': True,
+                'data': HostInventory.get_all(),
+                'agents': RemoteAgentPool.get_all(),
+                'api_version': '1.0'
+            })
+        except Exception as e:
+            self._send_error_response(handler, f'API error: {str(e)}')
+    
     def _get_jobs_data(self, state_filter: Optional[str], requested_fields: Optional[set]) -> List[Dict[str, Any]]:
         """Get job data with filtering"""
         # Get job configurations
@@ -59,6 +111,11 @@ class ApiHandler:
         # Get job status logs
         logs = self.job_manager.get_job_logs()
         
+        # Live progress for running backups
+        from services.backup_progress import BackupProgressTracker
+        progress = BackupProgressTracker.get_all()
+        runs = self.job_manager.job_logger.get_all_job_runs()
+        
         result = []
         
         for job_name, job_config in jobs.items():
@@ -89,7 +146,9 @@ class ApiHandler:
                 'last_message': job_log.get('message', ''),
                 'source_config': job_config.get('source_config', {}),
                 'dest_config': job_config.get('dest_config', {}),
-                'respect_conflicts': job_config.get('respect_conflicts', True)
+                'respect_conflicts': job_config.get('respect_conflicts', True),
+                'progress': progress.get(job_name),
+                'last_run_metrics': self._get_last_run_metrics(runs.get(job_name, []))
             }
             
             # Apply field filtering if requested
@@ -110,6 +169,18 @@ class ApiHandler:
         
         return result
     
+    def _get_last_run_metrics(self, job_runs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Transfer metrics of the most recent run that reported them"""
+        for run in reversed(job_runs):
+            if run.get('metrics'):
+                return {
+                    'started_at': run.get('started_at'),
+                    'dry_run': run.get('dry_run'),
+                    'success': run.get('success'),
+                    **run['metrics']
+                }
+        return None
+    
     def _authenticate(self, handler) -> bool:
         """Future: Check authentication (bearer token, API key, etc.)"""
         # Example implementation for future use:
@@ -18,28 +18,30 @@ class BackupHandler:
         
         # Initialize modular components
         self.executor = BackupExecutor(backup_config)
-        self.conflict_handler = BackupConflictHandler(backup_config)
         self.notification_dispatcher = BackupNotificationDispatcher(backup_config)
+        self.conflict_handler = BackupConflictHandler(backup_config, self.notification_dispatcher)
 
     # ---------------------------
     # Public entry points
     # ---------------------------
-    def run_backup_job(self, handler, job_name, dry_run=True, source="manual"):
+    def run_backup_job(self, handler, job_name, dry_run=True, source="manual", on_complete=None):
         """
         Kick off a backup job in the background and (if handler is provided) redirect immediately.
         When handler is None (scheduler/CLI), no HTTP responses are sent.
+        on_complete(success) is called from the worker thread once the run has finished.
+        Returns True if the worker thread was started.
         """
         if job_name not in self.backup_config.config.get("backup_jobs", {}):
             if handler is not None:
                 TemplateService.send_error_response(handler, f"Job '{job_name}' not found")
-            return
+            return False
 
         job_config = self.backup_config.config["backup_jobs"][job_name]
 
         # Start background worker
         t = threading.Thread(
             target=self._run_job_background,
-            args=(job_name, job_config, dry_run, source),
+            args=(job_name, job_config, dry_run, source, on_complete),
             daemon=True,
         )
         t.start()
@@ -50,6 +52,7 @@ class BackupHandler:
         # Only redirect when serving an HTTP request
         if handler is not None:
             TemplateService.send_redirect(handler, "/")
+        return True
 
     def run_backup_job_headless(self, job_name, dry_run=True, source="scheduler"):
         """
@@ -57,46 +60,77 @@ class BackupHandler:
         """
         self.run_backup_job(handler=None, job_name=job_name, dry_run=dry_run, source=source)
     
-    def run_backup_job_with_conflict_check(self, handler, job_name, dry_run=True, source="schedule"):
+    def run_backup_job_with_conflict_check(self, handler, job_name, dry_run=True, source="schedule", chain=None,
+                                           on_complete=None):
         """
         Run backup job with runtime conflict detection and avoidance.
         Will wait for conflicting jobs to finish before running.
+        The job stays registered as running until the background run finishes,
+        then run_after dependents are triggered (chain lists jobs already run in this pipeline).
+        Returns True once the run has started; on_complete(success) fires after it finishes.
+        Returns False (after calling on_complete(False)) if the run could not be started,
+        e.g. the job was deleted while waiting out a conflict.
         """
         if job_name not in self.backup_config.config.get("backup_jobs", {}):
             if handler is not None:
                 TemplateService.send_error_response(handler, f"Job '{job_name}' not found")
-            return
+            return False
 
         job_config = self.backup_config.config["backup_jobs"][job_name]
         
         # Handle conflicts and delays
-        delay_info = self.conflict_handler.wait_for_conflicts_to_resolve(job_name, job_config)
+        delay_info = self.conflict_handler.wait_for_conflicts_to_resolve(job_name, job_config, source)
         
-        # Send delay notification if needed
-        if delay_info and delay_info['total_wait_time'] > 0:
+        # Send delay notification if needed (skipped when an ETA warning already went out)
+        if delay_info and delay_info['total_wait_time'] > 0 and not delay_info.get('notified'):
             self.notification_dispatcher.send_delay_notification(
                 job_name, delay_info['total_wait_time'], delay_info['conflicting_jobs'], source
             )
 
         # Register this job as running
         self.conflict_handler.register_running_job(job_name)
+
+        def _on_complete(success):
+            # Always unregister the job, even if it fails
+            self.conflict_handler.unregister_running_job(job_name)
+            self._trigger_dependents(job_name, success, dry_run, chain)
+            if on_complete is not None:
+                on_complete(success)
         
         try:
             # Run the actual backup job
-            self.run_backup_job(handler, job_name, dry_run, source)
-        finally:
-            # Always unregister the job, even if it fails
+            started = self.run_backup_job(handler, job_name, dry_run, source, on_complete=_on_complete)
+        except Exception:
+            self.conflict_handler.unregister_running_job(job_name)
+            raise
+        if not started:
             self.conflict_handler.unregister_running_job(job_name)
+            if on_complete is not None:
+                on_complete(False)
+            return False
+        return True
+
+    def _trigger_dependents(self, job_name, success, dry_run, chain):
+        """Start run_after dependents of a finished job"""
+        try:
+            from services.job_chain_service import JobChainService
+            JobChainService(self.backup_config, self.scheduler_service).trigger_dependents(
+                job_name, success, dry_run, chain
+            )
+        except Exception as e:
+            print(f"WARNING: Failed to trigger dependents of job '{job_name}': {str(e)}")
 
     # ---------------------------
     # Background worker
     # ---------------------------
-    def _run_job_background(self, job_name, job_config, dry_run, trigger_source):
+    def _run_job_background(self, job_name, job_config, dry_run, trigger_source, on_complete=None):
         """
         Runs in a daemon thread: executes backup and handles notifications.
         """
+        success = False
         try:
             result = self.executor.execute_backup(job_name, job_config, dry_run, trigger_source)
+            success = result["success"]
             
             # Send appropriate notification
             if result["success"]:
@@ -112,4 +146,7 @@ class BackupHandler:
         except Exception as e:
             # Log and notify about execution failure
             self.executor.log_job_error(job_name, str(e))
-            self.notification_dispatcher.send_failure_notification(job_name, str(e), dry_run)
\ No newline at end of file
+            self.notification_dispatcher.send_failure_notification(job_name, str(e), dry_run)
+        finally:
+            if on_complete is not None:
+                on_complete(success)
@@ -2,7 +2,7 @@
 Backup command builder
 Handles rsync command construction and path building
 """
-import subprocess
+import os
 import shlex
 from dataclasses import dataclass
 from typing import List
@@ -23,9 +23,55 @@ class BackupCommandBuilder:
     def __init__(self, backup_config):
         self.backup_config = backup_config
 
-    def build_rsync_command(self, job_config, job_name, dry_run):
+    def build_rsync_commands(self, job_config, job_name, dry_run):
+        """
+        Build one rsync command per configured source path.
+        A single path keeps its exact location. With several paths and path_subdirectories
+        enabled, each tree is copied into <dest>/<basename> so --delete stays scoped to its own
+        tree; without it the job keeps its original layout (first path into <dest>/ only).
+        """
+        path_configs = self._get_source_path_configs(job_config)
+        if len(path_configs) <= 1 or not job_config.get("path_subdirectories", False):
+            if len(path_configs) > 1:
+                skipped = ", ".join(path_config["path"] for path_config in path_configs[1:])
+                print(f"WARNING: Job '{job_name}' only backs up its first source path - set path_subdirectories: true "
+                      f"to also back up {skipped} (each path then lands in <dest>/<name>; move or remove the "
+                      f"existing tree at the destination root)")
+            path_config = path_configs[0] if path_configs else None
+            return [self.build_rsync_command(job_config, job_name, dry_run, path_config)]
+
+        errors = self.source_path_name_errors(path_configs)
+        if errors:
+            raise ValueError(f"Job '{job_name}': {'; '.join(errors)}")
+
+        return [
+            self.build_rsync_command(job_config, job_name, dry_run, {**path_config, "path": path_config["path"].rstrip("/")})
+            for path_config in path_configs
+        ]
+
+    @staticmethod
+    def source_path_name_errors(path_configs):
+        """Problems copying several source paths into <dest>/<basename> (shared or empty names)"""
+        errors = []
+        seen_names = {}
+        for path_config in path_configs:
+            path = path_config["path"].rstrip("/")
+            name = os.path.basename(path)
+            if not name:
+                errors.append(f"Source path '{path_config['path']}' cannot be combined with other paths")
+            elif name in seen_names:
+                errors.append(
+                    f"Source paths '{seen_names[name]}' and '{path}' share the directory name '{name}' "
+                    f"and would overwrite each other at the destination"
+                )
+            else:
+                seen_names[name] = path
+        return errors
+
+    def build_rsync_command(self, job_config, job_name, dry_run, path_config=None):
         """
         Build the command to execute and display information.
+        path_config ({path, includes, excludes}) selects one source_paths entry.
         Returns CommandInfo with exec_argv, log_cmd_str, src_display, dst_display.
         """
         global_settings = self.backup_config.config.get("global_settings", {})
@@ -43,20 +89,30 @@ class BackupCommandBuilder:
             rsync_cmd = [rsync_bin] + rsync_options
         else:
             # Use default options
-            rsync_cmd = [rsync_bin, "-a", "--info=stats1", "--delete", "--delete-excluded"]
+            rsync_cmd = [rsync_bin, "-a", "--info=stats2", "--delete", "--delete-excluded"]
         
         # Add dry run options if needed
         if dry_run:
             rsync_cmd.extend(["--dry-run", "--verbose"])
-
-        # Add include/exclude patterns
-        for include in job_config.get("includes", []) or []:
+        elif "--info=progress2" not in rsync_cmd:
+            # Overall transfer progress for live reporting; also keeps output flowing for the
+            # stall watchdog's idle limit when custom options are otherwise quiet
+            rsync_cmd.append("--info=progress2")
+
+        # Bandwidth cap in KiB/s (set from the bandwidth budget at launch, or per job)
+        bandwidth_limit = job_config.get("bandwidth_limit")
+        if bandwidth_limit and not any(opt.startswith("--bwlimit") for opt in rsync_cmd):
+            rsync_cmd.append(f"--bwlimit={int(bandwidth_limit)}")
+
+        # Add include/exclude patterns (per-path patterns first, then job-wide)
+        path_config = path_config or {}
+        for include in (path_config.get("includes") or []) + (job_config.get("includes", []) or []):
             rsync_cmd.extend(["--include", include])
-        for exclude in job_config.get("excludes", []) or []:
+        for exclude in (path_config.get("excludes") or []) + (job_config.get("excludes", []) or []):
             rsync_cmd.extend(["--exclude", exclude])
 
         # Build source and destination paths
-        source_str = self._build_source_path(job_config)
+        source_str = self._build_source_path(job_config, path_config.get("path"))
         dest_str = self._build_destination_path(job_config, job_name, global_settings)
 
         # Default local execution argv
@@ -81,7 +137,20 @@ class BackupCommandBuilder:
             dst_display=dest_str
         )
 
-    def _build_source_path(self, job_config):
+    def _get_source_path_configs(self, job_config):
+        """Normalized source_paths entries; empty for legacy path/source_string configs"""
+        sc = job_config.get("source_config", {}) or {}
+        if sc.get("source_string") or sc.get("path"):
+            return []
+
+        path_configs = []
+        for entry in sc.get("source_paths") or []:
+            entry = entry if isinstance(entry, dict) else {"path": str(entry)}
+            if (entry.get("path") or "").strip():
+                path_configs.append({**entry, "path": entry["path"].strip()})
+        return path_configs
+
+    def _build_source_path(self, job_config, path=None):
         """
         Build the source path for rsync based on config fields.
         Accepts:
@@ -89,13 +158,14 @@ class BackupCommandBuilder:
           - source_config.username / source_config.hostname / source_config.path (legacy)
           - source_config.username / source_config.hostname / source_config.source_paths[] (new multi-path format)
           - or flat source_string
+        An explicit path (one source_paths entry) overrides the configured path.
         """
         sc = job_config.get("source_config", {})
         # Allow either `user` or `username`
         user = sc.get("user") or sc.get("username")
         # Allow either `host` or `hostname`
         host = sc.get("host") or sc.get("hostname")
-        path = sc.get("path")
+        path = path or sc.get("path")
         
         # Handle new multi-path format - use first path if no direct path specified
         if not path and sc.get("source_paths"):
@@ -219,17 +289,13 @@ class BackupCommandBuilder:
         remote_rsync_list[-2] = remote_src_path
         remote_cmd_str = shlex.join(remote_rsync_list)
 
-        return [ssh_bin, ssh_target, "--", remote_cmd_str]
+        from services.ssh_transport import SSHTransport
+        return SSHTransport.build_command(ssh_target, remote_cmd_str, ssh_bin=ssh_bin, end_of_options=True)
 
     def _discover_binary_path(self, binary_name, fallback_path):
-        """Discover binary path using 'which' command with fallback"""
-        try:
-            result = subprocess.run(['which', binary_name], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0 and result.stdout.strip():
-                return result.stdout.strip()
-        except Exception:
-            pass
-        return fallback_path
+        """Look up binary path in the cached local host inventory, with fallback"""
+        from services.host_inventory import HostInventory
+        return HostInventory.get().tool_path(binary_name) or fallback_path
 
 
 @dataclass
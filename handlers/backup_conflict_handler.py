@@ -4,16 +4,22 @@ Manages job conflicts and delay tracking
 """
 import time
 from services.job_logger import JobLogger
+from services.duration_estimator import DurationEstimator
 
 
 class BackupConflictHandler:
     """Handles conflict detection and resolution for backup jobs"""
 
-    def __init__(self, backup_config):
+    # Floor for ETA-driven rechecks so a bad estimate can't cause a busy loop
+    min_conflict_check_interval = 30
+
+    def __init__(self, backup_config, notification_dispatcher=None):
         self.backup_config = backup_config
         self.job_logger = JobLogger()
+        self.notification_dispatcher = notification_dispatcher
+        self.duration_estimator = DurationEstimator(self.job_logger)
 
-    def wait_for_conflicts_to_resolve(self, job_name, job_config):
+    def wait_for_conflicts_to_resolve(self, job_name, job_config, source="schedule"):
         """
         Wait for conflicting jobs to finish and return delay information.
         Returns dict with conflict info or None if no conflicts.
@@ -30,24 +36,37 @@ class BackupConflictHandler:
         # Track conflict delay for logging and notifications
         wait_start_time = None
         conflicting_jobs = []
+        notified = False
         
         # Wait for any conflicting jobs to finish
-        while conflict_manager.has_conflicting_jobs_running(job_name, job_config):
+        while True:
+            current_conflicts = conflict_manager.get_conflicting_running_jobs(job_name, job_config)
+            if not current_conflicts:
+                break
+            
+            eta_seconds = self.estimate_conflict_wait(current_conflicts)
+            
             if wait_start_time is None:
                 wait_start_time = time.time()
-                running_jobs = conflict_manager.get_running_jobs()
-                conflicting_jobs = list(running_jobs)
-                conflicting_resources = self._get_conflicting_resources(job_config, running_jobs, conflict_manager)
+                conflicting_jobs = list(current_conflicts)
+                conflicting_resources = self._get_conflicting_resources(job_config, current_conflicts, conflict_manager)
+                eta_text = f" (estimated wait {eta_seconds / 60:.1f} minutes)" if eta_seconds is not None else ""
                 
-                print(f"INFO: Job '{job_name}' delayed due to resource conflicts with: {', '.join(running_jobs)}")
+                print(f"INFO: Job '{job_name}' delayed due to resource conflicts with: {', '.join(current_conflicts)}{eta_text}")
                 print(f"INFO: Conflicting resources: {conflicting_resources}")
                 
                 # Log initial conflict detection
-                conflict_msg = f"Job delayed waiting for conflicting jobs: {', '.join(running_jobs)}"
+                conflict_msg = f"Job delayed waiting for conflicting jobs: {', '.join(current_conflicts)}{eta_text}"
                 self.job_logger.log_job_status(job_name, "waiting-conflict", conflict_msg)
+                
+                # Warn up front when history predicts a long wait
+                if self.notification_dispatcher and eta_seconds is not None:
+                    notified = self.notification_dispatcher.send_delay_notification(
+                        job_name, eta_seconds, conflicting_jobs, source, predicted=True
+                    )
             
-            check_interval = conflict_manager.get_conflict_check_interval()
-            print(f"INFO: Job '{job_name}' waiting {check_interval} seconds for conflicting jobs to finish")
+            check_interval = self._get_next_check_interval(conflict_manager, eta_seconds)
+            print(f"INFO: Job '{job_name}' waiting {check_interval:.0f} seconds for conflicting jobs to finish")
             time.sleep(check_interval)
         
         # Calculate total wait time and log if there was a delay
@@ -59,11 +78,29 @@ class BackupConflictHandler:
             
             return {
                 'total_wait_time': total_wait_time,
-                'conflicting_jobs': conflicting_jobs
+                'conflicting_jobs': conflicting_jobs,
+                'notified': notified
             }
         
         return None
 
+    def estimate_conflict_wait(self, conflicting_jobs):
+        """Estimate seconds until all conflicting jobs finish, None if any lacks history"""
+        remaining = []
+        for running_job in conflicting_jobs:
+            job_remaining = self.duration_estimator.estimate_running_job_remaining(running_job)
+            if job_remaining is None:
+                return None
+            remaining.append(job_remaining)
+        return max(remaining) if remaining else None
+
+    def _get_next_check_interval(self, conflict_manager, eta_seconds):
+        """Recheck when conflicts are expected to clear, capped at the configured interval"""
+        check_interval = conflict_manager.get_conflict_check_interval()
+        if eta_seconds is None:
+            return check_interval
+        return min(check_interval, max(eta_seconds, self.min_conflict_check_interval))
+
     def register_running_job(self, job_name):
         """Register job as currently running"""
         from services.job_conflict_manager import RuntimeConflictManager
@@ -78,20 +115,12 @@ class BackupConflictHandler:
 
     def _get_conflicting_resources(self, job_config, running_jobs, conflict_manager):
         """Get description of conflicting resources"""
-        job_sources, job_destinations = conflict_manager.get_job_resources(job_config)
+        conflict_index = self.backup_config.conflict_index
         
         conflicts = []
         for running_job in running_jobs:
-            if running_job in self.backup_config.config.get("backup_jobs", {}):
-                running_config = self.backup_config.config["backup_jobs"][running_job]
-                running_sources, running_destinations = conflict_manager.get_job_resources(running_config)
-                
-                shared_sources = job_sources.intersection(running_sources)
-                shared_destinations = job_destinations.intersection(running_destinations)
-                
-                if shared_sources:
-                    conflicts.append(f"shared sources: {', '.join(shared_sources)}")
-                if shared_destinations:
-                    conflicts.append(f"shared destinations: {', '.join(shared_destinations)}")
+            shared = conflict_index.get_shared_resources(job_config, running_job)
+            if shared:
+                conflicts.append(f"{running_job}: {', '.join(sorted(shared))}")
         
         return "; ".join(conflicts) if conflicts else "unknown resource conflict"
\ No newline at end of file
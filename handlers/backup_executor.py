@@ -2,11 +2,20 @@
 Backup execution service
 Handles the core backup execution, command building, and logging
 """
-import subprocess
+import threading
 import time
 from datetime import datetime
 import shlex
 from services.job_logger import JobLogger
+from services.backup_progress import BackupProgressTracker
+from services.bandwidth_budget import BandwidthBudget
+from services.restic_performance import ResticPerformance, ResticAutoTuner
+from services.snapshot_cache import SnapshotListCache
+from services.snapshot_index import SnapshotIndex
+from services.snapshot_stats_cache import SnapshotStatsCache
+from services.run_metrics import RunMetricsCollector, combine_run_metrics
+from services.stall_watchdog import StallWatchdog
+from .backup_command_builder import CommandInfo
 from .command_builder_factory import CommandBuilderFactory
 
 
@@ -21,6 +30,21 @@ class BackupExecutor:
     def execute_backup(self, job_name, job_config, dry_run, trigger_source):
         """Execute backup and return result with timing information"""
         start_time = time.time()
+        started_at = datetime.now().isoformat()
+        
+        global_settings = self.backup_config.config.get("global_settings", {})
+        configured_job = job_config
+        
+        # Bandwidth share for this run (released when it finishes so later launches rebalance)
+        if not dry_run:
+            bandwidth_limit = BandwidthBudget.allocate(job_name, job_config, global_settings)
+            if bandwidth_limit:
+                job_config = {**job_config, "bandwidth_limit": bandwidth_limit}
+        
+        # Restic performance options: repository and job settings plus auto-tuned values
+        if job_config.get("dest_type") == "restic":
+            performance = ResticPerformance.resolve(job_name, configured_job, global_settings)
+            job_config = {**job_config, "restic_performance": performance}
         
         try:
             result = self._execute_backup(job_name, job_config, dry_run, trigger_source)
@@ -36,19 +60,34 @@ class BackupExecutor:
                 message = f'Backup completed with return code {result["return_code"]}'
             
             self.job_logger.log_job_status(job_name, status, message)
-            self.job_logger.log_job_execution(job_name, result["log_content"])
+            self.job_logger.record_job_run(
+                job_name, started_at, duration, result["success"], dry_run, metrics=result.get("metrics")
+            )
+            if result["success"] and not dry_run and ResticAutoTuner.enabled_for(configured_job):
+                ResticAutoTuner().record_run(job_name, configured_job, global_settings, result.get("metrics"))
+            if result["success"] and not dry_run and job_config.get("dest_type") == "restic":
+                # New snapshot: re-list the repository so the browser opens on fresh data
+                SnapshotListCache.refresh_async(configured_job)
+                snapshot_id = (result.get("metrics") or {}).get("snapshot_id")
+                if snapshot_id:
+                    SnapshotStatsCache.fill_async(configured_job, snapshot_id)
+                if SnapshotIndex.index_after_backup and snapshot_id:
+                    SnapshotIndex.build_async(configured_job, snapshot_id)
             
             return result
             
         except Exception as e:
             duration = time.time() - start_time
             self.log_job_error(job_name, str(e))
+            self.job_logger.record_job_run(job_name, started_at, duration, False, dry_run)
             return {
                 "success": False,
                 "return_code": -1,
                 "duration": duration,
                 "log_content": f"ERROR: {str(e)}"
             }
+        finally:
+            BandwidthBudget.release(job_name)
 
     def log_job_start(self, job_name, dry_run, source):
         """Log job start status"""
@@ -56,7 +95,7 @@ class BackupExecutor:
             "Dry run started" if dry_run else "Backup started"
         ) + f" (triggered by {source})"
         try:
-            self.job_logger.log_job_status(job_name, "started", started_msg)
+            self.job_logger.log_job_status(job_name, "started", started_msg, dry_run=dry_run)
         except Exception:
             pass
 
@@ -66,12 +105,18 @@ class BackupExecutor:
         self.job_logger.log_job_execution(job_name, f"ERROR: {error_message}", "ERROR")
 
     def _execute_backup(self, job_name, job_config, dry_run, trigger_source):
-        """Execute rsync command and log output"""
+        """Execute backup command(s) and log output"""
         timestamp = datetime.now().isoformat()
         mode_text = "DRY RUN" if dry_run else "REAL BACKUP"
 
-        # Build command using appropriate builder via factory
-        command_info = self.command_factory.build_command(job_config, job_name, dry_run)
+        # Build commands using appropriate builder via factory (rsync: one per source path)
+        commands = self.command_factory.build_commands(job_config, job_name, dry_run)
+        if len(commands) > 1 and job_config.get("bandwidth_limit"):
+            # Concurrent per-path transfers split the job's bandwidth limit between them
+            lanes = min(len(commands), self._get_parallel_paths(job_config))
+            path_job_config = {**job_config, "bandwidth_limit": max(1, int(job_config["bandwidth_limit"]) // lanes)}
+            commands = self.command_factory.build_commands(path_job_config, job_name, dry_run)
+        command_info = commands[0] if len(commands) == 1 else self._combine_command_info(commands)
         
         # Prepare log content
         log_content = self._build_log_header(
@@ -91,36 +136,153 @@ class BackupExecutor:
         source_config = job_config.get('source_config', {})
         dest_type = job_config.get('dest_type')
         
+        # Output is streamed to the job log as it arrives; only a bounded head/tail stays in memory
+        self.job_logger.log_job_execution(job_name, log_content)
+        log_stream = self.job_logger.open_job_execution_log(job_name)
+        tool = 'restic' if dest_type == 'restic' else 'rsync'
+        BackupProgressTracker.start(job_name, tool, part_count=len(commands) if len(commands) > 1 else 0)
+        metrics_collector = RunMetricsCollector(tool)
+        execution_start = time.time()
+        path_metrics = None
+        
         try:
-            if source_type == 'ssh' and source_config.get('hostname') and dest_type == 'restic':
+            if len(commands) > 1:
+                # Multi-path rsync: one transfer per source path on a bounded pool
+                execution_result, path_metrics = self._execute_paths_parallel(
+                    job_name, commands, timeout, log_stream, self._get_parallel_paths(job_config)
+                )
+            elif source_type == 'ssh' and source_config.get('hostname') and dest_type == 'restic':
                 # SSH + Restic: Use container execution via CommandExecutionService
-                execution_result = self._execute_via_container_ssh(command_info, source_config, timeout)
+                on_line = self._make_log_writer(job_name, log_stream, metrics_collector)
+                watchdog = StallWatchdog('backup', job_name, cleanup=StallWatchdog.remote_container_cleanup(
+                    source_config['username'], source_config['hostname'], job_name,
+                    job_config.get('container_runtime', 'docker')
+                ))
+                execution_result = self._execute_via_container_ssh(
+                    command_info, source_config, timeout, on_line, watchdog
+                )
             else:
-                # Local or non-container execution: Use traditional subprocess
-                execution_result = self._execute_via_subprocess(command_info, timeout)
+                # Local or non-container execution: stream subprocess output
+                on_line = self._make_log_writer(job_name, log_stream, metrics_collector)
+                execution_result = self._execute_via_subprocess(
+                    command_info, timeout, on_line, StallWatchdog('backup', job_name)
+                )
             
             log_content += f"\nSTDOUT:\n{execution_result.stdout}\n"
             log_content += f"\nSTDERR:\n{execution_result.stderr}\n"
             log_content += f"\nRETURN CODE: {execution_result.returncode}\n"
             success = execution_result.success
+            completion_message = f"RETURN CODE: {execution_result.returncode}"
 
         except Exception as e:
             log_content += f"\nERROR: {str(e)}\n"
             success = False
             execution_result = type("Result", (), {"returncode": -1})()
+            completion_message = f"ERROR: {str(e)}"
+        finally:
+            BackupProgressTracker.finish(job_name)
+            if log_stream is not None:
+                log_stream.close()
 
-        # Log detailed execution
+        # Log completion (output itself was already streamed)
         try:
-            self.job_logger.log_job_execution(job_name, log_content)
+            self.job_logger.log_job_execution(job_name, completion_message, "INFO" if success else "ERROR")
         except Exception:
             pass
 
+        duration = time.time() - execution_start
+        if path_metrics is not None:
+            metrics = combine_run_metrics(tool, path_metrics, duration)
+        else:
+            metrics = metrics_collector.finalize(duration)
+
         return {
             "success": success,
             "return_code": execution_result.returncode,
             "log_content": log_content,
+            "metrics": metrics,
         }
 
+    def _execute_paths_parallel(self, job_name, commands, timeout, log_stream, max_workers):
+        """Run one rsync per source path concurrently; returns an aggregate result and per-path metrics"""
+        from concurrent.futures import ThreadPoolExecutor
+        from services.command_execution_service import ExecutionResult
+        
+        write_lock = threading.Lock()
+
+        def run_path(command_info):
+            collector = RunMetricsCollector('rsync')
+            on_line = self._make_log_writer(
+                job_name, log_stream, collector, prefix=f"[{command_info.src_display}] ", lock=write_lock,
+                progress_part=command_info.src_display
+            )
+            path_start = time.time()
+            watchdog = StallWatchdog('backup', f"{job_name}:{command_info.src_display}")
+            try:
+                result = self._execute_via_subprocess(command_info, timeout, on_line, watchdog)
+            except Exception as e:
+                result = ExecutionResult.exception_result(e, "local")
+            return result, collector.finalize(time.time() - path_start)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"rsync-{job_name}") as pool:
+            outcomes = list(pool.map(run_path, commands))
+
+        # Aggregate into one result: success only if every path succeeded, first failure's code wins
+        stdout_sections = []
+        stderr_sections = []
+        for command_info, (result, _) in zip(commands, outcomes):
+            section = f"--- {command_info.src_display} (return code {result.returncode}) ---"
+            stdout_sections.append(f"{section}\n{result.stdout}")
+            stderr_sections.append(f"{section}\n{result.stderr}")
+
+        failed = [result for result, _ in outcomes if not result.success]
+        aggregate = ExecutionResult(
+            success=not failed,
+            returncode=failed[0].returncode if failed else 0,
+            stdout="\n".join(stdout_sections),
+            stderr="\n".join(stderr_sections),
+            execution_type="local"
+        )
+        return aggregate, [metrics for _, metrics in outcomes]
+
+    def _get_parallel_paths(self, job_config):
+        """Concurrent rsync transfers per job (per-job parallel_paths overrides rsync_parallel_paths)"""
+        global_settings = self.backup_config.config.get("global_settings", {})
+        value = job_config.get("parallel_paths", global_settings.get("rsync_parallel_paths", 2))
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return 2
+
+    @staticmethod
+    def _combine_command_info(commands):
+        """Single CommandInfo describing several per-path commands for the log header"""
+        return CommandInfo(
+            exec_argv=[],
+            log_cmd_str="\n".join(command.log_cmd_str for command in commands),
+            src_display=", ".join(command.src_display for command in commands),
+            dst_display=commands[0].dst_display
+        )
+
+    @staticmethod
+    def _make_log_writer(job_name, log_stream, metrics_collector=None, prefix="", lock=None, progress_part=None):
+        """Build on_line callback feeding live progress and metrics and appending other output to the job log"""
+        def write_line(stream_name, line):
+            # Progress updates only feed live state - they would flood the log
+            if BackupProgressTracker.observe(job_name, line, part=progress_part):
+                return True
+            if metrics_collector is not None and stream_name == 'stdout':
+                metrics_collector.observe(line)
+            if log_stream is not None:
+                stream_prefix = "[stderr] " if stream_name == 'stderr' else ""
+                if lock is None:
+                    log_stream.write(f"{prefix}{stream_prefix}{line}\n")
+                else:
+                    with lock:
+                        log_stream.write(f"{prefix}{stream_prefix}{line}\n")
+            return False
+        return write_line
+
     def _get_timeout(self, dry_run):
         """Get timeout configuration for backup execution"""
         global_settings = self.backup_config.config.get("global_settings", {})
@@ -151,13 +313,13 @@ EXCLUDES: {job_config.get('excludes', [])}
 {mode_text} OUTPUT:
 """
     
-    def _execute_via_container_ssh(self, command_info, source_config, timeout):
+    def _execute_via_container_ssh(self, command_info, source_config, timeout, on_line=None, watchdog=None):
         """Execute container command via SSH using CommandExecutionService pattern from repository initialization"""
         from services.command_execution_service import CommandExecutionService, ExecutionConfig
         
-        # Configure execution with backup timeout
+        # Configure execution with backup timeout (stalls and absolute limits are the watchdog's job)
         backup_config = ExecutionConfig(
-            timeout=timeout or 3600,  # Default 1 hour if no timeout
+            timeout=timeout,
             capture_output=True,
             text=True
         )
@@ -168,31 +330,16 @@ EXCLUDES: {job_config.get('excludes', [])}
         result = executor.execute_container_via_ssh(
             source_config['hostname'],
             source_config['username'],
-            command_info.exec_argv
+            command_info.exec_argv,
+            on_line=on_line,
+            watchdog=watchdog
         )
         
         return result
     
-    def _execute_via_subprocess(self, command_info, timeout):
-        """Execute command via traditional subprocess for local/non-container operations"""
-        try:
-            if timeout is None:
-                result = subprocess.run(command_info.exec_argv, capture_output=True, text=True)
-            else:
-                result = subprocess.run(command_info.exec_argv, capture_output=True, text=True, timeout=timeout)
-            
-            # Convert subprocess result to ExecutionResult-like format
-            return type("ExecutionResult", (), {
-                "success": result.returncode == 0,
-                "returncode": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr
-            })()
-            
-        except subprocess.TimeoutExpired:
-            return type("ExecutionResult", (), {
-                "success": False,
-                "returncode": -1,
-                "stdout": "",
-                "stderr": f"Command timed out after {timeout} seconds"
-            })()
\ No newline at end of file
+    def _execute_via_subprocess(self, command_info, timeout, on_line=None, watchdog=None):
+        """Execute command locally, streaming output line by line (timeout None waits indefinitely)"""
+        from services.command_execution_service import CommandExecutionService, ExecutionConfig
+        
+        executor = CommandExecutionService(ExecutionConfig(timeout=timeout))
+        return executor.execute_streaming(command_info.exec_argv, on_line, watchdog=watchdog)
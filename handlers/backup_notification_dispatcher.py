@@ -28,21 +28,23 @@ class BackupNotificationDispatcher:
         except Exception as notify_error:
             print(f"WARNING: Failed to send job failure notification: {str(notify_error)}")
 
-    def send_delay_notification(self, job_name, delay_seconds, conflicting_jobs, source):
-        """Send notification about job delay due to conflicts"""
+    def send_delay_notification(self, job_name, delay_seconds, conflicting_jobs, source, predicted=False):
+        """Send notification about job delay due to conflicts (predicted=True for an ETA before the wait)"""
         # Check if delay is significant enough to notify
         if delay_seconds < self._get_delay_notification_threshold():
-            return
+            return False
             
         try:
             from services.notification_service import NotificationService
             notifier = NotificationService(self.backup_config)
             
             delay_minutes = delay_seconds / 60
-            notifier.send_job_delay_notification(job_name, delay_minutes, conflicting_jobs, source)
-            print(f"INFO: Sent delay notification for job '{job_name}' (delayed {delay_minutes:.1f} minutes)")
+            notifier.send_job_delay_notification(job_name, delay_minutes, conflicting_jobs, source, predicted)
+            print(f"INFO: Sent delay notification for job '{job_name}' ({'expected' if predicted else 'delayed'} {delay_minutes:.1f} minutes)")
+            return True
         except Exception as e:
             print(f"WARNING: Failed to send delay notification for job '{job_name}': {str(e)}")
+            return False
 
     def _get_delay_notification_threshold(self):
         """Get minimum delay time before sending notification (in seconds)"""
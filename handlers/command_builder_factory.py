@@ -35,4 +35,16 @@ class CommandBuilderFactory:
         if dest_type == 'restic':
             return builder.build_restic_command(job_config, job_name, dry_run)
         else:
-            return builder.build_rsync_command(job_config, job_name, dry_run)
\ No newline at end of file
+            return builder.build_rsync_command(job_config, job_name, dry_run)
+    
+    def build_commands(self, job_config, job_name, dry_run):
+        """
+        Build all commands a backup run needs.
+        Restic backs up every path in one command; rsync gets one command per source path.
+        """
+        dest_type = job_config.get('dest_type', '')
+        builder = self.get_builder(dest_type)
+        
+        if dest_type == 'restic':
+            return [builder.build_restic_command(job_config, job_name, dry_run)]
+        return builder.build_rsync_commands(job_config, job_name, dry_run)
\ No newline at end of file
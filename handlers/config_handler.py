@@ -200,9 +200,19 @@ class ConfigHandler:
             if not isinstance(new_config, dict):
                 raise ValueError("Configuration must be a valid YAML dictionary")
             
+            # Source paths copied into per-path directories must not share a name
+            from services.job_validator import JobValidator
+            for job_name, job_config in (new_config.get('backup_jobs') or {}).items():
+                if isinstance(job_config, dict) and job_config.get('dest_type') != 'restic':
+                    name_errors = JobValidator.validate_source_path_names(job_config.get('source_config'))
+                    if name_errors:
+                        raise ValueError(f"Job '{job_name}': {'; '.join(name_errors)}")
+            
             # Save the new configuration
             self.backup_config.config = new_config
+            self.backup_config.rebuild_conflict_index()
             self.backup_config.save_config()
+            self._apply_restic_image()
             
             # Redirect back to raw config page
             self.template_service.send_redirect(handler, '/config/raw')
@@ -222,6 +232,8 @@ class ConfigHandler:
         """Reload configuration from file"""
         try:
             self.backup_config.config = self.backup_config.load_config()
+            self.backup_config.rebuild_conflict_index()
+            self._apply_restic_image()
             self.template_service.send_redirect(handler, '/config/raw')
         except Exception as e:
             self.template_service.send_error_response(
@@ -229,6 +241,14 @@ class ConfigHandler:
                 f"Failed to reload config: {str(e)}"
             )
 
+    def _apply_restic_image(self):
+        """Pick up a changed restic_image and pre-pull it on container hosts"""
+        try:
+            from services.restic_image_service import ResticImageService
+            ResticImageService.apply_settings(self.backup_config)
+        except Exception as e:
+            print(f"WARNING: Could not apply restic image setting: {str(e)}")
+
     def download_config_backup(self, handler):
         """Download configuration backup"""
         try:
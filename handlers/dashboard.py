@@ -11,6 +11,21 @@ from .job_display import JobDisplay
 from .form_error_handler import FormErrorHandler
 from services.job_form_data_builder import JobFormDataBuilder
 
+# Job settings only editable in YAML; preserved when a job is re-saved from the form
+YAML_ONLY_JOB_KEYS = (
+    'dry_run_on_schedule',
+    'misfire_grace_time',
+    'coalesce',
+    'run_after',
+    'run_after_condition',
+    'backfill',
+    'parallel_paths',
+    'path_subdirectories',
+    'bandwidth_limit',
+    'restic_performance',
+    'restic_autotune',
+)
+
 
 class DashboardHandler:
     """Coordinates dashboard operations using specialized modules"""
@@ -18,7 +33,7 @@ class DashboardHandler:
     def __init__(self, backup_config, template_service, scheduler_service=None):
         self.backup_config = backup_config
         self.template_service = template_service
-        self.scheduler_service = scheduler_service  # optional; may be unused for now
+        self.scheduler_service = scheduler_service  # optional; schedules are skipped without it
         self.job_manager = JobManager(backup_config)
         self.error_handler = FormErrorHandler(template_service, self.job_manager)
 
@@ -45,7 +60,10 @@ class DashboardHandler:
             '''
 
         # Generate display HTML
-        job_rows = JobDisplay.build_job_rows(jobs, logs)
+        from services.backup_progress import BackupProgressTracker
+        job_rows = JobDisplay.build_job_rows(
+            jobs, logs, self._predict_finish_times(jobs, logs), BackupProgressTracker.get_all()
+        )
         deleted_rows = JobDisplay.build_deleted_job_rows(deleted_jobs, self.job_manager)
 
         # Render template
@@ -58,6 +76,45 @@ class DashboardHandler:
 
         self.template_service.send_html_response(handler, html_content)
 
+    def _predict_finish_times(self, jobs, logs):
+        """Predict finish time for running jobs and next scheduled runs from run history"""
+        from datetime import datetime, timedelta
+        from services.duration_estimator import DurationEstimator
+        from services.job_process_tracker import JobProcessTracker
+        from services.backup_progress import BackupProgressTracker
+        
+        estimator = DurationEstimator(self.job_manager.job_logger)
+        tracker = JobProcessTracker()
+        running_jobs = set(tracker.get_verified_running_jobs())
+        
+        finish_times = {}
+        for job_name in jobs:
+            # Live progress from the tool itself beats history-based estimates
+            live = BackupProgressTracker.get(job_name)
+            if live and live.get('seconds_remaining') is not None:
+                finish_times[job_name] = (datetime.now() + timedelta(seconds=live['seconds_remaining']), True)
+                continue
+            
+            if job_name in running_jobs:
+                age = tracker.get_job_age(job_name)
+                if age is None:
+                    continue
+                dry_run = bool(logs.get(job_name, {}).get('dry_run', False))
+                finish = estimator.predict_finish_time(job_name, dry_run, datetime.now() - age, conservative=True)
+                is_running = True
+            else:
+                scheduled = self.scheduler_service.scheduler.get_job(f"backup:{job_name}") if self.scheduler_service else None
+                if not scheduled or not scheduled.next_run_time:
+                    continue
+                dry_run = bool(scheduled.args[1]) if len(scheduled.args) > 1 else False
+                finish = estimator.predict_finish_time(job_name, dry_run, scheduled.next_run_time, conservative=True)
+                is_running = False
+            
+            if finish:
+                finish_times[job_name] = (finish, is_running)
+        
+        return finish_times
+
     def dismiss_config_warning(self, handler):
         """Dismiss config warning"""
         self.backup_config.clear_config_warning()
@@ -144,6 +201,15 @@ class DashboardHandler:
             'respect_conflicts': parsed_job.get('respect_conflicts', True)  # Default to True
         }
 
+        # Carry over YAML-only settings the form doesn't manage
+        existing_config = self.job_manager.get_job(original_job_name or new_job_name) or {}
+        for key in YAML_ONLY_JOB_KEYS:
+            if key in existing_config:
+                job_config[key] = existing_config[key]
+        if not existing_config and job_config['dest_type'] != 'restic':
+            # New jobs start with per-path destination directories; existing jobs opt in via YAML
+            job_config['path_subdirectories'] = True
+
         # Handle job rename
         if is_rename:
             # Remove old job
@@ -153,9 +219,7 @@ class DashboardHandler:
             job_logger = JobLogger()
             job_logger.rename_job_logs(original_job_name, new_job_name)
             # Remove old scheduled job if it exists
-            from services.scheduler_service import SchedulerService
-            scheduler = SchedulerService()
-            scheduler.remove_job(f"backup:{original_job_name}")
+            self._unschedule_job(original_job_name)
 
         # Add validation timestamps to job logger state
         JobValidator.add_validation_timestamps(
@@ -167,9 +231,12 @@ class DashboardHandler:
         # Save job
         self.job_manager.create_job(new_job_name, job_config)
         
-        # Schedule the job if it has a schedule
-        if job_config.get('enabled') and job_config.get('schedule') != 'manual':
-            self._schedule_job(new_job_name, job_config)
+        # Schedule the job if it has a schedule (removes stale schedule otherwise)
+        self._schedule_job(new_job_name, job_config)
+        
+        # Pull the restic image on the source host now rather than during the first backup
+        from services.restic_image_service import ResticImageService
+        ResticImageService.prepull_for_job(job_config)
         
         # Show success feedback with payload
         self._show_job_form_with_feedback(handler, form_data, 'success', 
@@ -177,38 +244,26 @@ class DashboardHandler:
                                         {new_job_name: job_config})
     
     def _schedule_job(self, job_name, job_config):
-        """Schedule a job if it has a valid schedule"""
-        from services.schedule_loader import _resolve_cron_string
-        from services.scheduler_service import SchedulerService
-        from handlers.backup import BackupHandler
-        
-        cron_str = _resolve_cron_string(job_config.get('schedule', 'manual'), self.backup_config)
-        if not cron_str:
+        """Schedule a job if it has a valid schedule, otherwise drop any existing schedule"""
+        if not self.scheduler_service:
             return
-        
-        # Get global settings for timezone and dry run defaults
-        global_settings = self.backup_config.config.get('global_settings', {})
-        tz = global_settings.get('scheduler_timezone', 'UTC')
-        default_dry = bool(global_settings.get('default_dry_run_on_schedule', True))
-        dry = bool(job_config.get('dry_run_on_schedule', default_dry))
-        
-        # Create backup handler and scheduler
-        backup_handler = BackupHandler(self.backup_config)
-        scheduler = SchedulerService()
-        
-        job_id = f"backup:{job_name}"
-        
-        def _run(job_name=job_name, dry_run=dry):
-            backup_handler.run_backup_job_with_conflict_check(handler=None, job_name=job_name, dry_run=dry_run, source="schedule")
-        
-        # Remove existing job and add new one
-        scheduler.remove_job(job_id)
-        scheduler.add_crontab_job(
-            func=_run,
-            job_id=job_id,
-            crontab=cron_str,
-            timezone=tz
-        )
+        from services.schedule_loader import schedule_backup_job
+        schedule_backup_job(job_name, job_config, self.backup_config, self.scheduler_service)
+        self._sync_maintenance_schedules()
+
+    def _unschedule_job(self, job_name):
+        """Remove a job's scheduled runs"""
+        if self.scheduler_service:
+            self.scheduler_service.remove_job(f"backup:{job_name}")
+            self._sync_maintenance_schedules()
+
+    def _sync_maintenance_schedules(self):
+        """Reconcile per-repository maintenance after job changes"""
+        try:
+            from services.maintenance_bootstrap import sync_maintenance_schedules
+            sync_maintenance_schedules(self.backup_config, self.scheduler_service)
+        except Exception as e:
+            print(f"WARNING: Could not update maintenance schedules: {str(e)}")
 
     def delete_backup_job(self, handler, job_name):
         """Delete backup job using job manager"""
@@ -217,6 +272,7 @@ class DashboardHandler:
             return
 
         self.job_manager.delete_job(job_name)
+        self._unschedule_job(job_name)
         self.template_service.send_redirect(handler, '/')
 
     def restore_backup_job(self, handler, job_name):
@@ -225,7 +281,8 @@ class DashboardHandler:
             self.template_service.send_redirect(handler, '/')
             return
 
-        self.job_manager.restore_job(job_name)
+        if self.job_manager.restore_job(job_name):
+            self._schedule_job(job_name, self.job_manager.get_job(job_name))
         self.template_service.send_redirect(handler, '/')
 
     def purge_backup_job(self, handler, job_name):
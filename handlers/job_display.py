@@ -9,14 +9,19 @@ class JobDisplay:
     """Formats job data for HTML display"""
     
     @staticmethod
-    def build_job_rows(jobs, logs):
+    def build_job_rows(jobs, logs, finish_times=None, progress=None):
         """Build HTML rows for active jobs table"""
         if not jobs:
-            return '<tr><td colspan="7" style="text-align: center; color: #888;">No backup jobs configured</td></tr>'
+            return '<tr><td colspan="8" style="text-align: center; color: #888;">No backup jobs configured</td></tr>'
         
+        finish_times = finish_times or {}
+        progress = progress or {}
         rows = ""
         for job_name, job_config in jobs.items():
             status = "enabled" if job_config.get('enabled', True) else "disabled"
+            finishes_at = JobDisplay.format_finish_time(finish_times.get(job_name))
+            progress_display = JobDisplay.format_progress(progress.get(job_name))
+            schedule_display = JobDisplay.format_schedule_display(job_config)
             
             # Build inspect link (always available)
             inspect_link = f'<a href="/inspect?name={html.escape(job_name)}" class="inspect-link">Inspect</a>'
@@ -30,8 +35,9 @@ class JobDisplay:
                     <td>{html.escape(job_name)}</td>
                     <td class="source-path">{source_display}</td>
                     <td class="source-path">{dest_display}</td>
-                    <td class="{status}">{status.capitalize()}</td>
-                    <td>{html.escape(job_config.get('schedule', 'manual'))}</td>
+                    <td class="{status}">{status.capitalize()}{progress_display}</td>
+                    <td>{schedule_display}</td>
+                    <td>{finishes_at}</td>
                     <td>{inspect_link}</td>
                     <td>
                         <div class="action-buttons">
@@ -220,6 +226,56 @@ class JobDisplay:
         
         return formatted_path
     
+    @staticmethod
+    def format_schedule_display(job_config):
+        """Format schedule plus any run_after upstream jobs"""
+        from services.job_chain_service import JobChainService
+        schedule = html.escape(job_config.get('schedule', 'manual'))
+        dependencies = JobChainService.parse_run_after(job_config)
+        if not dependencies:
+            return schedule
+        
+        upstream_list = ', '.join(
+            html.escape(upstream) + ('' if condition == 'success' else ' (any)')
+            for upstream, condition in dependencies
+        )
+        return f'{schedule}<br><span style="color: #888;">after: {upstream_list}</span>'
+    
+    @staticmethod
+    def format_finish_time(finish_info):
+        """Format predicted finish time ((datetime, is_running) tuple) for dashboard display"""
+        if not finish_info:
+            return '<span style="color: #888;">-</span>'
+        
+        finish_time, is_running = finish_info
+        label = finish_time.strftime("%Y-%m-%d<br>%H:%M")
+        if is_running:
+            return f'<span class="finish-estimate">{label}<br>(running)</span>'
+        return f'<span class="finish-estimate">{label}</span>'
+    
+    @staticmethod
+    def format_progress(progress):
+        """Format live backup progress (BackupProgress dict) for the status column"""
+        if not progress:
+            return ''
+        
+        parts = []
+        if progress.get('percent') is not None:
+            parts.append(f"{progress['percent']:.0f}%")
+        if progress.get('files_total'):
+            parts.append(f"{progress.get('files_done') or 0}/{progress['files_total']} files")
+        if progress.get('throughput_bps'):
+            parts.append(f"{progress['throughput_bps'] / (1024 * 1024):.1f} MB/s")
+        label = ' &middot; '.join(parts) or 'running'
+        
+        # Long silence is what separates a stuck job from a slow one
+        quiet_for = progress.get('seconds_since_output')
+        if quiet_for is not None and quiet_for >= 300:
+            label += f'<br><span style="color: #d9534f;">no output for {int(quiet_for // 60)}m</span>'
+        
+        current_file = html.escape(progress.get('current_file') or '')
+        return f'<br><span class="backup-progress" style="color: #888;" title="{current_file}">{label}</span>'
+    
     @staticmethod
     def format_timestamp(timestamp):
         """Format timestamp for compact display"""
@@ -51,6 +51,7 @@ class JobManager:
         # Move job to deleted section (clean config, no deleted_at)
         self.backup_config.config['deleted_jobs'][job_name] = job_config
         del self.backup_config.config['backup_jobs'][job_name]
+        self.backup_config.conflict_index.remove_job(job_name)
         self.backup_config.save_config()
         return True
     
@@ -66,7 +67,8 @@ class JobManager:
         # Log the restoration
         self.job_logger.log_job_status(job_name, "restored", "Job restored from deleted jobs")
         
-        self.backup_config.config['backup_jobs'][job_name] = job_config
+        self.backup_config.config.setdefault('backup_jobs', {})[job_name] = job_config
+        self.backup_config.conflict_index.update_job(job_name, job_config)
         del self.backup_config.config['deleted_jobs'][job_name]
         self.backup_config.save_config()
         return True
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import List
 from services.restic_runner import ResticRunner
 from services.command_obfuscation import obfuscate_password_in_command
+from services.ssh_transport import SSHTransport
 from .backup_command_builder import CommandInfo
 
 
@@ -158,12 +159,9 @@ class ResticCommandBuilder:
         chained_containers = ' && '.join(container_commands)
         
         # Build SSH command to execute chained container commands on remote host
-        ssh_cmd = [
-            'ssh', '-o', 'ConnectTimeout=30', '-o', 'BatchMode=yes',
-            '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
-            '-o', 'LogLevel=ERROR',  # Suppress known_hosts warnings
+        return SSHTransport.build_command(
             f"{first_command.ssh_config['username']}@{first_command.ssh_config['hostname']}",
-            chained_containers
-        ]
-        
-        return ssh_cmd
\ No newline at end of file
+            chained_containers,
+            connect_timeout=30,
+            log_level='ERROR'  # Suppress known_hosts warnings
+        )
\ No newline at end of file
@@ -252,7 +252,7 @@ class ResticHandler:
                 'error': f'Repository info failed: {str(e)}'
             }, status_code=500)
     
-    def list_snapshots(self, handler, job_name):
+    def list_snapshots(self, handler, job_name, refresh=False):
         """List all snapshots for a Restic repository"""
         try:
             job_config = self.backup_config.get_backup_job(job_name)
@@ -269,7 +269,7 @@ class ResticHandler:
                 return
             
             # Use existing ResticValidator patterns to get snapshots
-            result = ResticValidator.list_repository_snapshots(job_config)
+            result = ResticValidator.list_repository_snapshots(job_config, refresh=refresh)
             TemplateService.send_json_response(handler, result)
             
         except Exception as e:
@@ -0,0 +1,133 @@
+"""
+Async command execution service for fan-out operations
+asyncio counterpart to CommandExecutionService with global and per-host concurrency limits,
+per-task timeouts and cancellation, so N independent checks take max latency instead of the sum
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Dict, List, Optional, Union
+from services.command_execution_service import CommandExecutionService, ExecutionConfig, ExecutionResult
+
+
+class AsyncCommandExecutionService:
+    """Runs commands concurrently via asyncio subprocesses (one instance per event loop)"""
+
+    def __init__(
+        self,
+        config: Optional[ExecutionConfig] = None,
+        max_concurrency: int = 16,
+        per_host_concurrency: int = 4
+    ):
+        self.config = config or ExecutionConfig()
+        self.per_host_concurrency = per_host_concurrency
+        self._global_slots = asyncio.Semaphore(max_concurrency)
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._ssh_builder = CommandExecutionService(self.config)
+
+    @staticmethod
+    def run(coroutine: Awaitable) -> Any:
+        """Run a coroutine to completion from synchronous code (handlers, scheduler threads)"""
+        return asyncio.run(coroutine)
+
+    async def gather(self, tasks: Dict[str, Awaitable]) -> Dict[str, Any]:
+        """Await keyed tasks concurrently; returns results under the same keys"""
+        keys = list(tasks.keys())
+        results = await asyncio.gather(*tasks.values())
+        return dict(zip(keys, results))
+
+    async def execute(
+        self,
+        command: List[str],
+        host: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        execution_type: str = "local"
+    ) -> ExecutionResult:
+        """Execute one command, holding a global slot and (if host is given) a per-host slot"""
+        timeout = self.config.timeout if timeout is None else timeout
+        host_slots = self._get_host_slots(host)
+
+        async with self._global_slots:
+            if host_slots is None:
+                return await self._run_process(command, env_vars, timeout, execution_type)
+            async with host_slots:
+                return await self._run_process(command, env_vars, timeout, execution_type)
+
+    async def execute_via_ssh(
+        self,
+        hostname: str,
+        username: str,
+        command: Union[str, List[str]],
+        env_vars: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionResult:
+        """Execute command via SSH (environment exported remotely, like the sync service)"""
+        ssh_cmd = self._ssh_builder._build_ssh_command(hostname, username, command, env_vars)
+        return await self.execute(ssh_cmd, host=hostname, timeout=timeout, execution_type="ssh")
+
+    async def execute_locally(
+        self,
+        command: List[str],
+        env_vars: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionResult:
+        """Execute command locally with environment variables"""
+        return await self.execute(command, env_vars=env_vars, timeout=timeout, execution_type="local")
+
+    def _get_host_slots(self, host: Optional[str]) -> Optional[asyncio.Semaphore]:
+        """Per-host semaphore so one host isn't hit with the whole fan-out at once"""
+        if not host:
+            return None
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_slots[host]
+
+    async def _run_process(
+        self,
+        command: List[str],
+        env_vars: Optional[Dict[str, str]],
+        timeout: Optional[float],
+        execution_type: str
+    ) -> ExecutionResult:
+        """Spawn, collect output, and kill the process on timeout or cancellation"""
+        env = None
+        if env_vars:
+            env = os.environ.copy()
+            env.update(env_vars)
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env
+            )
+        except Exception as e:
+            return ExecutionResult.exception_result(e, execution_type)
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            await self._kill(process)
+            return ExecutionResult.timeout_result(execution_type)
+        except asyncio.CancelledError:
+            await self._kill(process)
+            raise
+
+        return ExecutionResult(
+            success=process.returncode == 0,
+            returncode=process.returncode,
+            stdout=stdout.decode(errors='replace'),
+            stderr=stderr.decode(errors='replace'),
+            execution_type=execution_type
+        )
+
+    @staticmethod
+    async def _kill(process):
+        """Kill a still-running process and reap it"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
@@ -0,0 +1,219 @@
+"""
+Catch-up/backfill controller
+Finds scheduled jobs that missed their cadence while Highball was down and runs them
+through a throttled lane, most overdue first
+"""
+import math
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+from services.duration_estimator import DurationEstimator
+from services.job_logger import JobLogger
+
+
+@dataclass
+class OverdueJob:
+    """A scheduled job whose last success (if any) predates its most recent expected run"""
+    job_name: str
+    dry_run: bool
+    last_success: Optional[datetime]
+    expected_at: datetime
+    cadence_seconds: float
+    staleness_seconds: float
+    expected_seconds: Optional[float] = None  # from run history, None without it
+
+    @property
+    def missed_cycles(self) -> float:
+        """Staleness relative to cadence - used to order the backfill lane"""
+        return self.staleness_seconds / self.cadence_seconds if self.cadence_seconds else 0.0
+
+    @property
+    def missed_whole_cycles(self) -> float:
+        """Completed missed cycles (infinite for jobs that never succeeded)"""
+        cycles = self.missed_cycles
+        return math.floor(cycles) if math.isfinite(cycles) else cycles
+
+
+class BackfillController:
+    """Enqueues overdue jobs at startup and runs them with a dedicated concurrency cap"""
+
+    # A lane entry is dropped when the job's regular run fires within this window (or before it would finish)
+    imminent_run_seconds = 900
+
+    def __init__(self, backup_config, scheduler_service):
+        self.backup_config = backup_config
+        self.scheduler_service = scheduler_service
+        self.job_logger = JobLogger()
+        self.duration_estimator = DurationEstimator(self.job_logger)
+
+        global_settings = backup_config.config.get('global_settings', {})
+        self.enabled = bool(global_settings.get('enable_backfill', True))
+        self.max_concurrent = max(int(global_settings.get('backfill_max_concurrent', 1)), 1)
+        self._slots = threading.Semaphore(self.max_concurrent)
+
+    def find_overdue_jobs(self, now: Optional[datetime] = None) -> List[OverdueJob]:
+        """
+        Compare each enabled scheduled job's last successful run with its cadence.
+        Call before the scheduler resumes so pending misfire catch-ups can be skipped.
+        """
+        if not self.enabled:
+            return []
+
+        from apscheduler.triggers.cron import CronTrigger
+        from services.schedule_loader import _resolve_cron_string
+
+        now = now or datetime.now().astimezone()
+        global_settings = self.backup_config.config.get('global_settings', {})
+        tz = global_settings.get('scheduler_timezone', 'UTC')
+        default_dry = bool(global_settings.get('default_dry_run_on_schedule', True))
+
+        overdue = []
+        for job_name, job_config in self.backup_config.get_backup_jobs().items():
+            if not job_config.get('enabled', False) or not job_config.get('backfill', True):
+                continue
+
+            cron_str = _resolve_cron_string(job_config.get('schedule', 'manual'), self.backup_config)
+            if not cron_str:
+                continue
+
+            # Scheduler fires its own (coalesced) misfire for this job once resumed - but only
+            # within misfire_grace_time; older misfires are dropped and must be backfilled here
+            scheduled = self.scheduler_service.scheduler.get_job(f"backup:{job_name}")
+            if scheduled and scheduled.next_run_time and scheduled.next_run_time <= now:
+                grace = scheduled.misfire_grace_time
+                if grace is None or (now - scheduled.next_run_time).total_seconds() <= grace:
+                    continue
+
+            dry_run = bool(job_config.get('dry_run_on_schedule', default_dry))
+            last_success, last_attempt = self._get_last_runs(job_name, dry_run)
+
+            trigger = CronTrigger.from_crontab(cron_str, timezone=tz)
+            next_fire = trigger.get_next_fire_time(None, now)
+            following_fire = trigger.get_next_fire_time(next_fire, next_fire + timedelta(seconds=1)) if next_fire else None
+            if not next_fire or not following_fire:
+                continue
+
+            cadence = following_fire - next_fire
+            expected_at = next_fire - cadence
+            if last_success is not None and last_success >= expected_at:
+                continue
+            # Without any recorded run there is no evidence of a miss (new job, or history predating
+            # run tracking); a job that already failed since the expected run isn't retried either
+            if last_success is None and (last_attempt is None or last_attempt >= expected_at):
+                continue
+
+            # Jobs that never succeeded have no backup at all - they go to the front of the lane
+            overdue.append(OverdueJob(
+                job_name=job_name,
+                dry_run=dry_run,
+                last_success=last_success,
+                expected_at=expected_at,
+                cadence_seconds=cadence.total_seconds(),
+                staleness_seconds=(now - last_success).total_seconds() if last_success else float('inf'),
+                expected_seconds=self._expected_seconds(job_name, dry_run)
+            ))
+
+        # Most missed whole cycles first; within the same count, shortest expected runs first so the
+        # limited lane catches up as many jobs as possible early (unknown durations go last)
+        overdue.sort(key=lambda job: (
+            -job.missed_whole_cycles,
+            job.expected_seconds if job.expected_seconds is not None else float('inf'),
+            -job.staleness_seconds
+        ))
+        return overdue
+
+    def start(self, overdue_jobs: Optional[List[OverdueJob]] = None) -> int:
+        """Start the backfill lane in a daemon thread; returns number of jobs enqueued"""
+        if overdue_jobs is None:
+            overdue_jobs = self.find_overdue_jobs()
+        if not overdue_jobs:
+            return 0
+
+        for job in overdue_jobs:
+            if job.last_success is None:
+                message = f"Backfill queued: no successful run yet (expected run at {job.expected_at.isoformat()})"
+            else:
+                message = (f"Backfill queued: last success {job.last_success.isoformat()} predates "
+                           f"expected run at {job.expected_at.isoformat()} ({job.missed_cycles:.1f} cycles stale)")
+            print(f"INFO: Job '{job.job_name}' overdue - {message}")
+            self.job_logger.log_job_execution(job.job_name, message)
+
+        thread = threading.Thread(target=self._run_lane, args=(overdue_jobs,), daemon=True)
+        thread.start()
+        print(f"INFO: Backfill lane started for {len(overdue_jobs)} job(s) (max {self.max_concurrent} concurrent)")
+        return len(overdue_jobs)
+
+    def _run_lane(self, overdue_jobs: List[OverdueJob]):
+        """Run overdue jobs in order, never more than max_concurrent at once"""
+        from handlers.backup import BackupHandler
+
+        for job in overdue_jobs:
+            self._slots.acquire()
+            reason = self._superseded_reason(job)
+            if reason:
+                print(f"INFO: Backfill of job '{job.job_name}' skipped - {reason}")
+                self.job_logger.log_job_execution(job.job_name, f"Backfill skipped: {reason}")
+                self._slots.release()
+                continue
+            try:
+                backup_handler = BackupHandler(self.backup_config, self.scheduler_service)
+                started = backup_handler.run_backup_job_with_conflict_check(
+                    handler=None, job_name=job.job_name, dry_run=job.dry_run, source="backfill",
+                    on_complete=lambda success: self._slots.release()
+                )
+                if not started:
+                    self._slots.release()
+            except Exception as e:
+                print(f"WARNING: Backfill of job '{job.job_name}' failed to start: {str(e)}")
+                self._slots.release()
+
+    def _expected_seconds(self, job_name: str, dry_run: bool) -> Optional[float]:
+        """Typical duration of the job's runs in this mode"""
+        estimate = self.duration_estimator.estimate(job_name, dry_run)
+        return estimate.expected_seconds if estimate else None
+
+    def _superseded_reason(self, job: OverdueJob) -> Optional[str]:
+        """Why a lane entry should be dropped: its regular run is in progress or about to fire"""
+        from services.job_process_tracker import JobProcessTracker
+
+        if job.job_name in JobProcessTracker().get_verified_running_jobs():
+            return "job is already running"
+
+        scheduled = self.scheduler_service.scheduler.get_job(f"backup:{job.job_name}")
+        if scheduled and scheduled.next_run_time:
+            window = max(self.imminent_run_seconds, job.expected_seconds or 0)
+            until_next = (scheduled.next_run_time - datetime.now().astimezone()).total_seconds()
+            if until_next <= window:
+                return f"regular run due at {scheduled.next_run_time.isoformat()}"
+        return None
+
+    def _get_last_runs(self, job_name: str, dry_run: bool):
+        """
+        (last success, last attempt) start times in the scheduled mode. Falls back to job_status.yaml
+        for jobs without run history - it only keeps the latest status, stamped at completion.
+        """
+        last_success = last_attempt = None
+        for run in reversed(self.job_logger.get_job_runs(job_name)):
+            if bool(run.get('dry_run')) != dry_run:
+                continue
+            try:
+                started_at = datetime.fromisoformat(run['started_at']).astimezone()
+            except (KeyError, TypeError, ValueError):
+                continue
+            last_attempt = last_attempt or started_at
+            if run.get('success'):
+                last_success = started_at
+                break
+        if last_attempt is not None:
+            return last_success, last_attempt
+
+        status = self.job_logger.get_job_status(job_name)
+        completed, failed = ("completed-dry-run", "error-dry-run") if dry_run else ("completed", "error")
+        if status.get('status') not in (completed, failed):
+            return None, None
+        try:
+            finished_at = datetime.fromisoformat(status['last_run']).astimezone()
+        except (KeyError, TypeError, ValueError):
+            return None, None
+        return (finished_at if status['status'] == completed else None), finished_at
@@ -0,0 +1,172 @@
+"""
+Live backup progress tracking
+Parses restic --json status messages and rsync --info=progress2 lines into per-run progress state
+"""
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Optional
+
+
+# rsync --info=progress2: "  1,234,567  45%   12.34MB/s    0:00:10 (xfr#12, to-chk=100/2000)"
+RSYNC_PROGRESS2_PATTERN = re.compile(
+    r'^\s*([\d,]+)\s+(\d{1,3})%\s+([\d.]+)([kMGT]?)B/s\s+(\d+:\d{2}:\d{2})'
+    r'(?:\s+\(xfr#(\d+),\s*(?:to|ir)-chk=(\d+)/(\d+)\))?'
+)
+RATE_MULTIPLIERS = {'': 1, 'k': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+@dataclass
+class BackupProgress:
+    """Progress snapshot for one running backup"""
+    job_name: str
+    tool: str
+    started_at: float = field(default_factory=time.time)
+    updated_at: Optional[float] = None       # last parsed progress update
+    last_output_at: Optional[float] = None   # last output line of any kind
+    percent: Optional[float] = None
+    bytes_done: Optional[int] = None
+    bytes_total: Optional[int] = None
+    files_done: Optional[int] = None
+    files_total: Optional[int] = None
+    throughput_bps: Optional[float] = None
+    seconds_remaining: Optional[float] = None
+    current_file: Optional[str] = None
+    parts: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # latest update per parallel source path
+    part_count: int = 0   # parallel source paths in the run (0 = single transfer)
+
+    def aggregate_parts(self):
+        """Combine per-path updates into job-level fields (paths not yet started count as 0%)"""
+        updates = list(self.parts.values())
+        self.bytes_done = sum(update.get('bytes_done') or 0 for update in updates)
+        self.throughput_bps = sum(update.get('throughput_bps') or 0 for update in updates)
+        remaining = [update['seconds_remaining'] for update in updates if update.get('seconds_remaining') is not None]
+        self.seconds_remaining = max(remaining) if remaining else None
+        if all(update.get('files_total') is not None for update in updates):
+            self.files_done = sum(update.get('files_done') or 0 for update in updates)
+            self.files_total = sum(update['files_total'] for update in updates)
+
+        # Byte-weighted once every path reports a size estimate, else the mean of per-path percentages
+        totals = [update['bytes_done'] * 100 / update['percent'] for update in updates
+                  if update.get('percent') and update.get('bytes_done') is not None]
+        if len(updates) == self.part_count and len(totals) == len(updates) and sum(totals):
+            self.percent = round(min(100.0, self.bytes_done * 100 / sum(totals)), 1)
+        else:
+            self.percent = round(sum(update.get('percent') or 0 for update in updates) / max(self.part_count, 1), 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view including derived ages for slow-vs-stuck decisions"""
+        now = time.time()
+        data = asdict(self)
+        data['elapsed_seconds'] = round(now - self.started_at, 1)
+        data['seconds_since_update'] = round(now - self.updated_at, 1) if self.updated_at else None
+        data['seconds_since_output'] = round(now - self.last_output_at, 1) if self.last_output_at else None
+        return data
+
+
+def parse_restic_status(line: str) -> Optional[Dict[str, Any]]:
+    """Parse a restic backup --json status message into progress fields"""
+    if not line.startswith('{') or '"status"' not in line:
+        return None
+    try:
+        message = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if message.get('message_type') != 'status':
+        return None
+
+    elapsed = message.get('seconds_elapsed') or 0
+    bytes_done = message.get('bytes_done', 0)
+    current_files = message.get('current_files') or []
+    return {
+        'percent': round(message.get('percent_done', 0) * 100, 1),
+        'bytes_done': bytes_done,
+        'bytes_total': message.get('total_bytes'),
+        'files_done': message.get('files_done', 0),
+        'files_total': message.get('total_files'),
+        'throughput_bps': round(bytes_done / elapsed, 1) if elapsed else None,
+        'seconds_remaining': message.get('seconds_remaining'),
+        'current_file': current_files[0] if current_files else None,
+    }
+
+
+def parse_rsync_progress2(line: str) -> Optional[Dict[str, Any]]:
+    """Parse an rsync --info=progress2 line into progress fields"""
+    match = RSYNC_PROGRESS2_PATTERN.match(line)
+    if not match:
+        return None
+
+    bytes_done, percent, rate, unit, remaining, transferred, to_check, total = match.groups()
+    hours, minutes, seconds = (int(part) for part in remaining.split(':'))
+    progress = {
+        'percent': float(percent),
+        'bytes_done': int(bytes_done.replace(',', '')),
+        'throughput_bps': float(rate) * RATE_MULTIPLIERS.get(unit, 1),
+        'seconds_remaining': hours * 3600 + minutes * 60 + seconds,
+    }
+    if total is not None:
+        progress['files_total'] = int(total)
+        progress['files_done'] = int(total) - int(to_check)
+    return progress
+
+
+class BackupProgressTracker:
+    """Process-wide registry of live progress for running backups"""
+
+    PARSERS = {
+        'restic': parse_restic_status,
+        'rsync': parse_rsync_progress2,
+    }
+
+    _progress: Dict[str, BackupProgress] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, job_name: str, tool: str, part_count: int = 0):
+        """Begin tracking a run (replaces any previous state for the job); part_count for parallel paths"""
+        with cls._lock:
+            cls._progress[job_name] = BackupProgress(job_name=job_name, tool=tool, part_count=part_count)
+
+    @classmethod
+    def observe(cls, job_name: str, line: str, part: Optional[str] = None) -> bool:
+        """Feed one output line (part names the parallel source path); returns True if it was a progress update"""
+        with cls._lock:
+            progress = cls._progress.get(job_name)
+            if progress is None:
+                return False
+            now = time.time()
+            progress.last_output_at = now
+
+            parser = cls.PARSERS.get(progress.tool)
+            update = parser(line) if parser else None
+            if not update:
+                return False
+            if part is None:
+                for key, value in update.items():
+                    setattr(progress, key, value)
+            else:
+                progress.parts[part] = update
+                progress.aggregate_parts()
+            progress.updated_at = now
+            return True
+
+    @classmethod
+    def finish(cls, job_name: str):
+        """Stop tracking a run"""
+        with cls._lock:
+            cls._progress.pop(job_name, None)
+
+    @classmethod
+    def get(cls, job_name: str) -> Optional[Dict[str, Any]]:
+        """Progress for one running job, or None"""
+        with cls._lock:
+            progress = cls._progress.get(job_name)
+            return progress.to_dict() if progress else None
+
+    @classmethod
+    def get_all(cls) -> Dict[str, Dict[str, Any]]:
+        """Progress for all running jobs keyed by job name"""
+        with cls._lock:
+            return {name: progress.to_dict() for name, progress in cls._progress.items()}
@@ -0,0 +1,122 @@
+"""
+Bandwidth budget allocator
+Divides a global bandwidth budget (KiB/s) among running backups at launch time, capped per job
+and per destination host; allocations never exceed the unused pool, and a finished job's share
+returns to the pool for the next launch
+"""
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# dest_config keys naming the destination host, in lookup order (rsync ssh/rsyncd, restic rest/sftp/s3)
+DESTINATION_HOST_KEYS = ('hostname', 'host', 'rest_hostname', 'sftp_hostname', 's3_endpoint')
+
+
+class BandwidthBudget:
+    """Process-wide registry of bandwidth limits handed to running jobs"""
+
+    _allocations: Dict[str, Dict[str, Any]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def destination_key(job_config: Dict[str, Any]) -> Optional[str]:
+        """Destination host a job sends to, for destination_bandwidth_limits lookups"""
+        dest_config = job_config.get('dest_config', {}) or {}
+        for key in DESTINATION_HOST_KEYS:
+            if dest_config.get(key):
+                return str(dest_config[key])
+        return None
+
+    @classmethod
+    def allocate(cls, job_name: str, job_config: Dict[str, Any], global_settings: Dict[str, Any],
+                 now: Optional[datetime] = None) -> Optional[int]:
+        """
+        Reserve a limit for a starting job; None means unlimited.
+        Budget and destination pools are split into bandwidth_budget_jobs equal slots; once fewer
+        than two slots are unused, a new job gets half of what is left (see _share).
+        """
+        destination = cls.destination_key(job_config)
+        job_cap = cls._to_kib(job_config.get('bandwidth_limit'))
+        destination_cap = cls._to_kib((global_settings.get('destination_bandwidth_limits') or {}).get(destination))
+        budget = cls._to_kib(global_settings.get('bandwidth_budget'))
+        slots = cls._to_kib(global_settings.get('bandwidth_budget_jobs')) or 2
+
+        with cls._lock:
+            cls._allocations.pop(job_name, None)
+            caps = [job_cap]
+
+            budget_applies = bool(budget) and cls._in_window(global_settings.get('bandwidth_budget_hours'), now)
+            if budget_applies:
+                holders = [alloc for alloc in cls._allocations.values() if alloc['budgeted']]
+                caps.append(cls._share(budget, holders, slots))
+
+            if destination_cap:
+                holders = [alloc for alloc in cls._allocations.values() if alloc['destination'] == destination]
+                caps.append(cls._share(destination_cap, holders, slots))
+
+            limits = [cap for cap in caps if cap]
+            limit = min(limits) if limits else None
+            if limit:
+                cls._allocations[job_name] = {
+                    'limit': limit,
+                    'destination': destination,
+                    'budgeted': budget_applies,
+                }
+
+        if limit:
+            print(f"INFO: Bandwidth limit for {job_name}: {limit} KiB/s")
+        return limit
+
+    @classmethod
+    def release(cls, job_name: str):
+        """Return a finished job's share to the pool"""
+        with cls._lock:
+            cls._allocations.pop(job_name, None)
+
+    @classmethod
+    def get_all(cls) -> Dict[str, Dict[str, Any]]:
+        """Current allocations (limit in KiB/s, destination, budgeted) keyed by job name"""
+        with cls._lock:
+            return {job_name: dict(alloc) for job_name, alloc in cls._allocations.items()}
+
+    @staticmethod
+    def _share(pool: int, holders, slots: int) -> int:
+        """
+        A new job's part of a pool, never more than is unused: a full slot (pool / slots) while a
+        slot stays in reserve afterwards, otherwise half the remainder - so the running total stays
+        within the pool however many jobs start. Limits are fixed at launch (neither rsync nor restic
+        can change them mid-transfer), hence the reserve rather than rebalancing.
+        """
+        remaining = max(pool - sum(alloc['limit'] for alloc in holders), 0)
+        slot = max(pool // slots, 1)
+        if remaining >= 2 * slot:
+            return slot
+        return max(remaining // 2, 1)
+
+    @staticmethod
+    def _in_window(hours: Optional[str], now: Optional[datetime] = None) -> bool:
+        """Whether now falls in an 'HH:MM-HH:MM' window (may wrap midnight); empty means always"""
+        if not hours:
+            return True
+        try:
+            start_str, end_str = (part.strip() for part in str(hours).split('-', 1))
+            start = datetime.strptime(start_str, '%H:%M').time()
+            end = datetime.strptime(end_str, '%H:%M').time()
+        except ValueError:
+            print(f"WARNING: Invalid bandwidth_budget_hours '{hours}' - applying budget at all times")
+            return True
+
+        current = (now or datetime.now()).time()
+        if start <= end:
+            return start <= current < end
+        return current >= start or current < end
+
+    @staticmethod
+    def _to_kib(value) -> Optional[int]:
+        """Positive KiB/s value or None (unset, zero or invalid means no limit)"""
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return None
+        return value if value > 0 else None
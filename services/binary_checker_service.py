@@ -4,7 +4,7 @@ Supports restic, borg, kopia, rclone, and other backup binaries.
 """
 
 from typing import Dict, List, Optional, Any
-from services.command_execution_service import CommandExecutionService
+from services.host_inventory import HostInventory, LOCAL_HOST
 
 
 class BinaryCheckerService:
@@ -12,26 +12,22 @@ class BinaryCheckerService:
     
     SUPPORTED_BINARIES = {
         'restic': {
-            'version_command': 'restic version',
             'description': 'Restic backup tool'
         },
         'borg': {
-            'version_command': 'borg --version',
             'description': 'Borg backup tool'
         },
         'kopia': {
-            'version_command': 'kopia --version',
             'description': 'Kopia backup tool'
         },
         'rclone': {
-            'version_command': 'rclone version --check=false',
             'description': 'Rclone cloud storage tool'
         }
     }
     
     @staticmethod
     def check_binary_availability(binary_name: str, source_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Check if a specific binary is available on source system or locally"""
+        """Check if a specific binary is available on source system or locally (from the host inventory)"""
         if binary_name not in BinaryCheckerService.SUPPORTED_BINARIES:
             return {
                 'success': False,
@@ -39,82 +35,39 @@ class BinaryCheckerService:
                 'supported_binaries': list(BinaryCheckerService.SUPPORTED_BINARIES.keys())
             }
         
-        binary_info = BinaryCheckerService.SUPPORTED_BINARIES[binary_name]
-        
-        # Use SSH if source is configured, otherwise check locally
-        if source_config and source_config.get('hostname') and source_config.get('username'):
-            return BinaryCheckerService._check_binary_via_ssh(binary_name, binary_info, source_config)
-        else:
-            return BinaryCheckerService._check_binary_locally(binary_name, binary_info)
+        capabilities = HostInventory.get_for_source(source_config)
+        return BinaryCheckerService._format_result(binary_name, source_config, capabilities)
     
     @staticmethod
-    def _check_binary_via_ssh(binary_name: str, binary_info: Dict[str, str], source_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Check binary availability via SSH"""
-        hostname = source_config.get('hostname')
-        username = source_config.get('username')
-        
-        command = f"which {binary_name} && {binary_info['version_command']}"
-        
-        executor = CommandExecutionService()
-        exec_result = executor.execute_via_ssh(hostname, username, command)
-        result = {
-            'success': exec_result.success,
-            'stdout': exec_result.stdout,
-            'stderr': exec_result.stderr
-        }
+    def _format_result(binary_name: str, source_config: Optional[Dict[str, Any]], capabilities) -> Dict[str, Any]:
+        """Build availability response from inventoried host capabilities"""
+        binary_info = BinaryCheckerService.SUPPORTED_BINARIES[binary_name]
+        target = HostInventory.target_for(source_config)
+        remote = target != LOCAL_HOST
+        where = f'on {source_config.get("hostname")}' if remote else 'locally'
+        location = target if remote else 'container'
         
-        if result['success']:
-            version_info = result['stdout'].strip()
+        if capabilities.has_tool(binary_name):
             return {
                 'success': True,
-                'message': f'{binary_info["description"]} found on {hostname}',
+                'message': f'{binary_info["description"]} found {where}',
                 'binary': binary_name,
-                'version': version_info,
-                'location': f'{username}@{hostname}',
-                'installation_method': 'remote'
+                'version': capabilities.tool_versions.get(binary_name, ''),
+                'path': capabilities.tool_path(binary_name),
+                'location': location,
+                'installation_method': 'remote' if remote else 'local'
             }
-        else:
-            error_msg = result['stderr'].strip() or f'{binary_name} binary not found'
-            return {
-                'success': False,
-                'message': f'{binary_info["description"]} not available on {hostname}: {error_msg}',
-                'binary': binary_name,
-                'location': f'{username}@{hostname}',
-                'installation_guide': BinaryCheckerService._get_installation_guide(binary_name)
-            }
-    
-    @staticmethod
-    def _check_binary_locally(binary_name: str, binary_info: Dict[str, str]) -> Dict[str, Any]:
-        """Check binary availability locally"""
-        command = ['sh', '-c', f'which {binary_name} && {binary_info["version_command"]}']
         
-        executor = CommandExecutionService()
-        exec_result = executor.execute_locally(command)
-        result = {
-            'success': exec_result.success,
-            'stdout': exec_result.stdout,
-            'stderr': exec_result.stderr
+        # A miss may be stale (binary just installed) - refresh in the background, keeping the cached entry
+        HostInventory.recheck(target)
+        error_msg = capabilities.error or f'{binary_name} binary not found'
+        return {
+            'success': False,
+            'message': f'{binary_info["description"]} not available {where}: {error_msg}',
+            'binary': binary_name,
+            'location': location,
+            'installation_guide': BinaryCheckerService._get_installation_guide(binary_name)
         }
-        
-        if result['success']:
-            version_info = result['stdout'].strip()
-            return {
-                'success': True,
-                'message': f'{binary_info["description"]} found locally',
-                'binary': binary_name,
-                'version': version_info,
-                'location': 'container',
-                'installation_method': 'local'
-            }
-        else:
-            error_msg = result['stderr'].strip() or f'{binary_name} binary not found'
-            return {
-                'success': False,
-                'message': f'{binary_info["description"]} not available locally: {error_msg}',
-                'binary': binary_name,
-                'location': 'container',
-                'installation_guide': BinaryCheckerService._get_installation_guide(binary_name)
-            }
     
     @staticmethod
     def _get_installation_guide(binary_name: str) -> Dict[str, str]:
@@ -152,12 +105,18 @@ class BinaryCheckerService:
     
     @staticmethod
     def check_multiple_binaries(binary_names: List[str], source_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Check availability of multiple binaries"""
+        """Check availability of multiple binaries from one host inventory lookup"""
+        capabilities = HostInventory.get_for_source(source_config)
+        
         results = {}
         all_available = True
         
         for binary_name in binary_names:
-            results[binary_name] = BinaryCheckerService.check_binary_availability(binary_name, source_config)
+            if binary_name not in BinaryCheckerService.SUPPORTED_BINARIES:
+                # Unsupported binary - reuse the standard error response
+                results[binary_name] = BinaryCheckerService.check_binary_availability(binary_name, source_config)
+            else:
+                results[binary_name] = BinaryCheckerService._format_result(binary_name, source_config, capabilities)
             if not results[binary_name]['success']:
                 all_available = False
         
@@ -6,20 +6,56 @@ import subprocess
 import shlex
 import json
 import os
-from typing import Dict, List, Optional, Any, Union
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Any, Union
 from dataclasses import dataclass
+from services.ssh_transport import SSHTransport
 
 
 @dataclass
 class ExecutionConfig:
     """Configuration for command execution"""
-    timeout: int = 30
+    timeout: Optional[int] = 30  # None waits indefinitely
     capture_output: bool = True
     text: bool = True
     connect_timeout: int = 10
     batch_mode: bool = True
     strict_host_checking: bool = False
     known_hosts_file: str = "/dev/null"
+    head_lines: int = 200      # streamed output: first lines kept in memory
+    tail_lines: int = 1000     # streamed output: last lines kept in memory
+
+
+class BoundedOutputBuffer:
+    """Keeps the first and last lines of a stream; everything in between is only counted"""
+    
+    def __init__(self, head_lines: int = 200, tail_lines: int = 1000):
+        self.head_lines = head_lines
+        self.head: List[str] = []
+        self.tail = deque(maxlen=tail_lines)
+        self.total_lines = 0
+    
+    def append(self, line: str):
+        """Add one line (without trailing newline)"""
+        self.total_lines += 1
+        if len(self.head) < self.head_lines:
+            self.head.append(line)
+        else:
+            self.tail.append(line)
+    
+    @property
+    def omitted_lines(self) -> int:
+        """Lines dropped between head and tail"""
+        return self.total_lines - len(self.head) - len(self.tail)
+    
+    def render(self) -> str:
+        """Head and tail joined, with a marker where lines were dropped"""
+        lines = list(self.head)
+        if self.omitted_lines:
+            lines.append(f"... [{self.omitted_lines} lines omitted] ...")
+        lines.extend(self.tail)
+        return "\n".join(lines)
 
 
 @dataclass 
@@ -133,26 +169,21 @@ class CommandExecutionService:
         self,
         hostname: str,
         username: str,
-        container_command: List[str]
+        container_command: List[str],
+        on_line: Optional[Callable[[str, str], None]] = None,
+        watchdog=None
     ) -> ExecutionResult:
-        """Execute container command via SSH"""
+        """Execute container command via SSH (streamed with bounded capture when on_line or a watchdog is given)"""
         try:
-            # Convert container command to string with proper escaping
-            container_cmd_str = shlex.join(container_command)
-            # Allow shell evaluation of $(id -u):$(id -g) on remote host
-            container_cmd_str = container_cmd_str.replace("'$(id -u):$(id -g)'", "$(id -u):$(id -g)")
+            # Convert container command to string with proper escaping (remote shell expands uid/gid and cache paths)
+            from services.container_command_builder import ContainerCommandBuilder
+            container_cmd_str = ContainerCommandBuilder.to_remote_shell(container_command)
             
             # Build SSH command
-            ssh_cmd = [
-                'ssh', 
-                '-o', f'ConnectTimeout={self.config.connect_timeout}',
-                '-o', f'BatchMode={"yes" if self.config.batch_mode else "no"}',
-                '-o', f'StrictHostKeyChecking={"yes" if self.config.strict_host_checking else "no"}',
-                '-o', f'UserKnownHostsFile={self.config.known_hosts_file}',
-                '-o', 'LogLevel=ERROR',
-                f'{username}@{hostname}',
-                container_cmd_str
-            ]
+            ssh_cmd = self._build_transport_command(hostname, username, container_cmd_str, log_level='ERROR')
+            
+            if on_line is not None or watchdog is not None:
+                return self.execute_streaming(ssh_cmd, on_line, execution_type="container_ssh", watchdog=watchdog)
             
             # Execute with timeout
             result = subprocess.run(
@@ -169,6 +200,112 @@ class CommandExecutionService:
         except Exception as e:
             return ExecutionResult.exception_result(e, "container_ssh")
     
+    def execute_streaming(
+        self,
+        command: List[str],
+        on_line: Optional[Callable[[str, str], None]] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        execution_type: str = "local",
+        watchdog=None
+    ) -> ExecutionResult:
+        """
+        Execute command, handing each stdout/stderr line to on_line(stream, line) as it arrives.
+        Only a bounded head/tail of each stream is kept for the returned result;
+        lines for which on_line returns True (e.g. progress updates) are not kept at all.
+        A StallWatchdog, if given, sees every line and may stop the process when it stalls.
+        """
+        stdout_buffer = BoundedOutputBuffer(self.config.head_lines, self.config.tail_lines)
+        stderr_buffer = BoundedOutputBuffer(self.config.head_lines, self.config.tail_lines)
+        callback_lock = threading.Lock()
+        
+        def pump(pipe, stream_name, buffer):
+            # Universal newlines also split rsync/restic carriage-return progress updates
+            for raw_line in pipe:
+                line = raw_line.rstrip('\n')
+                if watchdog is not None:
+                    watchdog.touch()
+                consumed = False
+                if on_line is not None:
+                    with callback_lock:
+                        try:
+                            consumed = bool(on_line(stream_name, line))
+                        except Exception as e:
+                            print(f"WARNING: Output handler failed: {str(e)}")
+                if not consumed:
+                    buffer.append(line)
+            pipe.close()
+        
+        try:
+            env = None
+            if env_vars:
+                env = os.environ.copy()
+                env.update(env_vars)
+            
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                errors='replace',
+                env=env
+            )
+        except Exception as e:
+            return ExecutionResult.exception_result(e, execution_type)
+        
+        if watchdog is not None:
+            watchdog.attach(process)
+        
+        readers = [
+            threading.Thread(target=pump, args=(process.stdout, 'stdout', stdout_buffer), daemon=True),
+            threading.Thread(target=pump, args=(process.stderr, 'stderr', stderr_buffer), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        
+        timed_out = False
+        try:
+            process.wait(timeout=self.config.timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            process.kill()
+            process.wait()
+        
+        for reader in readers:
+            reader.join()
+        
+        if watchdog is not None:
+            watchdog.stop()
+            if watchdog.tripped:
+                stderr_buffer.append(f"Stopped by watchdog: {watchdog.tripped}")
+                return ExecutionResult(
+                    success=False,
+                    returncode=-1,
+                    stdout=stdout_buffer.render(),
+                    stderr=stderr_buffer.render(),
+                    error_message=f"Stalled: {watchdog.tripped}",
+                    execution_type=execution_type
+                )
+        
+        if timed_out:
+            stderr_buffer.append(f"Command timed out after {self.config.timeout} seconds")
+            return ExecutionResult(
+                success=False,
+                returncode=-1,
+                stdout=stdout_buffer.render(),
+                stderr=stderr_buffer.render(),
+                error_message="Command timed out",
+                execution_type=execution_type
+            )
+        
+        return ExecutionResult(
+            success=process.returncode == 0,
+            returncode=process.returncode,
+            stdout=stdout_buffer.render(),
+            stderr=stderr_buffer.render(),
+            execution_type=execution_type
+        )
+    
     def _build_ssh_command(
         self, 
         hostname: str, 
@@ -195,17 +332,20 @@ class CommandExecutionService:
         remote_command = '; '.join(env_exports + [command_str])
         
         # Build SSH command
-        ssh_cmd = [
-            'ssh',
-            '-o', f'ConnectTimeout={self.config.connect_timeout}',
-            '-o', f'BatchMode={"yes" if self.config.batch_mode else "no"}',
-            '-o', f'StrictHostKeyChecking={"yes" if self.config.strict_host_checking else "no"}',
-            '-o', f'UserKnownHostsFile={self.config.known_hosts_file}',
+        return self._build_transport_command(hostname, username, remote_command)
+    
+    def _build_transport_command(self, hostname: str, username: str, remote_command: str,
+                                 log_level: Optional[str] = None) -> List[str]:
+        """Build multiplexed SSH command from this service's connection settings"""
+        return SSHTransport.build_command(
             f'{username}@{hostname}',
-            remote_command
-        ]
-        
-        return ssh_cmd
+            remote_command,
+            connect_timeout=self.config.connect_timeout,
+            batch_mode=self.config.batch_mode,
+            strict_host_checking=self.config.strict_host_checking,
+            known_hosts_file=self.config.known_hosts_file,
+            log_level=log_level
+        )
     
     def test_ssh_connectivity(self, hostname: str, username: str) -> ExecutionResult:
         """Test basic SSH connectivity"""
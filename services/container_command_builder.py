@@ -5,6 +5,11 @@ Handles Docker/Podman container execution with proper mounting and environment s
 from typing import Dict, List, Optional
 from enum import Enum
 import shlex
+from services.ssh_transport import SSHTransport
+from services.restic_cache import ResticCache, REMOTE_HOME
+from services.stall_watchdog import CONTAINER_JOB_LABEL
+
+DEFAULT_RESTIC_IMAGE = 'restic/restic:0.18.0'
 
 
 class MountStrategy(Enum):
@@ -17,9 +22,19 @@ class MountStrategy(Enum):
 class ContainerCommandBuilder:
     """Builds container commands with proper mounting and environment setup"""
     
-    def __init__(self, container_runtime: str = 'docker'):
+    default_image = DEFAULT_RESTIC_IMAGE  # global_settings.restic_image, applied via configure()
+    
+    def __init__(self, container_runtime: str = 'docker', restic_image: Optional[str] = None):
         self.container_runtime = container_runtime
-        self.restic_image = 'restic/restic:0.18.0'
+        self.restic_image = restic_image or ContainerCommandBuilder.default_image
+    
+    @classmethod
+    def configure(cls, global_settings: Dict) -> bool:
+        """Apply restic_image from global settings; returns True if the reference changed"""
+        image = (global_settings.get('restic_image') or DEFAULT_RESTIC_IMAGE).strip()
+        changed = image != cls.default_image
+        cls.default_image = image
+        return changed
     
     def build_container_command(
         self,
@@ -42,8 +57,13 @@ class ContainerCommandBuilder:
         # Add container runtime command
         cmd.extend([self.container_runtime, 'run', '--rm', '--user', '$(id -u):$(id -g)'])
         
+        # Label lets the stall watchdog find and remove this job's container on the host
+        if job_name:
+            cmd.extend(['--label', f'{CONTAINER_JOB_LABEL}={job_name}'])
+        
         # Add job identification environment variable for process tracking
         enhanced_env_vars = environment_vars.copy()
+        enhanced_env_vars.pop('RESTIC_CACHE_DIR', None)  # local path - the container gets the mounted cache
         if job_name:
             import time
             job_id = f"{job_name}_{int(time.time())}"
@@ -55,10 +75,13 @@ class ContainerCommandBuilder:
         # Add mount points based on strategy
         cmd.extend(self._build_mount_flags(mount_strategy, mount_paths, target_path))
         
+        # Persistent per-repository cache on the executing host
+        cmd.extend(ResticCache.container_flags(repository_url))
+        
         # Add container image
         cmd.append(self.restic_image)
         
-        # Add restic command (restic/restic:0.18.0 already has restic as entrypoint)
+        # Add restic command (the official restic image already has restic as entrypoint)
         cmd.extend(['-r', repository_url, command_type])
         
         # Add arguments
@@ -78,20 +101,35 @@ class ContainerCommandBuilder:
         container_command: List[str]
     ) -> List[str]:
         """Build SSH command to execute container on remote host"""
-        # Convert container command to shell string with proper quote handling
-        container_cmd_str = shlex.join(container_command)
-        # Allow shell evaluation of $(id -u):$(id -g) on remote host
-        container_cmd_str = container_cmd_str.replace("'$(id -u):$(id -g)'", "$(id -u):$(id -g)")
+        container_cmd_str = self.to_remote_shell(container_command)
         
-        ssh_cmd = [
-            'ssh', '-o', 'ConnectTimeout=30', '-o', 'BatchMode=yes',
-            '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
-            '-o', 'LogLevel=ERROR',
-            f"{username}@{hostname}",
-            container_cmd_str
-        ]
+        return SSHTransport.build_command(
+            f"{username}@{hostname}", container_cmd_str, connect_timeout=30, log_level='ERROR'
+        )
+    
+    @staticmethod
+    def to_remote_shell(container_command: List[str]) -> str:
+        """
+        Quote a container command for a remote shell.
+        $(id -u):$(id -g) and $HOME-relative cache mounts are left for the remote shell to expand,
+        and cache directories are created first (bind mount sources must exist).
+        """
+        parts = []
+        cache_dirs = []
+        for arg in container_command:
+            if arg == '$(id -u):$(id -g)':
+                parts.append(arg)
+            elif arg.startswith(f'{REMOTE_HOME}/'):
+                host_path = arg.split(':', 1)[0]
+                cache_dirs.append('"$HOME"' + shlex.quote(host_path[len(REMOTE_HOME):]))
+                parts.append('"$HOME"' + shlex.quote(arg[len(REMOTE_HOME):]))
+            else:
+                parts.append(shlex.quote(arg))
         
-        return ssh_cmd
+        command = ' '.join(parts)
+        if cache_dirs:
+            command = f"mkdir -p {' '.join(cache_dirs)} && {command}"
+        return command
     
     def _build_environment_flags(self, environment_vars: Dict[str, str]) -> List[str]:
         """Build environment variable flags for container"""
@@ -0,0 +1,93 @@
+"""
+Job duration estimation service
+Predicts run times from recorded run history, split by dry run vs real backup
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+from services.job_logger import JobLogger
+
+
+@dataclass
+class DurationEstimate:
+    """Predicted duration for one job in one mode (dry or real)"""
+    ewma_seconds: float
+    p90_seconds: float
+    sample_count: int
+
+    @property
+    def expected_seconds(self) -> float:
+        """Typical duration - used for ETAs"""
+        return self.ewma_seconds
+
+    @property
+    def conservative_seconds(self) -> float:
+        """Pessimistic duration - used for window planning"""
+        return max(self.ewma_seconds, self.p90_seconds)
+
+
+class DurationEstimator:
+    """Predicts job durations from successful runs (EWMA + p90)"""
+
+    def __init__(self, job_logger: Optional[JobLogger] = None, smoothing: float = 0.3):
+        self.job_logger = job_logger or JobLogger()
+        self.smoothing = smoothing  # weight of the newest run in the EWMA
+
+    def estimate(self, job_name: str, dry_run: bool = False) -> Optional[DurationEstimate]:
+        """Estimate duration from successful runs of the same mode, None without history"""
+        durations = [
+            float(run['duration'])
+            for run in self.job_logger.get_job_runs(job_name)
+            if run.get('success') and bool(run.get('dry_run')) == dry_run and run.get('duration') is not None
+        ]
+        if not durations:
+            return None
+
+        return DurationEstimate(
+            ewma_seconds=self._ewma(durations),
+            p90_seconds=self._percentile(durations, 90),
+            sample_count=len(durations)
+        )
+
+    def estimate_remaining(self, job_name: str, dry_run: bool, elapsed_seconds: float) -> Optional[float]:
+        """Estimate seconds left for a run that has been going for elapsed_seconds"""
+        estimate = self.estimate(job_name, dry_run)
+        if not estimate:
+            return None
+        return max(estimate.expected_seconds - elapsed_seconds, 0.0)
+
+    def estimate_running_job_remaining(self, job_name: str) -> Optional[float]:
+        """Estimate seconds left for a currently registered running job"""
+        from services.job_process_tracker import JobProcessTracker
+
+        age = JobProcessTracker().get_job_age(job_name)
+        if age is None:
+            return None
+
+        # Mode of the current run is recorded with its 'started' status
+        dry_run = bool(self.job_logger.get_job_status(job_name).get('dry_run', False))
+        return self.estimate_remaining(job_name, dry_run, age.total_seconds())
+
+    def predict_finish_time(self, job_name: str, dry_run: bool, start_time: datetime,
+                            conservative: bool = False) -> Optional[datetime]:
+        """Predict when a run started (or starting) at start_time will finish"""
+        estimate = self.estimate(job_name, dry_run)
+        if not estimate:
+            return None
+        seconds = estimate.conservative_seconds if conservative else estimate.expected_seconds
+        return start_time + timedelta(seconds=seconds)
+
+    def _ewma(self, durations: List[float]) -> float:
+        """Exponentially weighted moving average, oldest to newest"""
+        average = durations[0]
+        for duration in durations[1:]:
+            average = self.smoothing * duration + (1 - self.smoothing) * average
+        return average
+
+    @staticmethod
+    def _percentile(durations: List[float], percentile: int) -> float:
+        """Nearest-rank percentile"""
+        ordered = sorted(durations)
+        rank = max(int(math.ceil(percentile / 100 * len(ordered))), 1)
+        return ordered[rank - 1]
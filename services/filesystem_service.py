@@ -7,6 +7,7 @@ import os
 import subprocess
 from typing import Dict, List, Optional, Any
 from services.command_execution_service import CommandExecutionService
+from services.remote_agent import RemoteAgentPool, RemoteAgentError
 
 
 class FilesystemService:
@@ -48,6 +49,18 @@ class FilesystemService:
             # Combine destination path with requested browse path
             full_path = self._combine_paths(dest_path, path)
             
+            # Persistent agent (when enabled) returns structured entries without a new SSH session
+            try:
+                entries = RemoteAgentPool.call(username, hostname, 'listdir', path=full_path)
+            except RemoteAgentError as e:
+                return self._format_error_response(f'ERROR: Cannot access {full_path}: {e}')
+            if entries is not None:
+                return self._format_success_response({
+                    'contents': self._format_agent_entries(entries, path),
+                    'path': path,
+                    'full_path': full_path
+                })
+            
             # Use CommandExecutionService for SSH execution
             ls_command = f'ls -la "{full_path}" 2>/dev/null || echo "ERROR: Cannot access {full_path}"'
             result = self.executor.execute_via_ssh(hostname, username, ls_command)
@@ -156,6 +169,21 @@ class FilesystemService:
         except Exception as e:
             return self._format_error_response(f'Rsyncd browse error: {str(e)}')
     
+    def _format_agent_entries(self, entries: List[Dict[str, Any]], base_path: str) -> List[Dict[str, Any]]:
+        """Convert remote agent listdir entries into the browse format"""
+        contents = []
+        for entry in entries:
+            name = entry['name']
+            item = {
+                'name': name,
+                'type': entry['type'],
+                'path': name if base_path in ('', '/') else f"{base_path.rstrip('/')}/{name}"
+            }
+            if entry['type'] == 'file':
+                item['size'] = entry.get('size')
+            contents.append(item)
+        return contents
+    
     def _parse_ls_output(self, ls_output: str, base_path: str) -> List[Dict[str, Any]]:
         """Parse ls -la output into structured format"""
         contents = []
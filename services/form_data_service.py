@@ -429,7 +429,7 @@ class JobFormData:
     def _get_special_variables(self) -> Dict[str, str]:
         """Get special computed variables"""
         return {
-            'DEFAULT_RSYNC_OPTIONS': '-a --info=stats1 --delete --delete-excluded'
+            'DEFAULT_RSYNC_OPTIONS': '-a --info=stats2 --delete --delete-excluded'
         }
     
     def _get_feedback_variables(self) -> Dict[str, str]:
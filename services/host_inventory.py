@@ -0,0 +1,298 @@
+"""
+Host capability inventory
+Caches tool paths and versions, container runtime, restic image digest, CPU count and free disk
+per host with a TTL; stale entries are served while a background refresh runs
+"""
+import os
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+LOCAL_HOST = 'local'
+
+# Tool -> version command for local discovery (first output line kept; the remote probe mirrors this list)
+INVENTORY_TOOLS = {
+    'rsync': ['rsync', '--version'],
+    'ssh': ['ssh', '-V'],
+    'restic': ['restic', 'version'],
+    'rclone': ['rclone', 'version', '--check=false'],
+    'borg': ['borg', '--version'],
+    'kopia': ['kopia', '--version'],
+    'podman': ['podman', '--version'],
+    'docker': ['docker', '--version'],
+}
+
+
+@dataclass
+class HostCapabilities:
+    """What one host can run, as of collected_at"""
+    host: str
+    tool_paths: Dict[str, str] = field(default_factory=dict)
+    tool_versions: Dict[str, str] = field(default_factory=dict)
+    container_runtime: Optional[str] = None
+    restic_image: Optional[str] = None
+    restic_image_digest: Optional[str] = None
+    cpu_count: Optional[int] = None
+    disk_free_bytes: Optional[int] = None
+    collected_at: float = field(default_factory=time.time)
+    error: Optional[str] = None   # set when the host could not be inventoried (never cached)
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since this entry was collected"""
+        return time.time() - self.collected_at
+
+    def tool_path(self, name: str) -> Optional[str]:
+        """Executable path for a tool, None when missing"""
+        return self.tool_paths.get(name) or None
+
+    def has_tool(self, name: str) -> bool:
+        """Whether a tool was found on the host"""
+        return bool(self.tool_paths.get(name))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable view including entry age"""
+        data = asdict(self)
+        data['age_seconds'] = round(self.age_seconds, 1)
+        return data
+
+    @classmethod
+    def from_probe(cls, host: str, probe) -> 'HostCapabilities':
+        """Build from a successful RemoteProbe result"""
+        tools = probe.tools
+        paths = probe.paths
+        resources = probe.resources
+        image = probe.restic_image
+
+        tool_paths = {name: paths.get(name) or '' for name in INVENTORY_TOOLS}
+        runtime = next((name for name in ('podman', 'docker') if tool_paths.get(name)), None)
+        disk_free_kb = _to_int(resources.get('disk_free_kb'))
+
+        return cls(
+            host=host,
+            tool_paths=tool_paths,
+            tool_versions={name: version for name, version in tools.items() if version},
+            container_runtime=runtime,
+            restic_image=image.get('reference'),
+            restic_image_digest=image.get('digest') or None,
+            cpu_count=_to_int(resources.get('cpu_count')),
+            disk_free_bytes=disk_free_kb * 1024 if disk_free_kb is not None else None
+        )
+
+
+def _to_int(value) -> Optional[int]:
+    """Parse probe output numbers ('' means unknown)"""
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostInventory:
+    """Process-wide TTL cache of HostCapabilities keyed by 'local' or user@host"""
+
+    ttl_seconds = 900   # entries older than this are refreshed in the background
+    recheck_seconds = 60   # minimum entry age before a reported miss triggers an early background refresh
+
+    _entries: Dict[str, HostCapabilities] = {}
+    _refreshing: set = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, global_settings: Dict):
+        """Apply host_inventory_ttl_seconds from global settings"""
+        cls.ttl_seconds = int(global_settings.get('host_inventory_ttl_seconds', 900))
+
+    @staticmethod
+    def target_for(source_config: Optional[Dict[str, Any]]) -> str:
+        """Inventory key for a job source: user@host for SSH sources, otherwise local"""
+        if source_config and source_config.get('hostname') and source_config.get('username'):
+            return f"{source_config['username']}@{source_config['hostname']}"
+        return LOCAL_HOST
+
+    @classmethod
+    def known_targets(cls, backup_config) -> List[str]:
+        """Local host plus every SSH source referenced by configured jobs"""
+        targets = [LOCAL_HOST]
+        for job_config in backup_config.config.get('backup_jobs', {}).values():
+            if job_config.get('source_type') != 'ssh':
+                continue
+            target = cls.target_for(job_config.get('source_config', {}))
+            if target not in targets:
+                targets.append(target)
+        return targets
+
+    @classmethod
+    def get(cls, target: str = LOCAL_HOST) -> HostCapabilities:
+        """Cached capabilities; collected on first use, refreshed in the background once stale"""
+        with cls._lock:
+            entry = cls._entries.get(target)
+
+        if entry is None:
+            return cls.refresh(target)
+        if entry.age_seconds > cls.ttl_seconds:
+            cls.refresh_async([target])
+        return entry
+
+    @classmethod
+    def get_for_source(cls, source_config: Optional[Dict[str, Any]]) -> HostCapabilities:
+        """Capabilities of the host a job source runs on"""
+        return cls.get(cls.target_for(source_config))
+
+    @classmethod
+    def peek(cls, target: str) -> Optional[HostCapabilities]:
+        """Cached entry without probing (None if never collected)"""
+        with cls._lock:
+            return cls._entries.get(target)
+
+    @classmethod
+    def get_all(cls) -> Dict[str, Dict[str, Any]]:
+        """All cached entries keyed by host"""
+        with cls._lock:
+            return {target: entry.to_dict() for target, entry in cls._entries.items()}
+
+    @classmethod
+    def refresh(cls, target: str) -> HostCapabilities:
+        """Collect capabilities now; failures are returned with error set and drop the cached entry"""
+        try:
+            capabilities = cls._collect(target)
+        except Exception as e:
+            capabilities = HostCapabilities(host=target, error=f'Inventory failed: {str(e)}')
+
+        if capabilities.error:
+            cls.invalidate(target)
+        else:
+            with cls._lock:
+                cls._entries[target] = capabilities
+        return capabilities
+
+    @classmethod
+    def refresh_async(cls, targets: Iterable[str]):
+        """Refresh targets on daemon threads (at most one refresh per target at a time)"""
+        for target in targets:
+            with cls._lock:
+                if target in cls._refreshing:
+                    continue
+                cls._refreshing.add(target)
+            threading.Thread(
+                target=cls._refresh_in_background, args=(target,), daemon=True,
+                name=f"inventory-{target}"
+            ).start()
+
+    @classmethod
+    def record_probe(cls, username: str, hostname: str, probe):
+        """Feed a RemoteProbe result gathered elsewhere (e.g. SSH validation) into the cache"""
+        target = f"{username}@{hostname}"
+        if probe.success:
+            with cls._lock:
+                cls._entries[target] = HostCapabilities.from_probe(target, probe)
+        else:
+            cls.invalidate(target)
+
+    @classmethod
+    def record_image(cls, target: str, image: str, digest: Optional[str]):
+        """Update the cached restic image reference/digest for a host after a pull"""
+        with cls._lock:
+            entry = cls._entries.get(target)
+            if entry is not None:
+                entry.restic_image = image
+                entry.restic_image_digest = digest or None
+
+    @classmethod
+    def recheck(cls, target: str):
+        """
+        A caller saw a possibly stale miss (e.g. a tool just installed): refresh the entry in the
+        background, keeping it cached meanwhile, at most once per recheck_seconds
+        """
+        with cls._lock:
+            entry = cls._entries.get(target)
+        if entry is not None and entry.age_seconds > cls.recheck_seconds:
+            cls.refresh_async([target])
+
+    @classmethod
+    def invalidate(cls, target: str):
+        """Forget a host so the next lookup probes it again"""
+        with cls._lock:
+            cls._entries.pop(target, None)
+
+    @classmethod
+    def _refresh_in_background(cls, target: str):
+        """Thread body for refresh_async"""
+        try:
+            capabilities = cls.refresh(target)
+            if capabilities.error:
+                print(f"WARNING: Host inventory refresh failed for {target}: {capabilities.error}")
+        finally:
+            with cls._lock:
+                cls._refreshing.discard(target)
+
+    @classmethod
+    def _collect(cls, target: str) -> HostCapabilities:
+        """Collect capabilities for the local host or a user@host target"""
+        if target == LOCAL_HOST:
+            return cls._collect_local()
+        return cls._collect_remote(target)
+
+    @staticmethod
+    def _collect_remote(target: str) -> HostCapabilities:
+        """One remote probe round trip over SSH"""
+        from services.remote_probe import RemoteProbe
+
+        username, hostname = target.split('@', 1)
+        probe = RemoteProbe().probe(username, hostname)
+        if not probe.success:
+            return HostCapabilities(host=target, error=probe.error)
+        return HostCapabilities.from_probe(target, probe)
+
+    @classmethod
+    def _collect_local(cls) -> HostCapabilities:
+        """Resolve tools on PATH and query versions, image digest and resources locally"""
+        from services.container_command_builder import ContainerCommandBuilder
+
+        tool_paths = {name: shutil.which(name) or '' for name in INVENTORY_TOOLS}
+        tool_versions = {}
+        for name, version_command in INVENTORY_TOOLS.items():
+            if tool_paths[name]:
+                version = cls._first_line([tool_paths[name]] + version_command[1:])
+                if version:
+                    tool_versions[name] = version
+
+        runtime = next((name for name in ('podman', 'docker') if tool_paths[name]), None)
+        restic_image = ContainerCommandBuilder().restic_image
+        digest = None
+        if runtime:
+            digest = cls._first_line(
+                [tool_paths[runtime], 'image', 'inspect', '--format', '{{index .RepoDigests 0}}', restic_image]
+            )
+
+        try:
+            disk_free = shutil.disk_usage('/').free
+        except OSError:
+            disk_free = None
+
+        return HostCapabilities(
+            host=LOCAL_HOST,
+            tool_paths=tool_paths,
+            tool_versions=tool_versions,
+            container_runtime=runtime,
+            restic_image=restic_image,
+            restic_image_digest=digest or None,
+            cpu_count=os.cpu_count(),
+            disk_free_bytes=disk_free
+        )
+
+    @staticmethod
+    def _first_line(command: List[str]) -> str:
+        """First output line of a command (stdout, else stderr); '' on failure"""
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=10)
+        except (subprocess.TimeoutExpired, OSError):
+            return ''
+        if result.returncode != 0:
+            return ''
+        output = result.stdout.strip() or result.stderr.strip()
+        return output.splitlines()[0] if output else ''
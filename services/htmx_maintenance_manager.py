@@ -56,6 +56,7 @@ class HTMXMaintenanceManager:
             <div id="auto_help_text" class="help-text">
                 Automatic maintenance uses safe defaults: daily cleanup at 3am, weekly integrity checks Sunday 2am, 
                 keeps last 7 snapshots plus 7 daily, 4 weekly, 6 monthly.
+                Jobs sharing a repository are cleaned together using the largest retention value set by any of them.
             </div>
             <div id="user_mode_section" class="hidden"></div>
         </div>
@@ -100,6 +101,10 @@ class HTMXMaintenanceManager:
                     </div>
                     
                     <h4>Retention Policy</h4>
+                    <div class="help-text">
+                        Jobs sharing a repository are cleaned by one forget run: each value below is raised to the
+                        largest one set by any job on the same repository, so a stricter policy here may keep more.
+                    </div>
                     <div class="form-group">
                         <label for="keep_last">Keep Last:</label>
                         <input type="number" name="keep_last" value="{keep_last}" min="1" 
@@ -0,0 +1,92 @@
+"""
+Job dependency chain service
+Starts run_after dependents when an upstream job finishes, so pipelines run back-to-back
+"""
+from typing import Dict, List, Optional, Tuple
+
+
+class JobChainService:
+    """Resolves run_after dependencies and queues dependent jobs on the scheduler"""
+
+    VALID_CONDITIONS = ('success', 'any')
+
+    def __init__(self, backup_config, scheduler_service=None):
+        self.backup_config = backup_config
+        self.scheduler_service = scheduler_service
+
+    @staticmethod
+    def parse_run_after(job_config: Dict) -> List[Tuple[str, str]]:
+        """
+        Parse run_after into (upstream_job, condition) pairs.
+        Accepts job names (using run_after_condition, default 'success') or
+        {job: name, condition: success|any} entries.
+        """
+        run_after = job_config.get('run_after') or []
+        if isinstance(run_after, str):
+            run_after = [run_after]
+
+        default_condition = job_config.get('run_after_condition', 'success')
+        dependencies = []
+        for entry in run_after:
+            if isinstance(entry, dict):
+                upstream = entry.get('job')
+                condition = entry.get('condition', default_condition)
+            else:
+                upstream, condition = entry, default_condition
+
+            if not upstream:
+                continue
+            if condition not in JobChainService.VALID_CONDITIONS:
+                print(f"WARNING: Unknown run_after condition '{condition}' for upstream '{upstream}' - using 'success'")
+                condition = 'success'
+            dependencies.append((str(upstream), condition))
+
+        return dependencies
+
+    def get_dependents(self, upstream_job: str, success: bool) -> List[str]:
+        """Enabled jobs whose run_after condition is met by this upstream result"""
+        dependents = []
+        for job_name, job_config in self.backup_config.get_backup_jobs().items():
+            if not job_config.get('enabled', False):
+                continue
+            for upstream, condition in self.parse_run_after(job_config):
+                if upstream == upstream_job and (success or condition == 'any'):
+                    dependents.append(job_name)
+                    break
+        return sorted(dependents)
+
+    def trigger_dependents(self, upstream_job: str, success: bool, dry_run: bool,
+                           chain: Optional[List[str]] = None) -> List[str]:
+        """Queue dependents as one-shot scheduler jobs; returns the queued job names"""
+        chain = list(chain or []) + [upstream_job]
+        dependents = self.get_dependents(upstream_job, success)
+        if not dependents:
+            return []
+
+        scheduler_service = self.scheduler_service
+        if scheduler_service is None:
+            from services.scheduled_tasks import get_context
+            scheduler_service = get_context()[1]
+        if scheduler_service is None:
+            print(f"WARNING: No scheduler available - run_after dependents of '{upstream_job}' not started")
+            return []
+
+        from services.scheduled_tasks import run_scheduled_backup
+
+        queued = []
+        for job_name in dependents:
+            # Guard against run_after cycles within one pipeline
+            if job_name in chain:
+                print(f"WARNING: Skipping run_after dependent '{job_name}' - already ran in chain {' -> '.join(chain)}")
+                continue
+
+            scheduler_service.add_date_job(
+                func=run_scheduled_backup,
+                job_id=f"chain:{job_name}",
+                args=[job_name, dry_run, f"chain:{upstream_job}", chain]
+            )
+            queued.append(job_name)
+
+        result_text = "succeeded" if success else "finished"
+        print(f"INFO: Job '{upstream_job}' {result_text} - started run_after dependents: {', '.join(queued) or 'none'}")
+        return queued
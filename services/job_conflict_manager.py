@@ -4,36 +4,116 @@ Prevents backup jobs from running simultaneously when they share resources
 """
 import os
 import time
+import threading
 from datetime import datetime
 
 
-class RuntimeConflictManager:
-    """Manages runtime job conflicts by checking for running jobs"""
+class ConflictIndex:
+    """Index from resource key ('source:host', 'dest:host') to the jobs using it"""
     
-    def __init__(self, backup_config):
-        self.backup_config = backup_config
+    def __init__(self, jobs=None):
+        self._lock = threading.Lock()
+        self._resource_jobs = {}
+        self._job_resources = {}
+        if jobs:
+            self.rebuild(jobs)
     
-    def get_job_resources(self, job_config):
-        """Extract source and destination resources from job config"""
-        sources = set()
-        destinations = set()
+    @staticmethod
+    def resource_keys(job_config):
+        """Namespaced resource keys for a job config"""
+        keys = set()
         
-        # Extract source resources
         if job_config.get('source_type') == 'ssh':
-            source_config = job_config.get('source_config', {})
-            hostname = source_config.get('hostname')
+            hostname = job_config.get('source_config', {}).get('hostname')
             if hostname:
-                sources.add(hostname.lower())
+                keys.add(f"source:{hostname.lower()}")
         
-        # Extract destination resources  
-        dest_type = job_config.get('dest_type')
-        dest_config = job_config.get('dest_config', {})
-        
-        if dest_type in ['ssh', 'rsyncd']:
-            hostname = dest_config.get('hostname')
+        if job_config.get('dest_type') in ['ssh', 'rsyncd']:
+            hostname = job_config.get('dest_config', {}).get('hostname')
             if hostname:
-                destinations.add(hostname.lower())
+                keys.add(f"dest:{hostname.lower()}")
+        
+        return keys
+    
+    def rebuild(self, jobs):
+        """Rebuild the whole index from backup_jobs config"""
+        with self._lock:
+            self._resource_jobs = {}
+            self._job_resources = {}
+            for job_name, job_config in (jobs or {}).items():
+                self._add_locked(job_name, job_config or {})
+    
+    def update_job(self, job_name, job_config):
+        """Add or re-index a single job"""
+        with self._lock:
+            self._remove_locked(job_name)
+            self._add_locked(job_name, job_config or {})
+    
+    def remove_job(self, job_name):
+        """Drop a single job from the index"""
+        with self._lock:
+            self._remove_locked(job_name)
+    
+    def get_job_resource_keys(self, job_name):
+        """Indexed resource keys for a job"""
+        with self._lock:
+            return set(self._job_resources.get(job_name, set()))
+    
+    def get_conflicting_jobs(self, job_name, job_config=None):
+        """Jobs sharing any resource with this job (uses job_config if given, else indexed config)"""
+        keys = self.resource_keys(job_config) if job_config is not None else self.get_job_resource_keys(job_name)
+        with self._lock:
+            conflicting = set()
+            for key in keys:
+                conflicting |= self._resource_jobs.get(key, set())
+        conflicting.discard(job_name)
+        return conflicting
+    
+    def get_shared_resources(self, job_config, other_job_name):
+        """Resource keys a job config shares with an indexed job"""
+        return self.resource_keys(job_config) & self.get_job_resource_keys(other_job_name)
+    
+    def get_conflict_graph(self):
+        """Full graph: resource -> jobs, and job -> jobs it can never run alongside"""
+        with self._lock:
+            resources = {key: sorted(jobs) for key, jobs in self._resource_jobs.items()}
+            job_names = list(self._job_resources.keys())
         
+        graph = {job_name: sorted(self.get_conflicting_jobs(job_name)) for job_name in job_names}
+        return {
+            'resources': dict(sorted(resources.items())),
+            'conflicts': dict(sorted(graph.items())),
+            'independent_jobs': sorted(name for name, peers in graph.items() if not peers)
+        }
+    
+    def _add_locked(self, job_name, job_config):
+        """Index a job (lock held)"""
+        keys = self.resource_keys(job_config)
+        self._job_resources[job_name] = keys
+        for key in keys:
+            self._resource_jobs.setdefault(key, set()).add(job_name)
+    
+    def _remove_locked(self, job_name):
+        """Unindex a job (lock held)"""
+        for key in self._job_resources.pop(job_name, set()):
+            jobs = self._resource_jobs.get(key)
+            if jobs is not None:
+                jobs.discard(job_name)
+                if not jobs:
+                    del self._resource_jobs[key]
+
+
+class RuntimeConflictManager:
+    """Manages runtime job conflicts by checking for running jobs"""
+    
+    def __init__(self, backup_config):
+        self.backup_config = backup_config
+    
+    def get_job_resources(self, job_config):
+        """Extract source and destination resources from job config"""
+        keys = ConflictIndex.resource_keys(job_config)
+        sources = {key.split(':', 1)[1] for key in keys if key.startswith('source:')}
+        destinations = {key.split(':', 1)[1] for key in keys if key.startswith('dest:')}
         return sources, destinations
     
     def is_conflict_avoidance_enabled(self):
@@ -69,35 +149,24 @@ class RuntimeConflictManager:
     
     def has_conflicting_jobs_running(self, job_name, job_config):
         """Check if there are conflicting jobs currently running"""
+        return bool(self.get_conflicting_running_jobs(job_name, job_config))
+    
+    def get_conflicting_running_jobs(self, job_name, job_config):
+        """Get running jobs that share a source or destination with this job"""
         if not self.is_conflict_avoidance_enabled():
-            return False
+            return []
         
         running_jobs = self.get_running_jobs()
         if not running_jobs:
-            return False
-        
-        # Get resources for the job we want to run
-        target_sources, target_destinations = self.get_job_resources(job_config)
+            return []
         
-        # Check each running job for resource conflicts
-        all_jobs = self.backup_config.get_backup_jobs()
+        # Set intersection against precomputed resource index
+        conflict_index = self.backup_config.conflict_index
+        conflicting_jobs = conflict_index.get_conflicting_jobs(job_name, job_config) & set(running_jobs)
         
-        for running_job_name in running_jobs:
-            if running_job_name == job_name:
-                continue  # Skip self
-            
-            running_job_config = all_jobs.get(running_job_name)
-            if not running_job_config:
-                continue  # Job no longer exists in config
-            
-            running_sources, running_destinations = self.get_job_resources(running_job_config)
-            
-            # Check for resource conflicts (shared source OR destination)
-            if (target_sources & running_sources) or (target_destinations & running_destinations):
-                shared_sources = target_sources & running_sources
-                shared_destinations = target_destinations & running_destinations
-                print(f"INFO: Job '{job_name}' waiting - conflicts with running job '{running_job_name}' "
-                      f"(shared sources: {shared_sources}, shared destinations: {shared_destinations})")
-                return True
+        for running_job_name in sorted(conflicting_jobs):
+            shared = conflict_index.get_shared_resources(job_config, running_job_name)
+            print(f"INFO: Job '{job_name}' waiting - conflicts with running job '{running_job_name}' "
+                  f"(shared resources: {', '.join(sorted(shared))})")
         
-        return False
\ No newline at end of file
+        return [name for name in running_jobs if name in conflicting_jobs]
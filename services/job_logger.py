@@ -20,6 +20,9 @@ class LogPaths:
         self.status_file = self.base_dir / "job_status.yaml"
         self.validation_file = self.base_dir / "job_validation.yaml"
         self.deleted_jobs_file = self.base_dir / "deleted_jobs.yaml"
+        self.runs_file = self.base_dir / "job_runs.yaml"
+        self.tuning_file = self.base_dir / "restic_tuning.yaml"
+        self.stats_file = self.base_dir / "snapshot_stats.yaml"
         
         # Ensure directories exist
         self.jobs_dir.mkdir(parents=True, exist_ok=True)
@@ -67,6 +70,9 @@ class YAMLFileManager:
 class JobLogger:
     """Manages job execution logging and status tracking - modernized"""
     
+    # Run history entries kept per job (oldest dropped first)
+    max_runs_per_job = 50
+    
     def __init__(self, base_dir: Optional[Path] = None):
         self.paths = LogPaths(base_dir) if base_dir else LogPaths()
         self.yaml_manager = YAMLFileManager()
@@ -84,7 +90,16 @@ class JobLogger:
         except IOError as e:
             print(f"ERROR: Could not write to job log {job_log_file}: {e}")
     
-    def log_job_status(self, job_name: str, status: str, message: str = ""):
+    def open_job_execution_log(self, job_name: str):
+        """Open job log for streamed appends (caller closes); None if it can't be opened"""
+        job_log_file = self.paths.get_job_log_file(job_name)
+        try:
+            return job_log_file.open('a', buffering=1)
+        except IOError as e:
+            print(f"ERROR: Could not open job log {job_log_file}: {e}")
+            return None
+    
+    def log_job_status(self, job_name: str, status: str, message: str = "", dry_run: Optional[bool] = None):
         """Log job status to YAML status file"""
         timestamp = datetime.now().isoformat()
         
@@ -97,6 +112,8 @@ class JobLogger:
             'status': status,
             'message': message
         }
+        if dry_run is not None:
+            status_data[job_name]['dry_run'] = dry_run
         
         # Save updated status
         self._save_status_file(status_data)
@@ -110,6 +127,31 @@ class JobLogger:
         status_data = self._load_status_file()
         return status_data.get(job_name, {})
     
+    def record_job_run(self, job_name: str, started_at: str, duration: float, success: bool, dry_run: bool,
+                       metrics: Optional[Dict[str, Any]] = None):
+        """Append a finished run (with parsed transfer metrics, if any) to the job's run history"""
+        runs_data = self._load_runs_file()
+        runs = runs_data.get(job_name, [])
+        run = {
+            'started_at': started_at,
+            'duration': round(duration, 1),
+            'success': success,
+            'dry_run': dry_run
+        }
+        if metrics:
+            run['metrics'] = metrics
+        runs.append(run)
+        runs_data[job_name] = runs[-self.max_runs_per_job:]
+        self._save_runs_file(runs_data)
+    
+    def get_job_runs(self, job_name: str) -> list:
+        """Get run history for a job (oldest first)"""
+        return self._load_runs_file().get(job_name, [])
+    
+    def get_all_job_runs(self) -> Dict[str, list]:
+        """Get run history for all jobs keyed by job name"""
+        return self._load_runs_file()
+    
     def remove_job_logs(self, job_name: str):
         """Remove all logs for a job (for purge operations)"""
         # Remove status entry
@@ -118,6 +160,12 @@ class JobLogger:
             del status_data[job_name]
             self._save_status_file(status_data)
         
+        # Remove run history
+        runs_data = self._load_runs_file()
+        if job_name in runs_data:
+            del runs_data[job_name]
+            self._save_runs_file(runs_data)
+        
         # Remove validation state entry
         validation_data = self._load_validation_file()
         if job_name in validation_data:
@@ -140,6 +188,12 @@ class JobLogger:
             status_data[new_job_name] = status_data.pop(old_job_name)
             self._save_status_file(status_data)
         
+        # Rename run history
+        runs_data = self._load_runs_file()
+        if old_job_name in runs_data:
+            runs_data[new_job_name] = runs_data.pop(old_job_name)
+            self._save_runs_file(runs_data)
+        
         # Rename validation state entry
         validation_data = self._load_validation_file()
         if old_job_name in validation_data:
@@ -235,4 +289,12 @@ class JobLogger:
     
     def _save_deleted_jobs_file(self, deleted_data: Dict[str, Any]) -> bool:
         """Save deleted jobs to YAML file"""
-        return self.yaml_manager.save_yaml_file(self.paths.deleted_jobs_file, deleted_data)
\ No newline at end of file
+        return self.yaml_manager.save_yaml_file(self.paths.deleted_jobs_file, deleted_data)
+    
+    def _load_runs_file(self) -> Dict[str, Any]:
+        """Load job run history from YAML file"""
+        return self.yaml_manager.load_yaml_file(self.paths.runs_file)
+    
+    def _save_runs_file(self, runs_data: Dict[str, Any]) -> bool:
+        """Save job run history to YAML file"""
+        return self.yaml_manager.save_yaml_file(self.paths.runs_file, runs_data)
\ No newline at end of file
@@ -4,12 +4,17 @@ Handles process verification, health checks, and cleanup of stale job entries
 """
 import os
 import subprocess
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
 
 class JobProcessTracker:
     """Service for tracking and verifying job processes"""
+
+    # Jobs registered by this process - their worker threads are alive until unregistered
+    _active_jobs = set()
+    _active_lock = threading.Lock()
     
     def __init__(self):
         self.running_jobs_file = "/var/log/highball/running_jobs.txt"
@@ -17,6 +22,8 @@ class JobProcessTracker:
     
     def register_job(self, job_name: str):
         """Register a job as currently running with timestamp"""
+        with self._active_lock:
+            self._active_jobs.add(job_name)
         try:
             os.makedirs(os.path.dirname(self.running_jobs_file), exist_ok=True)
             with open(self.running_jobs_file, 'a') as f:
@@ -26,6 +33,8 @@ class JobProcessTracker:
     
     def unregister_job(self, job_name: str):
         """Remove a job from the running jobs tracking"""
+        with self._active_lock:
+            self._active_jobs.discard(job_name)
         try:
             if not os.path.exists(self.running_jobs_file):
                 return
@@ -92,8 +101,27 @@ class JobProcessTracker:
         
         return running_jobs
     
+    def clear_all(self):
+        """Drop every tracked entry - called at startup, since no worker thread survives a restart"""
+        with self._active_lock:
+            self._active_jobs.clear()
+        try:
+            if os.path.exists(self.running_jobs_file):
+                with open(self.running_jobs_file, 'r') as f:
+                    leftover = [line.split(':', 1)[0] for line in f if ':' in line]
+                if leftover:
+                    print(f"INFO: Clearing {len(leftover)} running job entr{'y' if len(leftover) == 1 else 'ies'} "
+                          f"left from previous run: {', '.join(leftover)}")
+                open(self.running_jobs_file, 'w').close()
+        except Exception as e:
+            print(f"WARNING: Could not clear running jobs: {e}")
+
     def is_job_process_running(self, job_name: str) -> bool:
-        """Check if a job process is actually running using HIGHBALL_JOB_ID"""
+        """Check if a job is actually running: registered by this process, or a process carrying HIGHBALL_JOB_ID"""
+        # Local rsync runs carry no HIGHBALL_JOB_ID, so trust our own live registrations first
+        with self._active_lock:
+            if job_name in self._active_jobs:
+                return True
         try:
             # Use ps to find processes with our job ID environment variable
             # We look for any part of the job name in the HIGHBALL_JOB_ID env var
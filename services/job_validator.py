@@ -6,6 +6,7 @@ import subprocess
 import re
 from datetime import datetime
 from services.job_logger import JobLogger
+from services.ssh_transport import SSHTransport
 
 class JobValidator:
     """Validates backup job configurations and connections"""
@@ -48,11 +49,25 @@ class JobValidator:
             if not restic_validation['success']:
                 errors.append(f"Restic validation failed: {restic_validation['message']}")
         
+        # Several rsync source paths each get their own directory at the destination
+        if parsed_job['dest_type'] != 'restic':
+            errors.extend(JobValidator.validate_source_path_names(parsed_job['source_config']))
+        
         return {
             'valid': len(errors) == 0,
             'errors': errors
         }
     
+    @staticmethod
+    def validate_source_path_names(source_config):
+        """Reject rsync source paths that would share a directory name at the destination"""
+        from handlers.backup_command_builder import BackupCommandBuilder
+        path_configs = [entry for entry in (source_config or {}).get('source_paths') or []
+                        if isinstance(entry, dict) and (entry.get('path') or '').strip()]
+        if len(path_configs) <= 1:
+            return []
+        return BackupCommandBuilder.source_path_name_errors(path_configs)
+    
     @staticmethod
     def validate_rsyncd_destination(hostname, share, source_config=None):
         """Validate rsyncd destination from source perspective"""
@@ -99,12 +114,11 @@ class JobValidator:
         
         try:
             # Run rsync command from source system to test destination
-            ssh_cmd = [
-                'ssh', '-o', 'ConnectTimeout=5', '-o', 'BatchMode=yes',
-                '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
+            ssh_cmd = SSHTransport.build_command(
                 f'{source_username}@{source_hostname}',
-                f'rsync --list-only rsync://{dest_hostname}/'
-            ]
+                f'rsync --list-only rsync://{dest_hostname}/',
+                connect_timeout=5
+            )
             
             result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=15)
             
@@ -212,12 +226,11 @@ class JobValidator:
         
         try:
             # Run rsync command from source system to list shares
-            ssh_cmd = [
-                'ssh', '-o', 'ConnectTimeout=5', '-o', 'BatchMode=yes',
-                '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
+            ssh_cmd = SSHTransport.build_command(
                 f'{source_username}@{source_hostname}',
-                f'rsync --list-only rsync://{dest_hostname}/'
-            ]
+                f'rsync --list-only rsync://{dest_hostname}/',
+                connect_timeout=5
+            )
             
             result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=15)
             
@@ -6,45 +6,26 @@ from services.restic_maintenance_service import ResticMaintenanceService
 
 
 def bootstrap_maintenance_schedules(backup_config, scheduler_service, notification_service=None) -> int:
-    """Bootstrap maintenance schedules for all Restic jobs"""
+    """Bootstrap maintenance schedules for all Restic repositories (one set per repository)"""
+    scheduled_count = sync_maintenance_schedules(backup_config, scheduler_service, notification_service)
+    print(f"INFO: Maintenance system bootstrap complete - {scheduled_count} repositories scheduled")
+    return scheduled_count
+
+
+def sync_maintenance_schedules(backup_config, scheduler_service, notification_service=None) -> int:
+    """Reconcile per-repository maintenance schedules with current job config"""
     maintenance_service = ResticMaintenanceService(
         backup_config=backup_config,
         scheduler_service=scheduler_service,
         notification_service=notification_service
     )
-    
-    # Schedule maintenance for all eligible jobs
-    jobs = backup_config.config.get('backup_jobs', {})
-    scheduled_count = 0
-    
-    for job_name, job_config in jobs.items():
-        # Only schedule for Restic jobs with auto maintenance enabled
-        if (job_config.get('dest_type') == 'restic' and 
-            job_config.get('auto_maintenance', True)):
-            
-            maintenance_service.schedule_job_maintenance(job_name)
-            scheduled_count += 1
-    
-    print(f"INFO: Maintenance system bootstrap complete - {scheduled_count} jobs scheduled")
-    return scheduled_count
+    return maintenance_service.sync_maintenance_schedules()
 
 
 def update_job_maintenance_schedule(job_name: str, job_config: dict, backup_config, scheduler_service, notification_service=None):
     """Update maintenance schedule for a single job (called when job is added/modified)"""
-    maintenance_service = ResticMaintenanceService(
-        backup_config=backup_config,
-        scheduler_service=scheduler_service,
-        notification_service=notification_service
-    )
-    
-    # Reschedule if it's a Restic job, otherwise unschedule
-    if (job_config.get('dest_type') == 'restic' and 
-        job_config.get('auto_maintenance', True)):
-        maintenance_service.reschedule_job_maintenance(job_name)
-        print(f"INFO: Updated maintenance schedule for job '{job_name}'")
-    else:
-        maintenance_service.unschedule_job_maintenance(job_name)
-        print(f"INFO: Unscheduled maintenance for job '{job_name}'")
+    sync_maintenance_schedules(backup_config, scheduler_service, notification_service)
+    print(f"INFO: Updated maintenance schedule for job '{job_name}'")
 
 
 def remove_job_maintenance_schedule(job_name: str, backup_config, scheduler_service):
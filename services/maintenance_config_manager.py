@@ -2,7 +2,7 @@
 Maintenance configuration manager
 Handles per-job and global maintenance settings with defaults
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
 from services.maintenance_defaults import MaintenanceDefaults
 
 
@@ -74,7 +74,33 @@ class MaintenanceConfigManager:
         global_retention = maintenance_settings.get('retention_policy', {})
         
         # Merge with defaults
-        default_retention = {
+        default_retention = self._get_default_retention()
+        
+        # Override defaults with global settings
+        default_retention.update(global_retention)
+        
+        return default_retention
+    
+    def get_effective_retention_policy(self, job_name: str) -> Dict[str, Any]:
+        """Job's retention policy with gaps filled by the defaults the executor would apply"""
+        return {**self._get_default_retention(), **self.get_retention_policy(job_name)}
+    
+    def get_combined_retention_policy(self, job_names: List[str]) -> Dict[str, Any]:
+        """Merge retention policies of jobs sharing a repository (most generous keep_* wins)"""
+        combined = {}
+        for job_name in job_names:
+            policy = self.get_effective_retention_policy(job_name)
+            for key, value in policy.items():
+                if isinstance(value, int) and isinstance(combined.get(key, 0), int):
+                    combined[key] = max(combined.get(key, 0), value)
+                else:
+                    combined.setdefault(key, value)
+        return combined
+    
+    @staticmethod
+    def _get_default_retention() -> Dict[str, Any]:
+        """Built-in retention defaults"""
+        return {
             'keep_last': MaintenanceDefaults.KEEP_LAST,
             'keep_hourly': MaintenanceDefaults.KEEP_HOURLY,
             'keep_daily': MaintenanceDefaults.KEEP_DAILY,
@@ -82,11 +108,24 @@ class MaintenanceConfigManager:
             'keep_monthly': MaintenanceDefaults.KEEP_MONTHLY,
             'keep_yearly': MaintenanceDefaults.KEEP_YEARLY
         }
-        
-        # Override defaults with global settings
-        default_retention.update(global_retention)
-        
-        return default_retention
+    
+    def get_repository_key(self, job_name: str) -> str:
+        """Repository identity for a job - local-path repositories are distinct per executing host"""
+        from services.repository_identity import RepositoryIdentity
+        jobs = self.backup_config.config.get('backup_jobs', {})
+        return RepositoryIdentity.for_job(jobs.get(job_name, {}))
+    
+    def get_repository_groups(self) -> Dict[str, List[str]]:
+        """Group maintenance-enabled Restic jobs by repository key (job names sorted)"""
+        groups = {}
+        jobs = self.backup_config.config.get('backup_jobs', {})
+        for job_name in sorted(jobs):
+            if not self.is_maintenance_enabled(job_name):
+                continue
+            repository_key = self.get_repository_key(job_name)
+            if repository_key:
+                groups.setdefault(repository_key, []).append(job_name)
+        return groups
     
     def get_check_config(self, job_name: str) -> Dict[str, Any]:
         """Get check configuration for job"""
@@ -110,6 +149,16 @@ class MaintenanceConfigManager:
         default_check.update(global_check)
         return default_check
     
+    def get_retry_policy(self) -> Dict[str, int]:
+        """Get backoff policy for conflict-deferred maintenance"""
+        global_settings = self.backup_config.config.get('global_settings', {})
+        maintenance_settings = global_settings.get('maintenance', {})
+        return {
+            'base_delay_minutes': maintenance_settings.get('retry_base_delay_minutes', MaintenanceDefaults.RETRY_BASE_DELAY_MINUTES),
+            'max_delay_minutes': maintenance_settings.get('retry_max_delay_minutes', MaintenanceDefaults.RETRY_MAX_DELAY_MINUTES),
+            'max_attempts': maintenance_settings.get('retry_max_attempts', MaintenanceDefaults.RETRY_MAX_ATTEMPTS)
+        }
+    
     def get_maintenance_summary(self, job_name: str) -> Dict[str, Any]:
         """Get maintenance status summary for a job"""
         jobs = self.backup_config.config.get('backup_jobs', {})
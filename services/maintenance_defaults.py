@@ -16,10 +16,19 @@ class MaintenanceDefaults:
     KEEP_MONTHLY = 6     # keep 6 most recent monthly snapshots (6 months coverage)
     KEEP_YEARLY = 0      # disable yearly retention by default
     
+    # Snapshot grouping for forget - keeps each job's snapshots in separate groups
+    # when several jobs share one repository
+    FORGET_GROUP_BY = "host,paths,tags"
+    
     # Scheduling defaults
     DISCARD_SCHEDULE = "0 3 * * *"         # daily at 3am - combines forget+prune operations
     CHECK_SCHEDULE = "0 2 * * 0"           # weekly Sunday 2am (staggered from backups)
     
+    # Conflict-deferred retries (exponential backoff via one-shot scheduler jobs)
+    RETRY_BASE_DELAY_MINUTES = 5           # first retry after 5 minutes, doubling each attempt
+    RETRY_MAX_DELAY_MINUTES = 120          # cap backoff at 2 hours
+    RETRY_MAX_ATTEMPTS = 8                 # give up until next scheduled cycle after this many
+    
     # Check operation defaults
     CHECK_READ_DATA_SUBSET = "5%"          # balance integrity vs performance
     
@@ -2,13 +2,14 @@
 Maintenance operation executor
 Handles execution of forget-prune and check operations using ResticRunner
 """
-import subprocess
 from time import time
 from typing import List
 from services.maintenance_operation import MaintenanceOperation, MaintenanceResult
 from services.maintenance_defaults import MaintenanceDefaults
 from services.restic_runner import ResticCommand, CommandType, TransportType
 from services.job_logger import JobLogger
+from services.command_execution_service import CommandExecutionService, ExecutionConfig
+from services.stall_watchdog import StallWatchdog
 
 
 class MaintenanceExecutor:
@@ -19,7 +20,7 @@ class MaintenanceExecutor:
     
     def execute_discard(self, operation: MaintenanceOperation) -> MaintenanceResult:
         """Execute discard operation (combines forget+prune)"""
-        print(f"INFO: Executing discard for job '{operation.job_name}'")
+        print(f"INFO: Executing discard for repository of jobs {', '.join(operation.target_job_names)}")
         
         start_time = time()
         
@@ -31,7 +32,7 @@ class MaintenanceExecutor:
             command = self._create_restic_command(operation, CommandType.FORGET, retention_args)
             
             # Execute with maintenance priority
-            output = self._execute_command(command, operation.job_name, 'discard')
+            output = self._execute_command(command, operation.target_job_names, 'discard')
             
             duration = time() - start_time
             return MaintenanceResult(
@@ -54,7 +55,7 @@ class MaintenanceExecutor:
     
     def execute_check(self, operation: MaintenanceOperation) -> MaintenanceResult:
         """Execute check operation"""
-        print(f"INFO: Executing check for job '{operation.job_name}'")
+        print(f"INFO: Executing check for repository of jobs {', '.join(operation.target_job_names)}")
         
         start_time = time()
         
@@ -66,7 +67,7 @@ class MaintenanceExecutor:
             command = self._create_restic_command(operation, CommandType.CHECK, check_args)
             
             # Execute with maintenance priority
-            output = self._execute_command(command, operation.job_name, 'check')
+            output = self._execute_command(command, operation.target_job_names, 'check')
             
             duration = time() - start_time
             return MaintenanceResult(
@@ -98,11 +99,16 @@ class MaintenanceExecutor:
             repository_url=operation.repository_url,
             args=args,
             environment_vars=operation.environment_vars,
-            job_config={'container_runtime': operation.container_runtime}
+            job_config={'container_runtime': operation.container_runtime, 'name': self._container_name(operation)}
         )
     
-    def _execute_command(self, command: ResticCommand, job_name: str, operation_type: str) -> str:
-        """Execute maintenance command with proper logging and priority"""
+    @staticmethod
+    def _container_name(operation: MaintenanceOperation) -> str:
+        """Name labelling the maintenance container so a stalled run can be removed"""
+        return f"maintenance-{operation.job_name}"
+    
+    def _execute_command(self, command: ResticCommand, job_names: List[str], operation_type: str) -> str:
+        """Execute maintenance command once, fanning logging out to every job sharing the repository"""
         # Convert to execution format with maintenance priority
         if command.transport == TransportType.SSH:
             cmd_array = command.to_ssh_command()
@@ -115,16 +121,29 @@ class MaintenanceExecutor:
         # Log the command (with password obfuscation)
         from services.command_obfuscation import CommandObfuscationService
         obfuscated_command = CommandObfuscationService.obfuscate_command_array(cmd_array)
-        self.job_logger.log_job_execution(job_name, f"Executing {operation_type}: {' '.join(obfuscated_command)}", 'INFO')
+        shared_note = f" (shared repository: {', '.join(job_names)})" if len(job_names) > 1 else ""
+        self._log_to_jobs(job_names, f"Executing {operation_type}{shared_note}: {' '.join(obfuscated_command)}", 'INFO')
+        
+        # Execute with the maintenance watchdog (idle and absolute limits instead of a flat timeout)
+        cleanup = None
+        if command.transport == TransportType.SSH:
+            cleanup = StallWatchdog.remote_container_cleanup(
+                command.ssh_config['username'], command.ssh_config['hostname'],
+                command.job_config['name'], command.job_config.get('container_runtime') or 'docker'
+            )
+        watchdog = StallWatchdog('maintenance', command.job_config['name'], cleanup=cleanup)
         
-        # Execute via subprocess
         try:
-            result = subprocess.run(cmd_array, capture_output=True, text=True, timeout=3600)
+            result = CommandExecutionService(ExecutionConfig(timeout=None)).execute_streaming(
+                cmd_array, watchdog=watchdog
+            )
             
-            if result.returncode == 0:
-                self.job_logger.log_job_execution(job_name, f"Maintenance {operation_type} completed successfully", 'INFO')
+            if watchdog.tripped:
+                raise TimeoutError(f"Maintenance {operation_type} stopped by watchdog: {watchdog.tripped}")
+            if result.success:
+                self._log_to_jobs(job_names, f"Maintenance {operation_type} completed successfully", 'INFO')
                 if result.stdout.strip():
-                    self.job_logger.log_job_execution(job_name, f"Output: {result.stdout.strip()}", 'INFO')
+                    self._log_to_jobs(job_names, f"Output: {result.stdout.strip()}", 'INFO')
                 return result.stdout.strip()
             else:
                 error_msg = f"Maintenance {operation_type} failed with exit code {result.returncode}"
@@ -132,12 +151,15 @@ class MaintenanceExecutor:
                     error_msg += f": {result.stderr.strip()}"
                 raise Exception(error_msg)
                 
-        except subprocess.TimeoutExpired:
-            raise Exception(f"Maintenance {operation_type} timed out after 1 hour")
         except Exception as e:
-            self.job_logger.log_job_execution(job_name, f"Maintenance {operation_type} error: {str(e)}", 'ERROR')
+            self._log_to_jobs(job_names, f"Maintenance {operation_type} error: {str(e)}", 'ERROR')
             raise
     
+    def _log_to_jobs(self, job_names: List[str], message: str, level: str):
+        """Write the same log entry to each job's log"""
+        for job_name in job_names:
+            self.job_logger.log_job_execution(job_name, message, level)
+    
     def _add_maintenance_priority(self, command: List[str]) -> List[str]:
         """Add nice/ionice priority for maintenance operations (lower than backups)"""
         return [
@@ -152,6 +174,9 @@ class MaintenanceExecutor:
         
         args = ['--prune']  # Always prune after forget
         
+        # Group so each job's snapshots are retained independently in shared repositories
+        args.extend(['--group-by', MaintenanceDefaults.FORGET_GROUP_BY])
+        
         # Use configured values or defaults
         keep_last = retention_config.get('keep_last', MaintenanceDefaults.KEEP_LAST)
         keep_hourly = retention_config.get('keep_hourly', MaintenanceDefaults.KEEP_HOURLY)
@@ -2,8 +2,8 @@
 Maintenance operation data structures
 Defines the contract for maintenance operations
 """
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
 
 
 @dataclass 
@@ -17,6 +17,14 @@ class MaintenanceOperation:
     container_runtime: str = "docker"
     retention_config: Optional[Dict[str, Any]] = None
     check_config: Optional[Dict[str, Any]] = None
+    job_names: List[str] = field(default_factory=list)  # all jobs sharing the repository
+    repository_key: str = ""  # repository identity (URL, plus executing host for local paths)
+    attempt: int = 0  # conflict-deferred retries so far
+    
+    @property
+    def target_job_names(self) -> List[str]:
+        """Jobs whose logs receive this operation's results"""
+        return self.job_names or [self.job_name]
 
 
 @dataclass
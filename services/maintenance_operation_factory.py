@@ -2,7 +2,7 @@
 Maintenance operation factory
 Creates MaintenanceOperation objects from job configurations
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
 from services.maintenance_operation import MaintenanceOperation
 from services.maintenance_config_manager import MaintenanceConfigManager
 
@@ -34,6 +34,35 @@ class MaintenanceOperationFactory:
         
         return base_operation
     
+    def create_repository_operation(self, repository_key: str, job_names: List[str], operation_type: str) -> MaintenanceOperation:
+        """
+        Create one operation covering every job that writes to a repository (first job leads).
+        Runs with the lead job's URL and host - every job in a group shares both for host-relative repositories.
+        """
+        lead_job = job_names[0]
+        if operation_type == 'discard':
+            operation = self.create_discard_operation(lead_job)
+            operation.retention_config = self.config_manager.get_combined_retention_policy(job_names)
+            self._warn_retention_raised(job_names, operation.retention_config)
+        elif operation_type == 'check':
+            operation = self.create_check_operation(lead_job)
+        else:
+            raise ValueError(f"Unknown maintenance operation type: {operation_type}")
+        
+        operation.repository_key = repository_key
+        operation.job_names = list(job_names)
+        return operation
+    
+    def _warn_retention_raised(self, job_names: List[str], combined: Dict[str, Any]):
+        """Log jobs whose own keep_* values are raised by the shared repository's combined policy"""
+        for job_name in job_names:
+            own = self.config_manager.get_effective_retention_policy(job_name)
+            raised = [f"{key} {own[key]}->{value}" for key, value in combined.items()
+                      if isinstance(own.get(key), int) and isinstance(value, int) and value > own[key]]
+            if raised:
+                print(f"WARNING: Job '{job_name}' shares its repository with {', '.join(n for n in job_names if n != job_name)}; "
+                      f"discard keeps more than configured ({', '.join(raised)})")
+    
     def _create_base_operation(self, job_name: str, job_config: Dict[str, Any], operation_type: str) -> MaintenanceOperation:
         """Create base maintenance operation from job config"""
         dest_config = job_config.get('dest_config', {})
@@ -43,6 +72,10 @@ class MaintenanceOperationFactory:
         repository_url = dest_config.get('repo_uri', dest_config.get('dest_string', ''))
         environment_vars = self._build_environment_vars(dest_config)
         
+        # Persistent repository cache for local runs (container runs mount the host's cache instead)
+        from services.restic_cache import ResticCache
+        environment_vars.update(ResticCache.local_environment(repository_url))
+        
         # SSH config for remote operations
         ssh_config = None
         if source_config.get('hostname'):
@@ -1,94 +1,98 @@
 """
 Maintenance scheduler service
-Handles scheduling and unscheduling of maintenance operations
+Handles scheduling and unscheduling of maintenance operations, one set per repository
 """
+import hashlib
+from typing import List
 from services.maintenance_config_manager import MaintenanceConfigManager
-from services.maintenance_operation_factory import MaintenanceOperationFactory
 
 
 class MaintenanceScheduler:
     """Service for scheduling maintenance operations"""
-    
+
+    OPERATION_TYPES = ('discard', 'check')
+
     def __init__(self, backup_config, scheduler_service):
         self.backup_config = backup_config
         self.scheduler_service = scheduler_service
         self.config_manager = MaintenanceConfigManager(backup_config)
-        self.operation_factory = MaintenanceOperationFactory(backup_config)
-    
+
     def schedule_job_maintenance(self, job_name: str):
-        """Schedule maintenance operations for a job"""
+        """Schedule maintenance operations for a job's repository"""
+        self.sync_repository_schedules()
+
         # Check if maintenance is enabled
         if not self.config_manager.is_maintenance_enabled(job_name):
             print(f"INFO: Auto maintenance disabled for job '{job_name}' - skipping scheduling")
             return
-        
-        # Schedule discard operation (forget+prune combined)
-        self._schedule_discard_operation(job_name)
-        
-        # Schedule check operation  
-        self._schedule_check_operation(job_name)
-        
+
         print(f"INFO: Scheduled maintenance operations for job '{job_name}'")
-    
+
     def unschedule_job_maintenance(self, job_name: str):
-        """Remove scheduled maintenance operations for a job"""
-        discard_job_id = f"maintenance_discard_{job_name}"
-        check_job_id = f"maintenance_check_{job_name}"
-        
-        self.scheduler_service.remove_job(discard_job_id)
-        self.scheduler_service.remove_job(check_job_id)
-        
+        """Remove a job from repository maintenance (shared repositories keep their schedule)"""
+        self.sync_repository_schedules(exclude_jobs=[job_name])
         print(f"INFO: Unscheduled maintenance operations for job '{job_name}'")
-    
+
     def reschedule_job_maintenance(self, job_name: str):
         """Reschedule maintenance operations for a job (remove + add)"""
-        self.unschedule_job_maintenance(job_name)
-        self.schedule_job_maintenance(job_name)
-    
-    def _schedule_discard_operation(self, job_name: str):
-        """Schedule discard operation for a job (combines forget+prune)"""
-        schedule = self.config_manager.get_discard_schedule(job_name)
+        self.sync_repository_schedules()
+
+    def sync_repository_schedules(self, exclude_jobs: List[str] = None) -> int:
+        """
+        Schedule one discard and one check per repository and drop stale entries.
+        Returns the number of repositories scheduled.
+        """
+        exclude_jobs = set(exclude_jobs or [])
+        expected_ids = set()
+        scheduled = 0
+
+        for repository_key, job_names in self.config_manager.get_repository_groups().items():
+            job_names = [name for name in job_names if name not in exclude_jobs]
+            if not job_names:
+                continue
+
+            for operation_type in self.OPERATION_TYPES:
+                expected_ids.add(self._schedule_repository_operation(repository_key, job_names, operation_type))
+            scheduled += 1
+
+        # Remove schedules for repositories (or legacy per-job entries) no longer configured
+        for operation_type in self.OPERATION_TYPES:
+            for job_id in self.scheduler_service.get_job_ids(f"maintenance_{operation_type}_"):
+                if job_id not in expected_ids:
+                    self.scheduler_service.remove_job(job_id)
+
+        return scheduled
+
+    @staticmethod
+    def repository_id(repository_key: str) -> str:
+        """Hashed repository id - URLs may embed credentials, so only this is persisted and logged"""
+        return hashlib.sha1(repository_key.encode()).hexdigest()[:12]
+
+    @classmethod
+    def get_repository_job_id(cls, repository_key: str, operation_type: str) -> str:
+        """Stable scheduler id for a repository maintenance operation"""
+        return f"maintenance_{operation_type}_repo_{cls.repository_id(repository_key)}"
+
+    def _schedule_repository_operation(self, repository_key: str, job_names: List[str], operation_type: str) -> str:
+        """Register module-level maintenance callable for a repository (first job's schedule leads)"""
+        from services.scheduled_tasks import run_scheduled_maintenance
+        from services.schedule_loader import resolve_misfire_policy
+
+        lead_job = job_names[0]
+        if operation_type == 'discard':
+            schedule = self.config_manager.get_discard_schedule(lead_job)
+        else:
+            schedule = self.config_manager.get_check_schedule(lead_job)
+
         timezone = self.backup_config.config.get('global_settings', {}).get('scheduler_timezone', 'UTC')
-        
-        job_id = f"maintenance_discard_{job_name}"
-        
-        # Create operation factory function for scheduler
-        def execute_discard():
-            from services.restic_maintenance_service import ResticMaintenanceService
-            maintenance_service = ResticMaintenanceService(
-                backup_config=self.backup_config,
-                scheduler_service=self.scheduler_service
-            )
-            operation = self.operation_factory.create_discard_operation(job_name)
-            maintenance_service.execute_maintenance_operation(operation)
-        
+        job_id = self.get_repository_job_id(repository_key, operation_type)
+
         self.scheduler_service.add_crontab_job(
-            func=execute_discard,
+            func=run_scheduled_maintenance,
             job_id=job_id,
             crontab=schedule,
-            timezone=timezone
+            timezone=timezone,
+            args=[self.repository_id(repository_key), operation_type],
+            **resolve_misfire_policy(self.backup_config.get_backup_job(lead_job) or {}, self.backup_config)
         )
-    
-    def _schedule_check_operation(self, job_name: str):
-        """Schedule check operation for a job"""
-        schedule = self.config_manager.get_check_schedule(job_name)
-        timezone = self.backup_config.config.get('global_settings', {}).get('scheduler_timezone', 'UTC')
-        
-        job_id = f"maintenance_check_{job_name}"
-        
-        # Create operation factory function for scheduler
-        def execute_check():
-            from services.restic_maintenance_service import ResticMaintenanceService
-            maintenance_service = ResticMaintenanceService(
-                backup_config=self.backup_config,
-                scheduler_service=self.scheduler_service
-            )
-            operation = self.operation_factory.create_check_operation(job_name)
-            maintenance_service.execute_maintenance_operation(operation)
-        
-        self.scheduler_service.add_crontab_job(
-            func=execute_check,
-            job_id=job_id,
-            crontab=schedule,
-            timezone=timezone
-        )
\ No newline at end of file
+        return job_id
@@ -63,12 +63,19 @@ class NotificationMessageFormatter:
         return default_message
     
     def create_job_delay_message(self, job_name: str, delay_minutes: float, 
-                                conflicting_jobs: List[str], source: str) -> tuple[str, str]:
-        """Create message for job delay notifications"""
+                                conflicting_jobs: List[str], source: str, predicted: bool = False) -> tuple[str, str]:
+        """Create message for job delay notifications (predicted=True when delay is an ETA)"""
         title = f"Job Delayed: {job_name}"
         conflict_list = ", ".join(conflicting_jobs) if conflicting_jobs else "unknown jobs"
+        if predicted:
+            delay_line = (
+                f"Backup job '{job_name}' is waiting on resource conflicts and is expected to start "
+                f"in about {delay_minutes:.1f} minutes (based on previous run durations).\n\n"
+            )
+        else:
+            delay_line = f"Backup job '{job_name}' was delayed {delay_minutes:.1f} minutes due to resource conflicts.\n\n"
         message = (
-            f"Backup job '{job_name}' was delayed {delay_minutes:.1f} minutes due to resource conflicts.\n\n"
+            delay_line +
             f"Conflicting jobs: {conflict_list}\n"
             f"Triggered by: {source}\n\n"
             f"Consider adjusting schedules to reduce conflicts."
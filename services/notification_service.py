@@ -57,10 +57,10 @@ class NotificationService:
                     )
     
     def send_job_delay_notification(self, job_name: str, delay_minutes: float, 
-                                  conflicting_jobs: List[str], source: str):
+                                  conflicting_jobs: List[str], source: str, predicted: bool = False):
         """Send specific notification for job delays due to conflicts"""
         title, message = self.message_formatter.create_job_delay_message(
-            job_name, delay_minutes, conflicting_jobs, source
+            job_name, delay_minutes, conflicting_jobs, source, predicted
         )
         self.send_notification(title, message, "warning", job_name)
     
@@ -0,0 +1,329 @@
+"""
+Persistent remote execution agent
+Optional python3 helper started over one long-lived SSH session per host, answering line-delimited
+JSON-RPC on stdin/stdout (listdir, stat, access, has_contents, disk_usage, run) so interactive
+operations skip the per-call SSH session and ls/test output parsing
+"""
+import json
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from typing import Any, Dict, Optional
+from services.ssh_transport import SSHTransport
+
+
+# Runs under `python3 -u -c` on the remote host; stdlib only and Python 3.6 compatible (no f-strings)
+AGENT_SCRIPT = r'''
+import json, os, stat, subprocess, sys
+
+def _entry(name, st, is_dir):
+    return {"name": name, "type": "directory" if is_dir else "file", "size": st.st_size,
+            "mtime": int(st.st_mtime), "mode": stat.filemode(st.st_mode)}
+
+def listdir(path):
+    entries = []
+    for entry in os.scandir(path):
+        try:
+            entries.append(_entry(entry.name, entry.stat(follow_symlinks=False), entry.is_dir()))
+        except OSError:
+            continue
+    return sorted(entries, key=lambda e: e["name"])
+
+def stat_path(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {"exists": False}
+    result = _entry(os.path.basename(path.rstrip("/")) or "/", st, stat.S_ISDIR(st.st_mode))
+    result["exists"] = True
+    return result
+
+def access(path):
+    return {"exists": os.path.exists(path), "is_dir": os.path.isdir(path),
+            "readable": os.access(path, os.R_OK), "writable": os.access(path, os.W_OK),
+            "executable": os.access(path, os.X_OK)}
+
+def has_contents(path):
+    if not os.path.exists(path):
+        return False
+    if not os.path.isdir(path):
+        return True
+    try:
+        with os.scandir(path) as entries:
+            return any(True for _ in entries)
+    except OSError:
+        return True
+
+def disk_usage(path):
+    st = os.statvfs(path)
+    total, free = st.f_blocks * st.f_frsize, st.f_bavail * st.f_frsize
+    return {"total": total, "free": free, "used": total - st.f_bfree * st.f_frsize}
+
+def run(command, timeout=None):
+    process = subprocess.Popen(command, shell=isinstance(command, str), stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        stdout, stderr = process.communicate()
+        return {"returncode": -1, "stdout": stdout, "stderr": "Command timed out", "timed_out": True}
+    return {"returncode": process.returncode, "stdout": stdout, "stderr": stderr, "timed_out": False}
+
+METHODS = {"ping": lambda: "pong", "listdir": listdir, "stat": stat_path, "access": access,
+           "has_contents": has_contents, "disk_usage": disk_usage, "run": run}
+
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    request_id = None
+    try:
+        request = json.loads(line)
+        request_id = request.get("id")
+        method = METHODS.get(request.get("method"))
+        if method is None:
+            response = {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": -32601, "message": "Unknown method: %s" % request.get("method")}}
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": method(**request.get("params", {}))}
+    except Exception as e:
+        response = {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": -32000, "message": str(e), "type": type(e).__name__}}
+    sys.stdout.write(json.dumps(response) + "\n")
+    sys.stdout.flush()
+'''
+
+
+class RemoteAgentError(Exception):
+    """A remote method failed (the agent itself is still usable)"""
+
+    def __init__(self, message: str, error_type: str = ''):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class AgentConnectionError(Exception):
+    """The agent could not be started or its SSH session was lost"""
+
+
+class RemoteAgent:
+    """One agent process behind one SSH session; requests are serialized over the channel"""
+
+    def __init__(self, target: str, request_timeout: float = 30):
+        self.target = target
+        self.request_timeout = request_timeout
+        self.last_used = time.time()
+        self._process: Optional[subprocess.Popen] = None
+        self._responses: queue.Queue = queue.Queue()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the SSH session (and agent) is still running"""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Launch the agent and confirm it answers"""
+        remote_command = f"python3 -u -c {shlex.quote(AGENT_SCRIPT)}"
+        cmd = SSHTransport.build_command(self.target, remote_command, log_level='ERROR')
+        try:
+            self._process = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, bufsize=1
+            )
+        except OSError as e:
+            raise AgentConnectionError(f'Cannot start agent on {self.target}: {e}')
+
+        threading.Thread(
+            target=self._read_responses, daemon=True, name=f"agent-{self.target}"
+        ).start()
+        self.call('ping', reply_timeout=15)
+
+    def call(self, method: str, reply_timeout: Optional[float] = None, **params) -> Any:
+        """Send one request and wait for its response (run() waits for its own timeout plus slack)"""
+        if reply_timeout is None:
+            reply_timeout = max(self.request_timeout, (params.get('timeout') or 0) + 15)
+        with self._lock:
+            if not self.alive:
+                raise AgentConnectionError(f'Agent on {self.target} is not running')
+
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self._process.stdin.write(json.dumps({
+                    'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params
+                }) + '\n')
+                self._process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self.close()
+                raise AgentConnectionError(f'Agent on {self.target} went away: {e}')
+
+            try:
+                response = self._responses.get(timeout=reply_timeout)
+            except queue.Empty:
+                # A late answer would pair with the next request - drop the session instead
+                self.close()
+                raise AgentConnectionError(f'Agent on {self.target} did not answer {method} in time')
+            self.last_used = time.time()
+
+        if response is None or response.get('id') != request_id:
+            self.close()
+            raise AgentConnectionError(f'Agent on {self.target} closed the channel')
+        if 'error' in response:
+            error = response['error']
+            raise RemoteAgentError(error.get('message', 'Remote call failed'), error.get('type', ''))
+        return response.get('result')
+
+    def close(self):
+        """Stop the agent (closing stdin ends its loop and the SSH session)"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def _read_responses(self):
+        """Reader thread: queue parsed response lines, None at end of stream"""
+        process = self._process
+        for line in process.stdout:
+            try:
+                self._responses.put(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        self._responses.put(None)
+
+
+class RemoteAgentPool:
+    """
+    Process-wide agents keyed by user@host, started on first use and closed when idle.
+    call() returns None whenever no agent is available so callers fall back to plain SSH commands.
+    """
+
+    enabled = False
+    idle_seconds = 600      # agents unused this long are closed
+    retry_seconds = 300     # hosts where the agent failed to start are not retried for this long
+
+    _agents: Dict[str, RemoteAgent] = {}
+    _failed: Dict[str, float] = {}
+    _start_locks: Dict[str, threading.Lock] = {}
+    _reaper_running = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, global_settings: Dict):
+        """Apply remote_agent_enabled / remote_agent_idle_seconds from global settings"""
+        cls.enabled = bool(global_settings.get('remote_agent_enabled', False))
+        cls.idle_seconds = int(global_settings.get('remote_agent_idle_seconds', 600))
+        if not cls.enabled:
+            cls.close_all()
+
+    @classmethod
+    def call(cls, username: str, hostname: str, method: str, **params) -> Any:
+        """
+        Run a method on the host's agent. Returns None when the agent is disabled or unavailable;
+        raises RemoteAgentError when the method itself failed remotely.
+        """
+        if not cls.enabled or not hostname or not username:
+            return None
+        target = f"{username}@{hostname}"
+        agent = cls._get_agent(target)
+        if agent is None:
+            return None
+        try:
+            return agent.call(method, **params)
+        except AgentConnectionError as e:
+            print(f"WARNING: {e} - falling back to SSH commands")
+            with cls._lock:
+                if cls._agents.get(target) is agent:
+                    del cls._agents[target]
+            return None
+
+    @classmethod
+    def close_idle(cls):
+        """Close agents idle longer than idle_seconds (and any whose session died)"""
+        now = time.time()
+        with cls._lock:
+            stale = [target for target, agent in cls._agents.items()
+                     if not agent.alive or now - agent.last_used > cls.idle_seconds]
+            agents = [cls._agents.pop(target) for target in stale]
+        for agent in agents:
+            agent.close()
+
+    @classmethod
+    def close_all(cls):
+        """Close every agent"""
+        with cls._lock:
+            agents = list(cls._agents.values())
+            cls._agents.clear()
+        for agent in agents:
+            agent.close()
+
+    @classmethod
+    def get_all(cls) -> Dict[str, Dict[str, Any]]:
+        """Running agents keyed by user@host"""
+        with cls._lock:
+            return {target: {'alive': agent.alive, 'idle_seconds': round(time.time() - agent.last_used, 1)}
+                    for target, agent in cls._agents.items()}
+
+    @classmethod
+    def _get_agent(cls, target: str) -> Optional[RemoteAgent]:
+        """Running agent for a target, starting one if needed (one start attempt per retry window)"""
+        with cls._lock:
+            agent = cls._running_agent(target)
+            if agent is not None or cls._recently_failed(target):
+                return agent
+            start_lock = cls._start_locks.setdefault(target, threading.Lock())
+
+        # Only callers for this host wait on a slow start; other hosts and get_all keep the pool lock
+        with start_lock:
+            with cls._lock:
+                agent = cls._running_agent(target)
+                if agent is not None or cls._recently_failed(target):
+                    return agent
+
+            agent = RemoteAgent(target)
+            try:
+                agent.start()
+            except (AgentConnectionError, RemoteAgentError) as e:
+                agent.close()
+                with cls._lock:
+                    cls._failed[target] = time.time()
+                print(f"WARNING: Remote agent unavailable on {target} (python3 required): {e}")
+                return None
+
+            with cls._lock:
+                cls._failed.pop(target, None)
+                cls._agents[target] = agent
+                if not cls._reaper_running:
+                    cls._reaper_running = True
+                    threading.Thread(target=cls._reap, daemon=True, name="agent-reaper").start()
+            return agent
+
+    @classmethod
+    def _running_agent(cls, target: str) -> Optional[RemoteAgent]:
+        """Live agent for a target, if any (call with the pool lock held)"""
+        agent = cls._agents.get(target)
+        return agent if agent is not None and agent.alive else None
+
+    @classmethod
+    def _recently_failed(cls, target: str) -> bool:
+        """Whether a start on this target failed within the retry window (call with the pool lock held)"""
+        return time.time() - cls._failed.get(target, 0) < cls.retry_seconds
+
+    @classmethod
+    def _reap(cls):
+        """Background loop closing idle agents; exits once none are left"""
+        while True:
+            time.sleep(60)
+            cls.close_idle()
+            with cls._lock:
+                if not cls._agents:
+                    cls._reaper_running = False
+                    return
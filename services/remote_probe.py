@@ -0,0 +1,112 @@
+"""
+Remote capability probe
+Sends one POSIX shell script over a single SSH session and gets back JSON describing
+connectivity, path permissions, tool paths and versions, container runtimes, restic image and resources
+"""
+import json
+import shlex
+import subprocess
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from services.ssh_transport import SSHTransport
+
+
+# Runs under `sh -s -- <path> <image>`; only POSIX sh builtins plus uname/id/sed/head/tr/getconf/df/tail/awk
+REMOTE_PROBE_SCRIPT = r'''
+esc() { printf '%s' "$1" | head -1 | sed -e 's/\\/\\\\/g' -e 's/"/\\"/g' | tr '\t\r' '  '; }
+str() { printf '"%s"' "$(esc "$1")"; }
+flag() { if "$@" 2>/dev/null; then printf true; else printf false; fi; }
+ver() { command -v "$1" >/dev/null 2>&1 && "$@" 2>/dev/null | head -1; }
+img() { command -v "$1" >/dev/null 2>&1 && "$1" image inspect "$IMAGE" >/dev/null 2>&1; }
+digest() { command -v "$1" >/dev/null 2>&1 && "$1" image inspect --format '{{index .RepoDigests 0}}' "$IMAGE" 2>/dev/null | head -1; }
+P="$1"; IMAGE="$2"
+printf '{"probe_version":2'
+printf ',"host":{"hostname":%s,"os":%s,"arch":%s,"user":%s,"uid":%s}' \
+  "$(str "$(uname -n)")" "$(str "$(uname -s)")" "$(str "$(uname -m)")" "$(str "$(id -un)")" "$(str "$(id -u)")"
+if [ -n "$P" ]; then
+  printf ',"path":{"value":%s,"exists":%s,"is_dir":%s,"readable":%s,"writable":%s,"executable":%s}' \
+    "$(str "$P")" "$(flag test -e "$P")" "$(flag test -d "$P")" "$(flag test -r "$P")" "$(flag test -w "$P")" "$(flag test -x "$P")"
+fi
+printf ',"tools":{"rsync":%s,"podman":%s,"docker":%s,"restic":%s,"rclone":%s,"borg":%s,"kopia":%s}' \
+  "$(str "$(ver rsync --version)")" "$(str "$(ver podman --version)")" "$(str "$(ver docker --version)")" "$(str "$(ver restic version)")" \
+  "$(str "$(ver rclone version --check=false)")" "$(str "$(ver borg --version)")" "$(str "$(ver kopia --version)")"
+printf ',"paths":{"rsync":%s,"ssh":%s,"podman":%s,"docker":%s,"restic":%s,"rclone":%s,"borg":%s,"kopia":%s}' \
+  "$(str "$(command -v rsync)")" "$(str "$(command -v ssh)")" "$(str "$(command -v podman)")" "$(str "$(command -v docker)")" \
+  "$(str "$(command -v restic)")" "$(str "$(command -v rclone)")" "$(str "$(command -v borg)")" "$(str "$(command -v kopia)")"
+D="$(digest podman)"; [ -n "$D" ] || D="$(digest docker)"
+printf ',"restic_image":{"reference":%s,"podman":%s,"docker":%s,"digest":%s}' \
+  "$(str "$IMAGE")" "$(flag img podman)" "$(flag img docker)" "$(str "$D")"
+printf ',"resources":{"cpu_count":%s,"disk_free_kb":%s}' \
+  "$(str "$(getconf _NPROCESSORS_ONLN 2>/dev/null)")" "$(str "$(df -Pk "${P:-.}" 2>/dev/null | tail -1 | awk '{print $4}')")"
+printf '}\n'
+'''
+
+
+@dataclass
+class ProbeResult:
+    """Parsed output of one remote probe run"""
+    success: bool
+    data: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def tools(self) -> Dict[str, str]:
+        """Tool name -> first line of its version output ('' when missing)"""
+        return self.data.get('tools', {})
+
+    @property
+    def path(self) -> Optional[Dict[str, Any]]:
+        """Path permission flags, None when no path was probed"""
+        return self.data.get('path')
+
+    @property
+    def restic_image(self) -> Dict[str, Any]:
+        """Whether the restic image is already present per container runtime"""
+        return self.data.get('restic_image', {})
+
+    @property
+    def paths(self) -> Dict[str, str]:
+        """Tool name -> resolved executable path ('' when missing)"""
+        return self.data.get('paths', {})
+
+    @property
+    def resources(self) -> Dict[str, str]:
+        """CPU count and free disk (KiB) at the probed path or login directory"""
+        return self.data.get('resources', {})
+
+
+class RemoteProbe:
+    """Runs the capability probe script on a remote host in one round trip"""
+
+    def __init__(self, connect_timeout: int = 5, timeout_seconds: int = 20):
+        self.connect_timeout = connect_timeout
+        self.timeout_seconds = timeout_seconds
+
+    def probe(self, username: str, hostname: str, path: str = "", restic_image: Optional[str] = None) -> ProbeResult:
+        """Probe user@host (and optionally a path); ssh failures come back as success=False"""
+        if restic_image is None:
+            from services.container_command_builder import ContainerCommandBuilder
+            restic_image = ContainerCommandBuilder().restic_image
+
+        remote_command = f"sh -s -- {shlex.quote(path or '')} {shlex.quote(restic_image)}"
+        cmd = SSHTransport.build_command(
+            f'{username}@{hostname}', remote_command, connect_timeout=self.connect_timeout
+        )
+
+        try:
+            result = subprocess.run(
+                cmd, input=REMOTE_PROBE_SCRIPT, capture_output=True, text=True, timeout=self.timeout_seconds
+            )
+        except subprocess.TimeoutExpired:
+            return ProbeResult(success=False, error='SSH connection timed out')
+        except Exception as e:
+            return ProbeResult(success=False, error=f'SSH test error: {str(e)}')
+
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() or 'Connection failed'
+            return ProbeResult(success=False, error=f'SSH connection failed: {error_msg}')
+
+        try:
+            return ProbeResult(success=True, data=json.loads(result.stdout.strip().splitlines()[-1]))
+        except (json.JSONDecodeError, IndexError):
+            return ProbeResult(success=False, error='Remote probe returned unreadable output')
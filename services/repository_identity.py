@@ -0,0 +1,37 @@
+"""
+Repository identity
+A local-path restic repository lives on whichever host runs restic, so the same path on two
+SSH hosts is two repositories; remote backends (rest:, s3:, sftp:, ...) are identified by URL alone
+"""
+import re
+from typing import Any, Dict
+
+
+class RepositoryIdentity:
+    """Keys that tell repositories apart across executing hosts"""
+
+    @staticmethod
+    def is_host_relative(repository_url: str) -> bool:
+        """True for local-path repositories (plain paths or local:), which resolve on the executing host"""
+        if repository_url.startswith('local:'):
+            return True
+        return not re.match(r'^[A-Za-z][A-Za-z0-9+.-]*:', repository_url)
+
+    @classmethod
+    def key(cls, repository_url: str, source_config: Dict[str, Any] = None) -> str:
+        """
+        Repository key: the URL itself, prefixed with user@host for host-relative repositories
+        run over SSH (remote backends keep their URL, so their derived ids stay unchanged)
+        """
+        source_config = source_config or {}
+        hostname = source_config.get('hostname')
+        if hostname and cls.is_host_relative(repository_url):
+            return f"{source_config.get('username', 'root')}@{hostname}:{repository_url}"
+        return repository_url
+
+    @classmethod
+    def for_job(cls, job_config: Dict[str, Any]) -> str:
+        """Repository key of a job's restic destination"""
+        dest_config = job_config.get('dest_config', {})
+        repository_url = dest_config.get('repo_uri', dest_config.get('dest_string', ''))
+        return cls.key(repository_url, job_config.get('source_config', {})) if repository_url else ''
@@ -16,8 +16,8 @@ class RepositoryService(ABC):
         pass
     
     @abstractmethod
-    def list_snapshots(self, job_config: Dict[str, Any]) -> Dict[str, Any]:
-        """List all snapshots in the repository"""
+    def list_snapshots(self, job_config: Dict[str, Any], refresh: bool = False) -> Dict[str, Any]:
+        """List all snapshots in the repository (refresh bypasses any cache)"""
         pass
     
     @abstractmethod
@@ -3,6 +3,7 @@ Restic argument builder for different command types
 Handles command-specific argument construction with consistent patterns
 """
 from typing import Dict, List, Optional
+from services.restic_performance import ResticPerformance
 
 
 class ResticArgumentBuilder:
@@ -30,6 +31,16 @@ class ResticArgumentBuilder:
         if job_config.get('verbose', True):  # Default to verbose for better logging
             args.append('--verbose')
         
+        # Bandwidth cap in KiB/s (set from the bandwidth budget at launch, or per job)
+        bandwidth_limit = job_config.get('bandwidth_limit')
+        if bandwidth_limit:
+            args.extend(['--limit-upload', str(int(bandwidth_limit)), '--limit-download', str(int(bandwidth_limit))])
+        
+        # Performance options (resolved from repository, job and auto-tune settings at launch)
+        performance = job_config.get('restic_performance')
+        if performance:
+            args.extend(ResticPerformance.build_args(performance, ResticPerformance.repository_url(job_config)))
+        
         return args
     
     @staticmethod
@@ -0,0 +1,137 @@
+"""
+Persistent restic cache directories
+One cache directory per repository on each executing host (bind-mounted into --rm containers),
+so repeat operations reuse the downloaded index instead of fetching it again; size/age cleanup policy
+"""
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+
+CONTAINER_CACHE_DIR = '/restic-cache'
+REMOTE_HOME = '$HOME'   # expanded by the remote shell (see ContainerCommandBuilder.to_remote_shell)
+
+
+class ResticCache:
+    """Cache directory layout and cleanup for restic repositories"""
+
+    enabled = True
+    local_root = os.path.join(os.environ.get('HIGHBALL_CACHE_DIR', '/var/cache/highball'), 'restic')
+    remote_root = '.cache/highball/restic'   # relative to the remote user's home directory
+    max_size_mb = 2048                       # per repository; data packs are trimmed first when exceeded
+    max_age_days = 30                        # caches unused this long are removed
+
+    @classmethod
+    def configure(cls, global_settings: Dict):
+        """Apply restic_cache_* settings from global settings"""
+        cls.enabled = bool(global_settings.get('restic_cache_enabled', True))
+        cls.local_root = global_settings.get('restic_cache_dir') or cls.local_root
+        cls.remote_root = (global_settings.get('restic_cache_remote_dir') or cls.remote_root).strip('/')
+        cls.max_size_mb = int(global_settings.get('restic_cache_max_size_mb', cls.max_size_mb))
+        cls.max_age_days = int(global_settings.get('restic_cache_max_age_days', cls.max_age_days))
+
+    @staticmethod
+    def repository_id(repository_url: str) -> str:
+        """Stable directory name for a repository (hashed - URLs may carry credentials)"""
+        return hashlib.sha1(repository_url.encode()).hexdigest()[:16]
+
+    @classmethod
+    def local_dir(cls, repository_url: str) -> Optional[str]:
+        """Cache directory for local restic runs, created on demand (None when disabled or unwritable)"""
+        if not cls.enabled or not repository_url:
+            return None
+        path = os.path.join(cls.local_root, cls.repository_id(repository_url))
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            print(f"WARNING: restic cache unavailable at {path}: {e}")
+            return None
+        return path
+
+    @classmethod
+    def local_environment(cls, repository_url: str) -> Dict[str, str]:
+        """Environment selecting the persistent cache for local restic runs"""
+        path = cls.local_dir(repository_url)
+        return {'RESTIC_CACHE_DIR': path or '/tmp/.cache/restic'}
+
+    @classmethod
+    def remote_dir(cls, repository_url: str) -> str:
+        """Cache directory on a remote host, as a $HOME-relative shell path"""
+        return f"{REMOTE_HOME}/{cls.remote_root}/{cls.repository_id(repository_url)}"
+
+    @classmethod
+    def container_flags(cls, repository_url: str) -> List[str]:
+        """Container run flags bind-mounting the host's cache directory for a repository"""
+        if not cls.enabled or not repository_url:
+            return ['-e', 'RESTIC_CACHE_DIR=/tmp/.cache/restic']
+        return [
+            '-v', f'{cls.remote_dir(repository_url)}:{CONTAINER_CACHE_DIR}',
+            '-e', f'RESTIC_CACHE_DIR={CONTAINER_CACHE_DIR}',
+        ]
+
+    @classmethod
+    def cleanup_local(cls) -> int:
+        """Apply the age/size policy to local caches; returns number of directories removed or trimmed"""
+        if not os.path.isdir(cls.local_root):
+            return 0
+
+        cleaned = 0
+        cutoff = time.time() - cls.max_age_days * 86400
+        for entry in os.scandir(cls.local_root):
+            if not entry.is_dir():
+                continue
+            # restic touches its per-repository directory on every use
+            repo_dirs = [sub for sub in os.scandir(entry.path) if sub.is_dir()]
+            for repo_dir in repo_dirs:
+                if repo_dir.stat().st_mtime < cutoff:
+                    shutil.rmtree(repo_dir.path, ignore_errors=True)
+                    cleaned += 1
+                elif cls._dir_size(repo_dir.path) > cls.max_size_mb * 1024 * 1024:
+                    # Tree/data packs are re-fetched on demand; keep the index and snapshots
+                    shutil.rmtree(os.path.join(repo_dir.path, 'data'), ignore_errors=True)
+                    cleaned += 1
+        return cleaned
+
+    @classmethod
+    def cleanup_remote_script(cls) -> str:
+        """POSIX shell applying the same age/size policy under the remote cache root"""
+        root = f'"$HOME"/{shlex.quote(cls.remote_root)}'
+        limit_kb = cls.max_size_mb * 1024
+        return (
+            f'root={root}; [ -d "$root" ] || exit 0; '
+            f'find "$root" -mindepth 2 -maxdepth 2 -type d -mtime +{cls.max_age_days} -exec rm -rf {{}} +; '
+            f'for d in "$root"/*/*/; do [ -d "$d" ] || continue; '
+            f'kb=$(du -sk "$d" | awk \'{{print $1}}\'); '
+            f'[ "$kb" -gt {limit_kb} ] && rm -rf "$d"data; done; exit 0'
+        )
+
+    @classmethod
+    def cleanup_remote(cls, username: str, hostname: str) -> bool:
+        """Apply the cleanup policy on a remote host over SSH"""
+        from services.ssh_transport import SSHTransport
+        cmd = SSHTransport.build_command(f'{username}@{hostname}', cls.cleanup_remote_script(), log_level='ERROR')
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        except (subprocess.TimeoutExpired, OSError) as e:
+            print(f"WARNING: restic cache cleanup on {hostname} failed: {e}")
+            return False
+        if result.returncode != 0:
+            print(f"WARNING: restic cache cleanup on {hostname} failed: {result.stderr.strip()}")
+            return False
+        return True
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        """Total size of files under path in bytes"""
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    pass
+        return total
@@ -2,10 +2,11 @@
 Restic content analysis service
 Handles source and repository content comparison for validation
 """
-import subprocess
+import asyncio
 import json
 import os
 import random
+from services.async_command_execution_service import AsyncCommandExecutionService
 from typing import Dict, List, Set
 
 
@@ -19,9 +20,9 @@ class ResticContentAnalyzer:
         Returns match assessment with warning levels.
         """
         try:
-            # Get sample files from repository's latest snapshot
-            repo_files = ResticContentAnalyzer._get_repository_sample_files(
-                dest_config, source_config, source_type, timeout
+            # Sample repository's latest snapshot and source concurrently
+            repo_files, source_files = AsyncCommandExecutionService.run(
+                ResticContentAnalyzer._collect_samples(dest_config, source_config, source_type, timeout)
             )
             
             if not repo_files:
@@ -31,11 +32,6 @@ class ResticContentAnalyzer:
                     'warning_level': 'info'
                 }
             
-            # Get sample files from source
-            source_files = ResticContentAnalyzer._get_source_sample_files(
-                source_config, source_type, timeout
-            )
-            
             if not source_files:
                 return {
                     'match_status': 'unable_to_analyze',
@@ -56,7 +52,16 @@ class ResticContentAnalyzer:
             }
     
     @staticmethod
-    def _get_repository_sample_files(dest_config, source_config, source_type, timeout):
+    async def _collect_samples(dest_config, source_config, source_type, timeout):
+        """Run repository and source sampling side by side"""
+        executor = AsyncCommandExecutionService()
+        return await asyncio.gather(
+            ResticContentAnalyzer._get_repository_sample_files(executor, dest_config, source_config, source_type, timeout),
+            ResticContentAnalyzer._get_source_sample_files(executor, source_config, source_type, timeout)
+        )
+    
+    @staticmethod
+    async def _get_repository_sample_files(executor, dest_config, source_config, source_type, timeout):
         """Get sample file/directory names from latest repository snapshot"""
         from services.restic_runner import ResticRunner
         
@@ -65,121 +70,42 @@ class ResticContentAnalyzer:
             runner = ResticRunner()
             repo_url = runner._build_repository_url(dest_config)
             env_vars = runner._build_environment(dest_config)
+            via_ssh = source_type == 'ssh' and source_config.get('hostname')
             
             # Get latest snapshot ID first
-            snapshot_id = ResticContentAnalyzer._get_latest_snapshot_id(
-                repo_url, env_vars, source_config, source_type, timeout
-            )
+            if via_ssh:
+                result = await executor.execute_via_ssh(
+                    source_config['hostname'], source_config['username'],
+                    f"restic -r '{repo_url}' snapshots --json --latest 1", env_vars, timeout=timeout
+                )
+            else:
+                result = await executor.execute_locally(
+                    ['restic', '-r', repo_url, 'snapshots', '--json', '--latest', '1'], env_vars, timeout=timeout
+                )
             
+            snapshots = json.loads(result.stdout) if result.success else None
+            snapshot_id = snapshots[0].get('id', '') if snapshots else None
             if not snapshot_id:
                 return []
             
-            # List files from latest snapshot
-            if source_type == 'ssh' and source_config.get('hostname'):
-                return ResticContentAnalyzer._get_repo_files_via_ssh(
-                    repo_url, env_vars, source_config, snapshot_id, timeout
+            # List files from latest snapshot, limit to reasonable number
+            if via_ssh:
+                result = await executor.execute_via_ssh(
+                    source_config['hostname'], source_config['username'],
+                    f"restic -r '{repo_url}' ls {snapshot_id} | head -20", env_vars, timeout=timeout
                 )
             else:
-                return ResticContentAnalyzer._get_repo_files_locally(
-                    repo_url, env_vars, snapshot_id, timeout
+                result = await executor.execute_locally(
+                    ['restic', '-r', repo_url, 'ls', snapshot_id], env_vars, timeout=timeout
                 )
-                
-        except Exception:
-            return []
-    
-    @staticmethod
-    def _get_latest_snapshot_id(repo_url, env_vars, source_config, source_type, timeout):
-        """Get the ID of the most recent snapshot"""
-        try:
-            if source_type == 'ssh' and source_config.get('hostname'):
-                # SSH execution
-                env_exports = []
-                if env_vars:
-                    for key, value in env_vars.items():
-                        env_exports.append(f"export {key}='{value}'")
-                
-                restic_cmd = f"restic -r '{repo_url}' snapshots --json --latest 1"
-                remote_command = '; '.join(env_exports + [restic_cmd])
-                
-                ssh_cmd = [
-                    'ssh', '-o', 'ConnectTimeout=10', '-o', 'BatchMode=yes',
-                    '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
-                    f"{source_config['username']}@{source_config['hostname']}",
-                    remote_command
-                ]
-                
-                result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=timeout)
-            else:
-                # Local execution
-                env = env_vars if env_vars else {}
-                cmd = ['restic', '-r', repo_url, 'snapshots', '--json', '--latest', '1']
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, env=env)
-            
-            if result.returncode == 0:
-                snapshots = json.loads(result.stdout)
-                if snapshots and len(snapshots) > 0:
-                    return snapshots[0].get('id', '')
-                    
-        except Exception:
-            pass
-            
-        return None
-    
-    @staticmethod
-    def _get_repo_files_via_ssh(repo_url, env_vars, source_config, snapshot_id, timeout):
-        """Get file list from repository via SSH"""
-        try:
-            env_exports = []
-            if env_vars:
-                for key, value in env_vars.items():
-                    env_exports.append(f"export {key}='{value}'")
-            
-            # List files from snapshot, limit to reasonable number
-            restic_cmd = f"restic -r '{repo_url}' ls {snapshot_id} | head -20"
-            remote_command = '; '.join(env_exports + [restic_cmd])
-            
-            ssh_cmd = [
-                'ssh', '-o', 'ConnectTimeout=10', '-o', 'BatchMode=yes',
-                '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
-                f"{source_config['username']}@{source_config['hostname']}",
-                remote_command
-            ]
-            
-            result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=timeout)
             
-            if result.returncode == 0:
-                files = result.stdout.strip().split('\n')
-                # Extract just the base names, sample randomly
-                basenames = [os.path.basename(f.strip()) for f in files if f.strip()]
-                return random.sample(basenames, min(10, len(basenames))) if basenames else []
+            return ResticContentAnalyzer._sample_basenames(result.stdout) if result.success else []
                 
         except Exception:
-            pass
-            
-        return []
-    
-    @staticmethod
-    def _get_repo_files_locally(repo_url, env_vars, snapshot_id, timeout):
-        """Get file list from repository locally"""
-        try:
-            env = env_vars if env_vars else {}
-            cmd = ['restic', '-r', repo_url, 'ls', snapshot_id]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, env=env)
-            
-            if result.returncode == 0:
-                files = result.stdout.strip().split('\n')
-                # Extract just the base names, sample randomly  
-                basenames = [os.path.basename(f.strip()) for f in files if f.strip()]
-                return random.sample(basenames, min(10, len(basenames))) if basenames else []
-                
-        except Exception:
-            pass
-            
-        return []
+            return []
     
     @staticmethod
-    def _get_source_sample_files(source_config, source_type, timeout):
+    async def _get_source_sample_files(executor, source_config, source_type, timeout):
         """Get sample file/directory names from source - uses source_paths format"""
         try:
             source_paths = source_config.get('source_paths', [])
@@ -191,62 +117,29 @@ class ResticContentAnalyzer:
             source_path = first_path_config.get('path', '/home') if isinstance(first_path_config, dict) else str(first_path_config)
             
             if source_type == 'ssh':
-                return ResticContentAnalyzer._get_source_files_via_ssh(
-                    source_config, source_path, timeout
+                # List files and directories, limit output
+                result = await executor.execute_via_ssh(
+                    source_config['hostname'], source_config['username'],
+                    f"find '{source_path}' -maxdepth 2 -type f -o -type d | head -20", timeout=timeout
                 )
             elif source_type == 'local':
-                return ResticContentAnalyzer._get_source_files_locally(source_path, timeout)
+                result = await executor.execute_locally(
+                    ['find', source_path, '-maxdepth', '2', '-type', 'f', '-o', '-type', 'd'], timeout=timeout
+                )
             else:
                 return []
-                
-        except Exception:
-            return []
-    
-    @staticmethod
-    def _get_source_files_via_ssh(source_config, source_path, timeout):
-        """Get source file list via SSH"""
-        try:
-            # List files and directories, limit output
-            list_cmd = f"find '{source_path}' -maxdepth 2 -type f -o -type d | head -20"
-            
-            ssh_cmd = [
-                'ssh', '-o', 'ConnectTimeout=10', '-o', 'BatchMode=yes',
-                '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
-                f"{source_config['username']}@{source_config['hostname']}",
-                list_cmd
-            ]
             
-            result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=timeout)
-            
-            if result.returncode == 0:
-                files = result.stdout.strip().split('\n')
-                # Extract base names, sample randomly
-                basenames = [os.path.basename(f.strip()) for f in files if f.strip()]
-                return random.sample(basenames, min(10, len(basenames))) if basenames else []
+            return ResticContentAnalyzer._sample_basenames(result.stdout) if result.success else []
                 
         except Exception:
-            pass
-            
-        return []
+            return []
     
     @staticmethod
-    def _get_source_files_locally(source_path, timeout):
-        """Get source file list locally"""
-        try:
-            cmd = ['find', source_path, '-maxdepth', '2', '-type', 'f', '-o', '-type', 'd']
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-            
-            if result.returncode == 0:
-                files = result.stdout.strip().split('\n')
-                # Extract base names, sample randomly
-                basenames = [os.path.basename(f.strip()) for f in files if f.strip()]
-                return random.sample(basenames, min(10, len(basenames))) if basenames else []
-                
-        except Exception:
-            pass
-            
-        return []
+    def _sample_basenames(output: str) -> List[str]:
+        """Extract base names from a path listing and sample randomly"""
+        files = output.strip().split('\n')
+        basenames = [os.path.basename(f.strip()) for f in files if f.strip()]
+        return random.sample(basenames, min(10, len(basenames))) if basenames else []
     
     @staticmethod
     def _compare_file_lists(repo_files: List[str], source_files: List[str]) -> int:
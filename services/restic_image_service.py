@@ -0,0 +1,129 @@
+"""
+Restic container image pre-pull
+Pulls the configured restic image on SSH source hosts in the background (on job save and image
+changes) so the first backup on a host doesn't spend its timeout budget pulling
+"""
+import shlex
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from services.container_command_builder import ContainerCommandBuilder
+from services.host_inventory import HostInventory
+from services.ssh_transport import SSHTransport
+
+
+class ResticImageService:
+    """Background pre-pull of the restic image per host; digests are recorded in the host inventory"""
+
+    pull_timeout_seconds = 900
+
+    _pulling: set = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def apply_settings(cls, backup_config):
+        """Re-read restic_image from global settings; pre-pull on all hosts when it changed"""
+        if ContainerCommandBuilder.configure(backup_config.config.get('global_settings', {})):
+            print(f"INFO: Restic image changed to {ContainerCommandBuilder.default_image} - pre-pulling on source hosts")
+            cls.prepull_for_jobs(backup_config)
+
+    @classmethod
+    def prepull_for_jobs(cls, backup_config):
+        """Pre-pull on every host that runs restic jobs in a container"""
+        for username, hostname, runtime in cls.container_hosts(backup_config):
+            cls.prepull_async(username, hostname, runtime)
+
+    @staticmethod
+    def container_hosts(backup_config) -> List[Tuple[str, str, Optional[str]]]:
+        """(username, hostname, runtime) for restic jobs with SSH sources, one entry per host"""
+        hosts = {}
+        for job_config in backup_config.config.get('backup_jobs', {}).values():
+            host = ResticImageService._job_host(job_config)
+            if host and (host[0], host[1]) not in hosts:
+                hosts[(host[0], host[1])] = host
+        return list(hosts.values())
+
+    @classmethod
+    def prepull_for_job(cls, job_config: Dict[str, Any]) -> bool:
+        """Pre-pull for one job's source host (no-op for non-container jobs)"""
+        host = cls._job_host(job_config)
+        if not host:
+            return False
+        return cls.prepull_async(*host)
+
+    @classmethod
+    def is_present(cls, username: str, hostname: str, image: Optional[str] = None) -> bool:
+        """Whether the host inventory has a digest for this image on the host"""
+        image = image or ContainerCommandBuilder.default_image
+        entry = HostInventory.peek(f"{username}@{hostname}")
+        return bool(entry and entry.restic_image == image and entry.restic_image_digest)
+
+    @classmethod
+    def prepull_async(cls, username: str, hostname: str, runtime: Optional[str] = None,
+                      image: Optional[str] = None) -> bool:
+        """Start a background pull unless the image is already known present or being pulled"""
+        image = image or ContainerCommandBuilder.default_image
+        if cls.is_present(username, hostname, image):
+            return False
+
+        key = (f"{username}@{hostname}", image)
+        with cls._lock:
+            if key in cls._pulling:
+                return False
+            cls._pulling.add(key)
+
+        threading.Thread(
+            target=cls._pull_in_background, args=(username, hostname, runtime, image), daemon=True,
+            name=f"image-pull-{hostname}"
+        ).start()
+        return True
+
+    @classmethod
+    def pull(cls, username: str, hostname: str, runtime: Optional[str], image: str) -> Dict[str, Any]:
+        """Pull the image if missing (one SSH round trip); returns success, digest and message"""
+        target = f"{username}@{hostname}"
+        if not runtime:
+            entry = HostInventory.peek(target)
+            runtime = (entry.container_runtime if entry else None) or 'docker'
+
+        rt, img = shlex.quote(runtime), shlex.quote(image)
+        inspect = f"{rt} image inspect --format '{{{{index .RepoDigests 0}}}}' {img}"
+        remote_command = f"{inspect} 2>/dev/null || {{ {rt} pull -q {img} >/dev/null && {inspect}; }}"
+        cmd = SSHTransport.build_command(target, remote_command, connect_timeout=30, log_level='ERROR')
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=cls.pull_timeout_seconds)
+        except subprocess.TimeoutExpired:
+            return {'success': False, 'message': f'Pulling {image} on {hostname} timed out'}
+        except Exception as e:
+            return {'success': False, 'message': f'Pulling {image} on {hostname} failed: {str(e)}'}
+
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() or 'pull failed'
+            return {'success': False, 'message': f'Pulling {image} on {hostname} failed: {error_msg}'}
+
+        digest = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+        HostInventory.record_image(target, image, digest)
+        return {'success': True, 'digest': digest, 'message': f'{image} present on {hostname}'}
+
+    @classmethod
+    def _pull_in_background(cls, username: str, hostname: str, runtime: Optional[str], image: str):
+        """Thread body for prepull_async"""
+        try:
+            result = cls.pull(username, hostname, runtime, image)
+            level = "INFO" if result['success'] else "WARNING"
+            print(f"{level}: {result['message']}")
+        finally:
+            with cls._lock:
+                cls._pulling.discard((f"{username}@{hostname}", image))
+
+    @staticmethod
+    def _job_host(job_config: Dict[str, Any]) -> Optional[Tuple[str, str, Optional[str]]]:
+        """(username, hostname, runtime) when a job runs restic in a container over SSH"""
+        if job_config.get('dest_type') != 'restic' or job_config.get('source_type') != 'ssh':
+            return None
+        source_config = job_config.get('source_config', {}) or {}
+        if not (source_config.get('hostname') and source_config.get('username')):
+            return None
+        runtime = source_config.get('container_runtime') or job_config.get('container_runtime')
+        return source_config['username'], source_config['hostname'], runtime
@@ -8,6 +8,7 @@ from services.maintenance_config_manager import MaintenanceConfigManager
 from services.maintenance_scheduler import MaintenanceScheduler
 from services.maintenance_executor import MaintenanceExecutor
 from services.job_conflict_manager import RuntimeConflictManager
+from services.snapshot_cache import SnapshotListCache
 
 
 class ResticMaintenanceService:
@@ -38,22 +39,29 @@ class ResticMaintenanceService:
         """Reschedule maintenance operations for a job"""
         self.scheduler.reschedule_job_maintenance(job_name)
     
+    def sync_maintenance_schedules(self) -> int:
+        """Schedule maintenance per repository for all eligible jobs"""
+        return self.scheduler.sync_repository_schedules()
+    
     def execute_maintenance_operation(self, operation: MaintenanceOperation) -> MaintenanceResult:
         """Execute a maintenance operation with conflict avoidance"""
-        print(f"INFO: Starting {operation.operation_type} maintenance for job '{operation.job_name}'")
+        print(f"INFO: Starting {operation.operation_type} maintenance for job(s) {', '.join(operation.target_job_names)}")
         
         # Check for conflicts before starting
-        if self._should_wait_for_conflicts(operation.job_name):
+        if self._should_wait_for_conflicts(operation):
             print(f"INFO: Waiting for conflicting jobs before running {operation.operation_type} for '{operation.job_name}'")
-            # Reschedule for later (5 minutes)
-            self._reschedule_maintenance(operation, delay_minutes=5)
+            # Defer via one-shot scheduler job with exponential backoff
+            rescheduled = self._reschedule_maintenance(operation)
             return MaintenanceResult(
                 operation_type=operation.operation_type,
                 job_name=operation.job_name,
                 success=False,
-                error_message="Rescheduled due to conflicts"
+                error_message="Rescheduled due to conflicts" if rescheduled else "Skipped due to persistent conflicts"
             )
         
+        # A run that gets through supersedes any pending deferred retry
+        self._clear_pending_retry(operation)
+        
         # Execute the operation
         try:
             if operation.operation_type == 'discard':
@@ -65,15 +73,11 @@ class ResticMaintenanceService:
             
             # Handle result
             if result.success:
-                print(f"INFO: Completed {operation.operation_type} maintenance for job '{operation.job_name}'")
+                print(f"INFO: Completed {operation.operation_type} maintenance for job(s) {', '.join(operation.target_job_names)}")
+                self._refresh_snapshot_cache(operation)
             else:
-                print(f"ERROR: Failed {operation.operation_type} maintenance for job '{operation.job_name}': {result.error_message}")
-                
-                # Send notification if configured
-                if self.notification_service:
-                    self.notification_service.send_maintenance_failure_notification(
-                        operation.job_name, operation.operation_type, result.error_message
-                    )
+                print(f"ERROR: Failed {operation.operation_type} maintenance for job(s) {', '.join(operation.target_job_names)}: {result.error_message}")
+                self._notify_failure(operation, result.error_message)
             
             return result
             
@@ -81,11 +85,7 @@ class ResticMaintenanceService:
             error_msg = f"Maintenance {operation.operation_type} failed for job '{operation.job_name}': {str(e)}"
             print(f"ERROR: {error_msg}")
             
-            # Send notification if configured
-            if self.notification_service:
-                self.notification_service.send_maintenance_failure_notification(
-                    operation.job_name, operation.operation_type, str(e)
-                )
+            self._notify_failure(operation, str(e))
             
             return MaintenanceResult(
                 operation_type=operation.operation_type,
@@ -94,6 +94,12 @@ class ResticMaintenanceService:
                 error_message=str(e)
             )
     
+    def _refresh_snapshot_cache(self, operation: MaintenanceOperation):
+        """Re-list the repository after maintenance (forget removes snapshots)"""
+        job_config = self.backup_config.get_backup_job(operation.job_name)
+        if job_config:
+            SnapshotListCache.refresh_async(job_config)
+    
     def get_maintenance_summary(self, job_name: str) -> dict:
         """Get maintenance status summary for a job"""
         return self.config_manager.get_maintenance_summary(job_name)
@@ -102,18 +108,71 @@ class ResticMaintenanceService:
         """Check if auto maintenance is enabled for job"""
         return self.config_manager.is_maintenance_enabled(job_name)
     
-    def _should_wait_for_conflicts(self, job_name: str) -> bool:
-        """Check if maintenance should wait for conflicting jobs"""
-        return self.conflict_manager.check_for_conflicts(job_name)
+    def _should_wait_for_conflicts(self, operation: MaintenanceOperation) -> bool:
+        """Check if maintenance should wait for jobs using the repository or its hosts"""
+        running_jobs = set(self.conflict_manager.get_running_jobs())
+        if running_jobs & set(operation.target_job_names):
+            return True
+        
+        job_config = self.backup_config.get_backup_job(operation.job_name) or {}
+        return self.conflict_manager.has_conflicting_jobs_running(operation.job_name, job_config)
+    
+    def _notify_failure(self, operation: MaintenanceOperation, error_message: str):
+        """Send failure notification to every job sharing the repository"""
+        if not self.notification_service:
+            return
+        for job_name in operation.target_job_names:
+            self.notification_service.send_maintenance_failure_notification(
+                job_name, operation.operation_type, error_message
+            )
+    
+    @staticmethod
+    def _get_retry_job_id(operation: MaintenanceOperation) -> str:
+        """Scheduler id for a repository's deferred retry (one per repository/operation)"""
+        repository_key = operation.repository_key or operation.repository_url
+        repo_job_id = MaintenanceScheduler.get_repository_job_id(repository_key, operation.operation_type)
+        return repo_job_id.replace('maintenance_', 'maintenance_retry_', 1)
+    
+    def _clear_pending_retry(self, operation: MaintenanceOperation):
+        """Drop a pending deferred retry for this repository/operation"""
+        if self.scheduler_service:
+            self.scheduler_service.remove_job(self._get_retry_job_id(operation))
     
-    def _reschedule_maintenance(self, operation: MaintenanceOperation, delay_minutes: int = 5):
-        """Reschedule maintenance operation for later"""
-        import threading
-        import time
+    def _reschedule_maintenance(self, operation: MaintenanceOperation) -> bool:
+        """Defer maintenance as a one-shot scheduler job; returns False once retries are exhausted"""
+        from datetime import datetime, timedelta
+        from services.scheduled_tasks import run_scheduled_maintenance, get_context
+        
+        policy = self.config_manager.get_retry_policy()
+        next_attempt = operation.attempt + 1
+        if next_attempt > policy['max_attempts']:
+            message = (f"{operation.operation_type} deferred {operation.attempt} times due to conflicts - "
+                       f"skipping until next scheduled run")
+            print(f"WARNING: Maintenance {message} for job(s) {', '.join(operation.target_job_names)}")
+            self._notify_failure(operation, message)
+            return False
+        
+        scheduler_service = self.scheduler_service or get_context()[1]
+        if scheduler_service is None:
+            print(f"ERROR: No scheduler available to defer {operation.operation_type} for '{operation.job_name}'")
+            return False
         
-        def delayed_execution():
-            time.sleep(delay_minutes * 60)
-            self.execute_maintenance_operation(operation)
+        delay_minutes = min(
+            policy['base_delay_minutes'] * (2 ** operation.attempt),
+            policy['max_delay_minutes']
+        )
+        run_date = datetime.now().astimezone() + timedelta(minutes=delay_minutes)
         
-        thread = threading.Thread(target=delayed_execution, daemon=True)
-        thread.start()
\ No newline at end of file
+        # Same id per repository/operation so repeated deferrals replace rather than pile up
+        scheduler_service.add_date_job(
+            func=run_scheduled_maintenance,
+            job_id=self._get_retry_job_id(operation),
+            run_date=run_date,
+            args=[MaintenanceScheduler.repository_id(operation.repository_key or operation.repository_url),
+                  operation.operation_type, next_attempt],
+            name=(f"Retry {operation.operation_type} for {', '.join(operation.target_job_names)} "
+                  f"(attempt {next_attempt}/{policy['max_attempts']})")
+        )
+        print(f"INFO: Deferred {operation.operation_type} for '{operation.job_name}' by {delay_minutes} minutes "
+              f"(attempt {next_attempt}/{policy['max_attempts']})")
+        return True
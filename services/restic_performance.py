@@ -0,0 +1,252 @@
+"""
+Restic performance options
+Resolves read concurrency, pack size, backend connections and compression per repository and per job,
+and optionally hill-climbs the numeric knobs between runs from recorded scan throughput
+"""
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from services.job_logger import LogPaths, YAMLFileManager
+
+
+# restic backends accepting -o <backend>.connections (repository URL scheme prefix)
+CONNECTION_BACKENDS = ('s3', 'sftp', 'rest', 'rclone', 'b2', 'azure', 'gs', 'swift')
+
+PERFORMANCE_KEYS = ('read_concurrency', 'pack_size', 'connections', 'compression')
+COMPRESSION_MODES = ('auto', 'off', 'max')
+
+# restic's own defaults, used as the tuner's starting point for unset knobs
+RESTIC_DEFAULTS = {'read_concurrency': 2, 'pack_size': 16, 'connections': 5}
+
+# Default auto-tune bounds (operators narrow or widen these per job under restic_autotune)
+DEFAULT_BOUNDS = {'read_concurrency': [1, 8], 'connections': [2, 16], 'pack_size': [16, 64]}
+
+
+class ResticPerformance:
+    """Merges repository, job and tuned performance settings into restic backup arguments"""
+
+    @staticmethod
+    def repository_url(job_config: Dict[str, Any]) -> str:
+        """Repository URL of a restic job"""
+        dest_config = job_config.get('dest_config', {}) or {}
+        return dest_config.get('repo_uri', dest_config.get('dest_string', ''))
+
+    @staticmethod
+    def backend(repository_url: str) -> str:
+        """restic backend name for a repository URL ('local' for plain paths)"""
+        scheme = repository_url.split(':', 1)[0] if ':' in repository_url else ''
+        return scheme if scheme in CONNECTION_BACKENDS else 'local'
+
+    @classmethod
+    def configured(cls, job_config: Dict[str, Any], global_settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Operator settings: restic_repository_performance for the repo_uri, overridden by the job's restic_performance"""
+        repository_settings = global_settings.get('restic_repository_performance') or {}
+        settings = {}
+        for source in (repository_settings.get(cls.repository_url(job_config)),
+                       job_config.get('restic_performance')):
+            settings.update({key: value for key, value in (source or {}).items()
+                             if key in PERFORMANCE_KEYS and value not in (None, '')})
+        return settings
+
+    @classmethod
+    def resolve(cls, job_name: str, job_config: Dict[str, Any], global_settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Effective settings: configured values with auto-tuned knobs on top"""
+        settings = cls.configured(job_config, global_settings)
+        if ResticAutoTuner.enabled_for(job_config):
+            settings.update(ResticAutoTuner().tuned_settings(job_name, job_config, settings))
+        return settings
+
+    @classmethod
+    def build_args(cls, settings: Dict[str, Any], repository_url: str) -> List[str]:
+        """restic backup arguments for resolved settings (invalid values are skipped with a warning)"""
+        args = []
+        for key, flag in (('read_concurrency', '--read-concurrency'), ('pack_size', '--pack-size')):
+            value = cls._positive_int(settings.get(key), key)
+            if value:
+                args.extend([flag, str(value)])
+
+        connections = cls._positive_int(settings.get('connections'), 'connections')
+        if connections:
+            args.extend(['-o', f'{cls.backend(repository_url)}.connections={connections}'])
+
+        compression = settings.get('compression')
+        if compression:
+            if str(compression) in COMPRESSION_MODES:
+                args.extend(['--compression', str(compression)])
+            else:
+                print(f"WARNING: Ignoring restic compression '{compression}' (expected one of {', '.join(COMPRESSION_MODES)})")
+        return args
+
+    @staticmethod
+    def _positive_int(value, key: str) -> Optional[int]:
+        """Positive integer setting or None"""
+        if value in (None, ''):
+            return None
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            print(f"WARNING: Ignoring restic {key} '{value}' (expected a positive integer)")
+            return None
+        return value if value > 0 else None
+
+
+class ResticAutoTuner:
+    """
+    Per-job coordinate hill climb over read_concurrency, connections and pack_size.
+    Each run tries one step on one knob; the step is kept when scan throughput improves by
+    min_gain, otherwise reverted and the knob's direction flipped before moving to the next knob.
+    """
+
+    KNOBS = ('read_concurrency', 'connections', 'pack_size')
+    min_gain = 0.05   # relative throughput improvement required to keep a step
+
+    _lock = threading.Lock()
+
+    def __init__(self, base_dir: Optional[Path] = None):
+        self.paths = LogPaths(base_dir) if base_dir else LogPaths()
+        self.yaml_manager = YAMLFileManager()
+
+    @staticmethod
+    def enabled_for(job_config: Dict[str, Any]) -> bool:
+        """Whether a job opted into auto-tuning (restic_autotune: true or a bounds mapping)"""
+        autotune = job_config.get('restic_autotune')
+        if isinstance(autotune, dict):
+            return bool(autotune.get('enabled', True))
+        return bool(autotune)
+
+    def tuned_settings(self, job_name: str, job_config: Dict[str, Any],
+                       configured: Dict[str, Any]) -> Dict[str, int]:
+        """Current tuned values for the job's knobs, clamped to today's bounds"""
+        state = self._load_tuning_file().get(job_name, {})
+        bounds = self._bounds(job_config)
+        tuned = {}
+        for knob in self._knobs(job_config):
+            value = state.get('settings', {}).get(knob, configured.get(knob, RESTIC_DEFAULTS[knob]))
+            tuned[knob] = self._clamp(value, bounds[knob])
+        return tuned
+
+    def record_run(self, job_name: str, job_config: Dict[str, Any], global_settings: Dict[str, Any],
+                   metrics: Optional[Dict[str, Any]]):
+        """Score the run that just finished and choose the settings for the next one"""
+        throughput = self._scan_throughput(metrics)
+        if throughput is None:
+            return
+
+        with self._lock:
+            tuning_data = self._load_tuning_file()
+            state = tuning_data.get(job_name, {})
+            bounds = self._bounds(job_config)
+            knobs = self._knobs(job_config)
+            settings = self.tuned_settings(job_name, job_config, ResticPerformance.configured(job_config, global_settings))
+            directions = state.get('directions', {})
+            knob_index = state.get('knob_index', 0)
+            baseline = state.get('baseline_bps')
+            trial = state.get('trial')
+
+            if trial and trial.get('knob') in settings and baseline:
+                knob = trial['knob']
+                if throughput >= baseline * (1 + self.min_gain):
+                    # Step helped: keep it and continue in the same direction on this knob
+                    baseline = throughput
+                    print(f"INFO: restic auto-tune kept {knob}={settings[knob]} for {job_name} "
+                          f"({throughput / 1048576:.1f} MiB/s)")
+                else:
+                    # No gain: revert, flip direction, move on to the next knob
+                    settings[knob] = self._clamp(trial['previous'], bounds[knob])
+                    directions[knob] = -directions.get(knob, 1)
+                    knob_index += 1
+            else:
+                baseline = throughput
+
+            trial = self._propose(settings, bounds, knobs, directions, knob_index)
+            if trial:
+                knob_index = knobs.index(trial['knob'])
+                settings[trial['knob']] = trial['value']
+                print(f"INFO: restic auto-tune trying {trial['knob']}={trial['value']} for {job_name}")
+
+            tuning_data[job_name] = {
+                'settings': settings,
+                'baseline_bps': round(baseline, 1),
+                'trial': {'knob': trial['knob'], 'previous': trial['previous']} if trial else None,
+                'directions': directions,
+                'knob_index': knob_index,
+                'updated_at': datetime.now().isoformat(),
+            }
+            self._save_tuning_file(tuning_data)
+
+    @staticmethod
+    def _propose(settings: Dict[str, int], bounds: Dict[str, List[int]], knobs: List[str],
+                 directions: Dict[str, int], knob_index: int) -> Optional[Dict[str, Any]]:
+        """Next single-knob step that stays inside bounds (None when every knob is pinned this round)"""
+        for offset in range(len(knobs)):
+            knob = knobs[(knob_index + offset) % len(knobs)]
+            low, high = bounds[knob]
+            current, direction = settings[knob], directions.get(knob, 1)
+            if knob == 'read_concurrency':
+                value = current + direction
+            else:
+                # Connections and pack size scale geometrically
+                value = current * 2 if direction > 0 else current // 2
+            value = max(low, min(high, value))
+            if value != current:
+                return {'knob': knob, 'previous': current, 'value': value}
+            # Pinned at a bound: explore the other way next time round
+            directions[knob] = -direction
+        return None
+
+    @staticmethod
+    def _knobs(job_config: Dict[str, Any]) -> List[str]:
+        """Tunable knobs for a job (connections only apply to remote backends)"""
+        repository_url = ResticPerformance.repository_url(job_config)
+        if ResticPerformance.backend(repository_url) == 'local':
+            return [knob for knob in ResticAutoTuner.KNOBS if knob != 'connections']
+        return list(ResticAutoTuner.KNOBS)
+
+    @staticmethod
+    def _bounds(job_config: Dict[str, Any]) -> Dict[str, List[int]]:
+        """Operator bounds per knob; read_concurrency is also capped by the source host's CPU count"""
+        from services.host_inventory import HostInventory
+
+        autotune = job_config.get('restic_autotune')
+        overrides = autotune if isinstance(autotune, dict) else {}
+        bounds = {}
+        for knob, default in DEFAULT_BOUNDS.items():
+            try:
+                low, high = (int(value) for value in overrides.get(knob, default))
+            except (TypeError, ValueError):
+                print(f"WARNING: Invalid restic_autotune bounds for {knob} - using {default}")
+                low, high = default
+            bounds[knob] = [max(1, min(low, high)), max(1, low, high)]
+
+        # Reading more files at once than the host has cores only adds contention
+        source_config = job_config.get('source_config', {}) if job_config.get('source_type') == 'ssh' else None
+        capabilities = HostInventory.peek(HostInventory.target_for(source_config))
+        if capabilities and capabilities.cpu_count:
+            low, high = bounds['read_concurrency']
+            bounds['read_concurrency'] = [min(low, capabilities.cpu_count), min(high, capabilities.cpu_count)]
+        return bounds
+
+    @staticmethod
+    def _clamp(value, bound: List[int]) -> int:
+        """Integer value inside [low, high]"""
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = bound[0]
+        return max(bound[0], min(bound[1], value))
+
+    @staticmethod
+    def _scan_throughput(metrics: Optional[Dict[str, Any]]) -> Optional[float]:
+        """Bytes processed per second (independent of how much data changed since the last run)"""
+        if not metrics or not metrics.get('bytes_scanned') or not metrics.get('duration_seconds'):
+            return None
+        return metrics['bytes_scanned'] / metrics['duration_seconds']
+
+    def _load_tuning_file(self) -> Dict[str, Any]:
+        """Load auto-tune state from YAML file"""
+        return self.yaml_manager.load_yaml_file(self.paths.tuning_file)
+
+    def _save_tuning_file(self, tuning_data: Dict[str, Any]) -> bool:
+        """Save auto-tune state to YAML file"""
+        return self.yaml_manager.save_yaml_file(self.paths.tuning_file, tuning_data)
@@ -5,9 +5,14 @@ Handles Restic repositories, snapshots, and browsing operations.
 
 import os
 import json
+import time
 from typing import Dict, List, Optional, Any
 from services.repository_service import RepositoryService
 from services.command_execution_service import CommandExecutionService
+from services.repository_identity import RepositoryIdentity
+from services.snapshot_cache import SnapshotListCache
+from services.snapshot_index import SnapshotIndex
+from services.snapshot_stats_cache import SnapshotStatsCache
 
 
 class ResticRepositoryService(RepositoryService):
@@ -35,19 +40,32 @@ class ResticRepositoryService(RepositoryService):
         except Exception as e:
             return self._format_error_response(f'Repository test failed: {str(e)}')
     
-    def list_snapshots(self, job_config: Dict[str, Any]) -> Dict[str, Any]:
-        """List all snapshots in Restic repository"""
+    def list_snapshots(self, job_config: Dict[str, Any], refresh: bool = False) -> Dict[str, Any]:
+        """List all snapshots in Restic repository (served from the per-repository cache unless refresh)"""
         try:
             dest_config = job_config.get('dest_config', {})
             source_config = job_config.get('source_config', {})
             
             repo_url = self.runner._build_repository_url(dest_config)
+            repo_key = RepositoryIdentity.key(repo_url, source_config)
+            if not refresh:
+                cached = SnapshotListCache.get(repo_key)
+                if cached is not None:
+                    return cached
+            
             env_vars = self.runner._build_environment(dest_config)
+            listed_at = time.time()
             
             if self._should_use_ssh(source_config):
-                return self._list_snapshots_via_ssh(repo_url, env_vars, source_config)
+                result = self._list_snapshots_via_ssh(repo_url, env_vars, source_config)
             else:
-                return self._list_snapshots_locally(repo_url, env_vars)
+                result = self._list_snapshots_locally(repo_url, env_vars)
+            
+            if result.get('success'):
+                SnapshotListCache.put(repo_key, result)
+                # Forgotten snapshots drop out of the listing; drop their memoized stats too
+                SnapshotStatsCache.retain(repo_key, [snap['full_id'] for snap in result['snapshots']], listed_at)
+            return result
                 
         except Exception as e:
             return self._format_error_response(f'Snapshot listing failed: {str(e)}')
@@ -59,12 +77,26 @@ class ResticRepositoryService(RepositoryService):
             source_config = job_config.get('source_config', {})
             
             repo_url = self.runner._build_repository_url(dest_config)
+            repo_key = RepositoryIdentity.key(repo_url, source_config)
+            
+            # Snapshots are immutable, so stats computed once are served from the memo
+            memoized = SnapshotStatsCache.get(repo_key, snapshot_id)
+            if memoized is not None:
+                return self._format_success_response({
+                    'stats': {**memoized, 'snapshot_id': snapshot_id[:8], 'full_snapshot_id': snapshot_id},
+                    'cached': True
+                })
+            
             env_vars = self.runner._build_environment(dest_config)
             
             if self._should_use_ssh(source_config):
-                return self._get_snapshot_stats_via_ssh(repo_url, env_vars, source_config, snapshot_id)
+                result = self._get_snapshot_stats_via_ssh(repo_url, env_vars, source_config, snapshot_id)
             else:
-                return self._get_snapshot_stats_locally(repo_url, env_vars, snapshot_id)
+                result = self._get_snapshot_stats_locally(repo_url, env_vars, snapshot_id)
+            
+            if result.get('success'):
+                SnapshotStatsCache.put(repo_key, snapshot_id, result['stats'])
+            return result
                 
         except Exception as e:
             return self._format_error_response(f'Snapshot statistics failed: {str(e)}')
@@ -75,13 +107,23 @@ class ResticRepositoryService(RepositoryService):
             dest_config = job_config.get('dest_config', {})
             source_config = job_config.get('source_config', {})
             
+            # Indexed snapshots are answered from the local tree index without touching the repository
+            indexed_items = SnapshotIndex.list_directory(job_config, snapshot_id, path)
+            if indexed_items is not None:
+                return self._format_indexed_listing(indexed_items, path)
+            
             repo_url = self.runner._build_repository_url(dest_config)
             env_vars = self.runner._build_environment(dest_config)
             
             if self._should_use_ssh(source_config):
-                return self._browse_directory_via_ssh(repo_url, env_vars, source_config, snapshot_id, path)
+                result = self._browse_directory_via_ssh(repo_url, env_vars, source_config, snapshot_id, path)
             else:
-                return self._browse_directory_locally(repo_url, env_vars, snapshot_id, path)
+                result = self._browse_directory_locally(repo_url, env_vars, snapshot_id, path)
+            
+            # First browse of a snapshot: index its whole tree in the background for the next clicks
+            if result.get('success'):
+                SnapshotIndex.build_async(job_config, snapshot_id)
+            return result
                 
         except Exception as e:
             return self._format_error_response(f'Directory browsing failed: {str(e)}')
@@ -108,7 +150,7 @@ class ResticRepositoryService(RepositoryService):
         hostname = source_config.get('hostname')
         username = source_config.get('username')
         
-        command = f"restic -r '{repo_url}' snapshots --json"
+        command = f"restic -r '{repo_url}' snapshots --no-lock --json"
         executor = CommandExecutionService()
         result = executor.execute_via_ssh(hostname, username, command, env_vars)
         
@@ -152,7 +194,7 @@ class ResticRepositoryService(RepositoryService):
     
     def _test_repository_locally(self, repo_url: str, env_vars: Dict[str, str]) -> Dict[str, Any]:
         """Test repository access locally"""
-        command = ['restic', '-r', repo_url, 'snapshots', '--json']
+        command = ['restic', '-r', repo_url, 'snapshots', '--no-lock', '--json']
         executor = CommandExecutionService()
         result = executor.execute_locally(command, env_vars)
         
@@ -199,7 +241,7 @@ class ResticRepositoryService(RepositoryService):
         hostname = source_config.get('hostname')
         username = source_config.get('username')
         
-        command = f"restic -r '{repo_url}' snapshots --json"
+        command = f"restic -r '{repo_url}' snapshots --no-lock --json"
         executor = CommandExecutionService()
         result = executor.execute_via_ssh(hostname, username, command, env_vars)
         
@@ -220,7 +262,7 @@ class ResticRepositoryService(RepositoryService):
     
     def _list_snapshots_locally(self, repo_url: str, env_vars: Dict[str, str]) -> Dict[str, Any]:
         """List snapshots locally"""
-        command = ['restic', '-r', repo_url, 'snapshots', '--json']
+        command = ['restic', '-r', repo_url, 'snapshots', '--no-lock', '--json']
         executor = CommandExecutionService()
         result = executor.execute_locally(command, env_vars)
         
@@ -259,7 +301,7 @@ class ResticRepositoryService(RepositoryService):
         hostname = source_config.get('hostname')
         username = source_config.get('username')
         
-        command = f"restic -r '{repo_url}' stats {snapshot_id} --mode restore-size --json"
+        command = f"restic -r '{repo_url}' stats {snapshot_id} --no-lock --mode restore-size --json"
         executor = CommandExecutionService()
         result = executor.execute_via_ssh(hostname, username, command, env_vars)
         
@@ -282,7 +324,7 @@ class ResticRepositoryService(RepositoryService):
     
     def _get_snapshot_stats_locally(self, repo_url: str, env_vars: Dict[str, str], snapshot_id: str) -> Dict[str, Any]:
         """Get snapshot statistics locally"""
-        command = ['restic', '-r', repo_url, 'stats', snapshot_id, '--mode', 'restore-size', '--json']
+        command = ['restic', '-r', repo_url, 'stats', snapshot_id, '--no-lock', '--mode', 'restore-size', '--json']
         executor = CommandExecutionService()
         result = executor.execute_locally(command, env_vars)
         
@@ -308,7 +350,7 @@ class ResticRepositoryService(RepositoryService):
         hostname = source_config.get('hostname')
         username = source_config.get('username')
         
-        command = f"restic -r '{repo_url}' ls {snapshot_id} --json '{path}'"
+        command = f"restic -r '{repo_url}' ls {snapshot_id} --no-lock --json '{path}'"
         executor = CommandExecutionService()
         result = executor.execute_via_ssh(hostname, username, command, env_vars)
         
@@ -319,7 +361,7 @@ class ResticRepositoryService(RepositoryService):
     
     def _browse_directory_locally(self, repo_url: str, env_vars: Dict[str, str], snapshot_id: str, path: str) -> Dict[str, Any]:
         """Browse directory locally"""
-        command = ['restic', '-r', repo_url, 'ls', snapshot_id, '--json', path]
+        command = ['restic', '-r', repo_url, 'ls', snapshot_id, '--no-lock', '--json', path]
         executor = CommandExecutionService()
         result = executor.execute_locally(command, env_vars)
         
@@ -382,6 +424,17 @@ class ResticRepositoryService(RepositoryService):
         except Exception as e:
             return self._format_error_response(f'Failed to parse directory listing: {str(e)}')
     
+    def _format_indexed_listing(self, items: List[Dict[str, Any]], current_path: str) -> Dict[str, Any]:
+        """Directory listing response from snapshot index entries (same shape as _parse_directory_listing)"""
+        if current_path and current_path != '/':
+            items = [{'name': '..', 'type': 'parent', 'path': os.path.dirname(current_path.rstrip('/')) or '/', 'size': None}] + items
+        return self._format_success_response({
+            'contents': items,
+            'current_path': current_path,
+            'total_items': len(items),
+            'indexed': True
+        })
+    
     def _init_repository_via_ssh(self, repo_url: str, env_vars: Dict[str, str], source_config: Dict[str, Any]) -> Dict[str, Any]:
         """Initialize repository via SSH"""
         hostname = source_config.get('hostname')
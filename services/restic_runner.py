@@ -5,10 +5,12 @@ Handles Restic backup operations via SSH execution, similar to rsync pattern
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 from enum import Enum
+import math
 import shlex
 from services.container_command_builder import ContainerCommandBuilder, MountStrategy
 from services.snapshot_introspection_service import SnapshotIntrospectionService
 from services.restic_argument_builder import ResticArgumentBuilder
+from services.restic_cache import ResticCache
 
 
 class TransportType(Enum):
@@ -150,6 +152,7 @@ class ResticCommand:
         env = {}
         if 'password' in dest_config:
             env['RESTIC_PASSWORD'] = dest_config['password']
+        env.update(ResticCache.local_environment(self._build_repository_url(dest_config)))
         return env
     
 
@@ -276,7 +279,7 @@ class ResticRunner:
         return ResticPlan(
             job_name=job_name,
             commands=commands,
-            estimated_duration_minutes=self._estimate_duration(job_config),
+            estimated_duration_minutes=self._estimate_duration(job_name, job_config),
             requires_binary_check=transport == TransportType.SSH,
             requires_init=job_config.get('dest_config', {}).get('auto_init', False),
             retention_policy=retention
@@ -356,14 +359,15 @@ class ResticRunner:
         if 'aws_secret_key' in dest_config:
             env['AWS_SECRET_ACCESS_KEY'] = dest_config['aws_secret_key']
         
+        # Throttle --json status messages (restic defaults to 60 per second) - overridable below
+        env['RESTIC_PROGRESS_FPS'] = '1'
+        
         # Additional environment variables
         env.update(dest_config.get('environment_vars', {}))
         
-        # Add cache environment variables to prevent permission issues
-        env.update({
-            'HOME': '/tmp',
-            'XDG_CACHE_HOME': '/tmp/.cache'
-        })
+        # HOME avoids permission issues; the cache persists per repository (container runs mount their own)
+        env['HOME'] = '/tmp'
+        env.update(ResticCache.local_environment(self._build_repository_url(dest_config)))
         
         return env
     
@@ -391,8 +395,14 @@ class ResticRunner:
     
     
     
-    def _estimate_duration(self, job_config: Dict) -> int:
+    def _estimate_duration(self, job_name: str, job_config: Dict) -> int:
         """Estimate backup duration in minutes"""
+        # Prefer history of successful real runs
+        from services.duration_estimator import DurationEstimator
+        estimate = DurationEstimator().estimate(job_name, dry_run=False)
+        if estimate:
+            return max(1, int(math.ceil(estimate.conservative_seconds / 60)))
+        
         # Simple heuristic based on data size or default
         size_hint = job_config.get('estimated_size_gb', 1)
         return max(10, min(180, size_hint * 3))  # 3 minutes per GB, 10-180 min range
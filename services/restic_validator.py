@@ -81,10 +81,10 @@ class ResticValidator:
         return repo_service.test_repository_access(job_config)
     
     @staticmethod
-    def list_repository_snapshots(job_config: Dict[str, Any]) -> Dict[str, Any]:
-        """List all snapshots in a Restic repository"""
+    def list_repository_snapshots(job_config: Dict[str, Any], refresh: bool = False) -> Dict[str, Any]:
+        """List all snapshots in a Restic repository (cached per repository unless refresh)"""
         repo_service = ResticRepositoryService()
-        return repo_service.list_snapshots(job_config)
+        return repo_service.list_snapshots(job_config, refresh=refresh)
     
     @staticmethod
     def initialize_restic_repository(job_config: Dict[str, Any]) -> Dict[str, Any]:
@@ -4,7 +4,6 @@ Handles both dry run and background restore execution with proper command select
 """
 import subprocess
 import threading
-import time
 import select
 import sys
 from typing import Dict, Any, Optional
@@ -12,6 +11,7 @@ from services.job_logger import JobLogger
 from services.restic_runner import ResticRunner
 from services.command_execution_service import CommandExecutionService, ExecutionConfig
 from services.command_obfuscation import obfuscate_password_in_command
+from services.stall_watchdog import StallWatchdog
 
 
 class RestoreExecutionService:
@@ -119,7 +119,7 @@ class RestoreExecutionService:
         
         try:
             # Build restic restore command using ResticRunner
-            plan = self.restic_runner.plan_restore_job(job_config, restore_config)
+            plan = self.restic_runner.plan_restore_job({**job_config, 'name': job_name}, restore_config)
             if not plan.commands:
                 self._finish_restore_with_error(job_name, 'No restore commands generated')
                 return
@@ -130,11 +130,8 @@ class RestoreExecutionService:
             # Get environment variables from restore command
             env_vars = restore_command.environment_vars or {}
             
-            # Add cache environment variables to prevent warnings
-            env_vars.update({
-                'HOME': '/tmp',
-                'XDG_CACHE_HOME': '/tmp/.cache'
-            })
+            # HOME prevents permission warnings (the persistent cache dir comes from the runner environment)
+            env_vars['HOME'] = '/tmp'
             
             # Build execution command based on transport type
             if restore_command.transport.value == 'ssh':
@@ -142,10 +139,15 @@ class RestoreExecutionService:
                 container_cmd = restore_command._build_container_command(restore_command.job_config)
                 exec_command = restore_command.to_ssh_command()
                 exec_cmd_for_logging = container_cmd
+                cleanup = StallWatchdog.remote_container_cleanup(
+                    restore_command.ssh_config['username'], restore_command.ssh_config['hostname'], job_name,
+                    restore_command.job_config.get('container_runtime', 'docker')
+                )
             else:
                 # For local (Restore to Highball), use direct restic binary
                 exec_command = restore_command.to_local_command()
                 exec_cmd_for_logging = exec_command
+                cleanup = None
             
             # Log restore start
             job_password = job_config.get('dest_config', {}).get('password', '')
@@ -161,8 +163,16 @@ class RestoreExecutionService:
                 env=env_vars
             )
             
-            # Track progress with health monitoring
-            self._monitor_restore_progress(job_name, process)
+            # Track progress; the watchdog stops the restore if it stalls
+            watchdog = StallWatchdog('restore', f"restore:{job_name}", cleanup=cleanup)
+            watchdog.attach(process)
+            try:
+                self._monitor_restore_progress(job_name, process, watchdog)
+            finally:
+                watchdog.stop()
+            if watchdog.tripped:
+                self.job_logger.log_job_execution(job_name, f"Restore appears stuck - {watchdog.tripped}", "WARNING")
+                raise Exception(f"Restore stopped responding - {watchdog.tripped}")
             
             # Wait for completion
             return_code = process.wait()
@@ -181,17 +191,12 @@ class RestoreExecutionService:
         except Exception as e:
             self._finish_restore_with_error(job_name, f"Restore execution error: {str(e)}")
     
-    def _monitor_restore_progress(self, job_name: str, process: subprocess.Popen):
-        """Monitor restore progress with health monitoring and JSON parsing"""
+    def _monitor_restore_progress(self, job_name: str, process: subprocess.Popen, watchdog: StallWatchdog):
+        """Stream restore output into the log and progress state until the process exits"""
         import json
         
-        last_output_time = time.time()
-        initial_response_timeout = 30  # 30 seconds to start producing output
-        ongoing_timeout = 60  # 60 seconds between outputs once started
-        has_started = False
-        
         while True:
-            # Check if process has finished
+            # Check if process has finished (or was stopped by the watchdog)
             if process.poll() is not None:
                 break
             
@@ -206,12 +211,8 @@ class RestoreExecutionService:
                 # Windows fallback - blocking read with shorter readline
                 output = process.stdout.readline()
             
-            current_time = time.time()
-            
             if output:
-                # Got output - update timing and mark as started
-                last_output_time = current_time
-                has_started = True
+                watchdog.touch()
                 
                 # Log output
                 self.job_logger.log_job_execution(job_name, f"Restore output: {output.strip()}")
@@ -223,31 +224,6 @@ class RestoreExecutionService:
                         self._update_restore_progress(job_name, progress_data)
                     except json.JSONDecodeError:
                         pass  # Not JSON, continue
-            else:
-                # No output - check if we've exceeded timeout
-                time_since_last_output = current_time - last_output_time
-                
-                if not has_started and time_since_last_output > initial_response_timeout:
-                    # Process hasn't started producing output within initial timeout
-                    self.job_logger.log_job_execution(job_name, 
-                        f"Process appears stuck - no initial output after {initial_response_timeout} seconds", "WARNING")
-                    process.terminate()
-                    try:
-                        process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                    raise Exception(f"Process failed to start - no output after {initial_response_timeout} seconds")
-                
-                elif has_started and time_since_last_output > ongoing_timeout:
-                    # Process was working but stopped producing output
-                    self.job_logger.log_job_execution(job_name, 
-                        f"Process appears stuck - no output for {ongoing_timeout} seconds", "WARNING")
-                    process.terminate()
-                    try:
-                        process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                    raise Exception(f"Process stopped responding - no output for {ongoing_timeout} seconds")
     
     def _update_restore_progress(self, job_name: str, progress_data: Dict[str, Any]):
         """Update restore progress from JSON output"""
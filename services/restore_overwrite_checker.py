@@ -6,6 +6,8 @@ import os
 import subprocess
 from typing import Dict, Any, List
 from services.job_logger import JobLogger
+from services.ssh_transport import SSHTransport
+from services.remote_agent import RemoteAgentPool, RemoteAgentError
 
 
 class RestoreOverwriteChecker:
@@ -124,20 +126,20 @@ class RestoreOverwriteChecker:
         # Use SSH to check if files exist
         for path in paths_to_check:
             if path:
-                # Build SSH command to check if path exists and has contents
-                ssh_cmd = [
-                    'ssh', '-o', 'ConnectTimeout=10', '-o', 'BatchMode=yes', 
-                    '-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null'
-                ]
-                
-                if username:
-                    ssh_cmd.append(f'{username}@{hostname}')
-                else:
-                    ssh_cmd.append(hostname)
+                # Persistent agent (when enabled) answers without a new SSH session per path
+                try:
+                    has_contents = RemoteAgentPool.call(username, hostname, 'has_contents', path=path)
+                except RemoteAgentError:
+                    continue
+                if has_contents is not None:
+                    if has_contents:
+                        return True
+                    continue
                 
                 # Check if path exists and is non-empty
                 check_cmd = f'[ -e "{path}" ] && ([ -f "{path}" ] || [ "$(ls -A "{path}" 2>/dev/null)" ])'
-                ssh_cmd.append(check_cmd)
+                target = f'{username}@{hostname}' if username else hostname
+                ssh_cmd = SSHTransport.build_command(target, check_cmd)
                 
                 try:
                     result = subprocess.run(ssh_cmd, capture_output=True, timeout=10)
@@ -0,0 +1,138 @@
+"""
+Structured run metrics
+Collects rsync --info=stats output and the restic backup --json summary into per-run numbers
+"""
+import json
+import re
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+
+# rsync stats lines -> metric field (values may carry thousands separators)
+RSYNC_STATS_PATTERNS = {
+    'files_scanned': re.compile(r'^Number of files:\s+([\d,]+)'),
+    'files_new': re.compile(r'^Number of created files:\s+([\d,]+)'),
+    'files_deleted': re.compile(r'^Number of deleted files:\s+([\d,]+)'),
+    'files_changed': re.compile(r'^Number of regular files transferred:\s+([\d,]+)'),
+    'bytes_scanned': re.compile(r'^Total file size:\s+([\d,]+)'),
+    'bytes_added': re.compile(r'^Literal data:\s+([\d,]+)'),
+}
+RSYNC_SENT_PATTERN = re.compile(r'^sent\s+([\d,]+)\s+bytes\s+received\s+([\d,]+)\s+bytes')
+RSYNC_TOTAL_SIZE_PATTERN = re.compile(r'^total size is\s+([\d,]+)')
+
+
+@dataclass
+class RunMetrics:
+    """Per-run transfer metrics (None where the tool did not report a value)"""
+    tool: str
+    files_scanned: Optional[int] = None
+    files_new: Optional[int] = None
+    files_changed: Optional[int] = None
+    files_deleted: Optional[int] = None
+    bytes_scanned: Optional[int] = None
+    bytes_transferred: Optional[int] = None
+    bytes_added: Optional[int] = None
+    duration_seconds: Optional[float] = None
+    throughput_bps: Optional[float] = None
+    snapshot_id: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Reported fields only, for compact run history storage"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+class RunMetricsCollector:
+    """Watches a run's output lines and accumulates RunMetrics"""
+
+    def __init__(self, tool: str):
+        self.metrics = RunMetrics(tool=tool)
+        self._seen = False
+
+    def observe(self, line: str) -> bool:
+        """Feed one output line; returns True if it carried metrics"""
+        if self.metrics.tool == 'restic':
+            found = self._observe_restic(line)
+        else:
+            found = self._observe_rsync(line.strip())
+        self._seen = self._seen or found
+        return found
+
+    def finalize(self, duration: float) -> Optional[Dict[str, Any]]:
+        """Fill duration/throughput from wall time if the tool didn't; None if nothing was reported"""
+        if not self._seen:
+            return None
+        metrics = self.metrics
+        if metrics.duration_seconds is None:
+            metrics.duration_seconds = round(duration, 1)
+        moved = metrics.bytes_transferred if metrics.bytes_transferred is not None else metrics.bytes_added
+        if metrics.throughput_bps is None and moved is not None and metrics.duration_seconds:
+            metrics.throughput_bps = round(moved / metrics.duration_seconds, 1)
+        return metrics.to_dict()
+
+    def _observe_restic(self, line: str) -> bool:
+        """Parse the restic backup --json summary message"""
+        if not line.startswith('{') or '"summary"' not in line:
+            return False
+        try:
+            summary = json.loads(line)
+        except json.JSONDecodeError:
+            return False
+        if summary.get('message_type') != 'summary':
+            return False
+
+        metrics = self.metrics
+        metrics.files_new = summary.get('files_new')
+        metrics.files_changed = summary.get('files_changed')
+        metrics.files_scanned = summary.get('total_files_processed')
+        metrics.bytes_scanned = summary.get('total_bytes_processed')
+        metrics.bytes_added = summary.get('data_added')
+        metrics.bytes_transferred = summary.get('data_added_packed', summary.get('data_added'))
+        metrics.snapshot_id = summary.get('snapshot_id')
+        if summary.get('total_duration'):
+            metrics.duration_seconds = round(summary['total_duration'], 1)
+        return True
+
+    def _observe_rsync(self, line: str) -> bool:
+        """Parse rsync stats1 (sent/received/total size) and stats2 (file counts) lines"""
+        for field_name, pattern in RSYNC_STATS_PATTERNS.items():
+            match = pattern.match(line)
+            if match:
+                setattr(self.metrics, field_name, self._to_int(match.group(1)))
+                return True
+
+        match = RSYNC_SENT_PATTERN.match(line)
+        if match:
+            self.metrics.bytes_transferred = self._to_int(match.group(1)) + self._to_int(match.group(2))
+            return True
+
+        match = RSYNC_TOTAL_SIZE_PATTERN.match(line)
+        if match:
+            if self.metrics.bytes_scanned is None:
+                self.metrics.bytes_scanned = self._to_int(match.group(1))
+            return True
+        return False
+
+    @staticmethod
+    def _to_int(value: str) -> int:
+        """Parse an integer with thousands separators"""
+        return int(value.replace(',', ''))
+
+
+def combine_run_metrics(tool: str, runs: List[Optional[Dict[str, Any]]], duration: float) -> Optional[Dict[str, Any]]:
+    """Sum per-path metrics into one run record; duration is the wall time of the whole run"""
+    reported = [run for run in runs if run]
+    if not reported:
+        return None
+
+    combined = RunMetrics(tool=tool)
+    for field_name in ('files_scanned', 'files_new', 'files_changed', 'files_deleted',
+                       'bytes_scanned', 'bytes_transferred', 'bytes_added'):
+        values = [run[field_name] for run in reported if run.get(field_name) is not None]
+        if values:
+            setattr(combined, field_name, sum(values))
+
+    combined.duration_seconds = round(duration, 1)
+    moved = combined.bytes_transferred if combined.bytes_transferred is not None else combined.bytes_added
+    if moved is not None and combined.duration_seconds:
+        combined.throughput_bps = round(moved / combined.duration_seconds, 1)
+    return combined.to_dict()
@@ -4,7 +4,7 @@ Reads job schedules from config/config.yaml and registers them with SchedulerSer
 Supports: manual | hourly | daily | weekly | full crontab strings ("m h dom mon dow").
 """
 
-from handlers.backup import BackupHandler
+from services.scheduled_tasks import run_scheduled_backup
 
 def _resolve_cron_string(s: str, backup_config) -> str | None:
     """Resolve schedule string to cron expression using configurable times"""
@@ -29,46 +29,66 @@ def _resolve_cron_string(s: str, backup_config) -> str | None:
         return s
     return None
 
-def bootstrap_schedules(backup_config, scheduler_service) -> int:
+def resolve_misfire_policy(job_conf: dict, backup_config) -> dict:
+    """Resolve misfire grace time and coalescing for a job (per-job keys override globals)"""
+    g = backup_config.config.get("global_settings", {}) or {}
+    grace = job_conf.get("misfire_grace_time", g.get("scheduler_misfire_grace_time", 14400))
+    coalesce = job_conf.get("coalesce", g.get("scheduler_coalesce", True))
+    return {
+        "misfire_grace_time": int(grace) if grace is not None else None,
+        "coalesce": bool(coalesce),
+    }
+
+def schedule_backup_job(name: str, conf: dict, backup_config, scheduler_service) -> bool:
     """
-    Registers all enabled jobs that have a non-manual schedule.
-    Returns the number of jobs scheduled.
+    Registers (or keeps, if unchanged) the scheduler entry for one job.
+    Returns True if the job has an active schedule.
     """
-    jobs = backup_config.config.get("backup_jobs", {}) or {}
+    job_id = f"backup:{name}"
+    if not conf.get("enabled", False):
+        scheduler_service.remove_job(job_id)
+        return False
+
+    cron_str = _resolve_cron_string(conf.get("schedule", "manual"), backup_config)
+    if not cron_str:
+        scheduler_service.remove_job(job_id)
+        return False
+
     g = backup_config.config.get("global_settings", {}) or {}
     tz = g.get("scheduler_timezone", "UTC")
     default_dry = bool(g.get("default_dry_run_on_schedule", True))
 
-    backup_handler = BackupHandler(backup_config)
-
-    scheduled = 0
-    for name, conf in jobs.items():
-        if not conf.get("enabled", False):
-            continue
+    # per-job override; default to global default
+    dry = bool(conf.get("dry_run_on_schedule", default_dry))
 
-        cron_str = _resolve_cron_string(conf.get("schedule", "manual"), backup_config)
-        if not cron_str:
-            continue
+    # Register: run via the same path as UI, but headless (no HTTP handler)
+    # Module-level callable + stable job id so the persistent job store can reload it
+    scheduler_service.add_crontab_job(
+        func=run_scheduled_backup,
+        job_id=job_id,
+        crontab=cron_str,
+        timezone=tz,
+        args=[name, dry],
+        **resolve_misfire_policy(conf, backup_config)
+    )
+    return True
 
-        # per-job override; default to global default
-        dry = bool(conf.get("dry_run_on_schedule", default_dry))
-
-        # Register: run via the same path as UI, but headless (no HTTP handler)
-        # Use a stable job id so we could update/replace later if needed
-        job_id = f"backup:{name}"
+def bootstrap_schedules(backup_config, scheduler_service) -> int:
+    """
+    Registers all enabled jobs that have a non-manual schedule.
+    Stale persisted entries for removed or unscheduled jobs are dropped.
+    Returns the number of jobs scheduled.
+    """
+    jobs = backup_config.config.get("backup_jobs", {}) or {}
 
-        def _run(job_name=name, dry_run=dry):
-            # source label tells your logs this was a scheduler trigger
-            backup_handler.run_backup_job_with_conflict_check(handler=None, job_name=job_name, dry_run=dry_run, source="schedule")
+    scheduled = 0
+    for name, conf in jobs.items():
+        if schedule_backup_job(name, conf, backup_config, scheduler_service):
+            scheduled += 1
 
-        # Use crontab string directly
-        scheduler_service.add_crontab_job(
-            func=_run,
-            job_id=job_id,
-            crontab=cron_str,
-            timezone=tz,
-        )
-        scheduled += 1
+    # Drop persisted jobs that no longer exist in config
+    for job_id in scheduler_service.get_job_ids("backup:"):
+        if job_id[len("backup:"):] not in jobs:
+            scheduler_service.remove_job(job_id)
 
     return scheduled
-
@@ -0,0 +1,108 @@
+"""
+Module-level entry points for scheduled work
+Persistent job stores reference callables by import path, so closures can't be scheduled
+"""
+import re
+
+_context = {
+    'backup_config': None,
+    'scheduler_service': None,
+}
+
+
+def bind_context(backup_config, scheduler_service):
+    """Bind shared services used by scheduled callables (call before resuming the scheduler)"""
+    _context['backup_config'] = backup_config
+    _context['scheduler_service'] = scheduler_service
+
+
+def get_context():
+    """Get bound (backup_config, scheduler_service) pair"""
+    return _context['backup_config'], _context['scheduler_service']
+
+
+def run_scheduled_backup(job_name: str, dry_run: bool = True, source: str = "schedule", chain: list | None = None):
+    """Run a backup job from the scheduler through the conflict-aware path"""
+    backup_config, scheduler_service = get_context()
+    if backup_config is None:
+        print(f"WARNING: Scheduled backup '{job_name}' fired before services were bound - skipping")
+        return
+
+    if job_name not in backup_config.get_backup_jobs():
+        print(f"WARNING: Scheduled backup '{job_name}' no longer exists - removing schedule")
+        scheduler_service.remove_job(f"backup:{job_name}")
+        return
+
+    from handlers.backup import BackupHandler
+    backup_handler = BackupHandler(backup_config, scheduler_service)
+    # source label tells your logs this was a scheduler (or chain) trigger
+    backup_handler.run_backup_job_with_conflict_check(
+        handler=None, job_name=job_name, dry_run=dry_run, source=source, chain=chain
+    )
+
+
+def run_scheduled_maintenance(repository_id: str, operation_type: str, attempt: int = 0):
+    """
+    Run one maintenance operation (discard or check) for every job sharing a repository.
+    repository_id is the hashed id from MaintenanceScheduler.repository_id; the repository is resolved from config.
+    """
+    from services.maintenance_scheduler import MaintenanceScheduler
+
+    # Jobs persisted before ids were introduced carry the raw URL - hash it before it reaches any log
+    if not re.fullmatch(r'[0-9a-f]{12}', repository_id or ''):
+        repository_id = MaintenanceScheduler.repository_id(repository_id or '')
+
+    backup_config, scheduler_service = get_context()
+    if backup_config is None:
+        print(f"WARNING: Scheduled {operation_type} for repository {repository_id} fired before services were bound - skipping")
+        return
+
+    from services.restic_maintenance_service import ResticMaintenanceService
+    from services.maintenance_config_manager import MaintenanceConfigManager
+    from services.maintenance_operation_factory import MaintenanceOperationFactory
+    from services.notification_service import NotificationService
+
+    groups = MaintenanceConfigManager(backup_config).get_repository_groups()
+    repository_key = next((key for key in groups if MaintenanceScheduler.repository_id(key) == repository_id), None)
+    if repository_key is None:
+        print(f"WARNING: No maintenance-enabled jobs use repository {repository_id} - skipping {operation_type}")
+        return
+    job_names = groups[repository_key]
+
+    try:
+        operation = MaintenanceOperationFactory(backup_config).create_repository_operation(
+            repository_key, job_names, operation_type
+        )
+    except ValueError as e:
+        print(f"ERROR: {str(e)}")
+        return
+    operation.attempt = attempt
+
+    maintenance_service = ResticMaintenanceService(
+        backup_config=backup_config,
+        scheduler_service=scheduler_service,
+        notification_service=NotificationService(backup_config)
+    )
+    maintenance_service.execute_maintenance_operation(operation)
+
+
+def run_restic_cache_cleanup():
+    """Apply the restic cache size/age policy locally and on every container host, and evict snapshot indexes"""
+    backup_config, _ = get_context()
+    if backup_config is None:
+        print("WARNING: Restic cache cleanup fired before services were bound - skipping")
+        return
+
+    from services.restic_cache import ResticCache
+    from services.restic_image_service import ResticImageService
+    from services.snapshot_index import SnapshotIndex
+
+    cleaned = ResticCache.cleanup_local()
+    if cleaned:
+        print(f"INFO: Cleaned {cleaned} local restic cache(s)")
+    for username, hostname, _ in ResticImageService.container_hosts(backup_config):
+        ResticCache.cleanup_remote(username, hostname)
+
+    evicted = SnapshotIndex.evict()
+    if evicted:
+        print(f"INFO: Dropped {evicted} unused snapshot index(es)")
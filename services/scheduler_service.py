@@ -1,18 +1,53 @@
 # services/scheduler_service.py
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.util import obj_to_ref
 import logging
 import atexit
+import os
 
 logger = logging.getLogger(__name__)
 
 class SchedulerService:
-    def __init__(self):
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.start()
-        logger.info("SchedulerService started")
+    def __init__(self, jobstore_path: str | None = None, misfire_grace_time: int | None = 14400, coalesce: bool = True):
+        """Create the scheduler paused; call resume() once schedules have been reconciled.
+
+        With a jobstore_path, jobs are persisted in SQLite so runs missed while
+        the process was down fire once (coalesced) on restart, within the
+        misfire grace window.
+        """
+        self.scheduler = BackgroundScheduler(
+            jobstores={'default': self._create_jobstore(jobstore_path)},
+            job_defaults={
+                'coalesce': coalesce,
+                'misfire_grace_time': misfire_grace_time,
+                'max_instances': 1
+            }
+        )
+        self.scheduler.start(paused=True)
+        logger.info("SchedulerService started (paused)")
         atexit.register(lambda: self.shutdown())
 
+    @staticmethod
+    def _create_jobstore(jobstore_path):
+        """Build persistent SQLite job store, falling back to memory if unavailable."""
+        if not jobstore_path:
+            return MemoryJobStore()
+        try:
+            from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+            os.makedirs(os.path.dirname(jobstore_path) or '.', exist_ok=True)
+            return SQLAlchemyJobStore(url=f"sqlite:///{jobstore_path}")
+        except Exception as e:
+            print(f"WARNING: Persistent job store unavailable ({e}) - schedules will not survive restarts")
+            return MemoryJobStore()
+
+    def resume(self):
+        """Start processing jobs; missed runs within their grace time fire now."""
+        self.scheduler.resume()
+        logger.info("SchedulerService resumed")
+
     def add_cron_job(self, func, job_id, cron_expr, args=None, kwargs=None):
         """Add or replace a job with explicit CronTrigger kwargs (minute, hour, etc.)."""
         self.remove_job(job_id)
@@ -26,34 +61,100 @@ class SchedulerService:
         )
         logger.info(f"Added cron job {job_id} with schedule {cron_expr}")
 
-    def add_crontab_job(self, func, job_id, crontab: str, timezone: str | None = None, args=None, kwargs=None):
-        """Add or replace a job using a crontab string like '30 3 * * 1,3,5'."""
-        self.remove_job(job_id)
+    def add_crontab_job(self, func, job_id, crontab: str, timezone: str | None = None, args=None, kwargs=None,
+                        misfire_grace_time=None, coalesce=None):
+        """Add or replace a job using a crontab string like '30 3 * * 1,3,5'.
+
+        An unchanged persisted job is kept as-is so a pending missed run is not lost.
+        """
         trigger = CronTrigger.from_crontab(crontab, timezone=timezone)
+        policy = {}
+        if misfire_grace_time is not None:
+            policy['misfire_grace_time'] = misfire_grace_time
+        if coalesce is not None:
+            policy['coalesce'] = coalesce
+
+        existing = self.scheduler.get_job(job_id)
+        if existing and self._is_same_job(existing, func, trigger, args or [], kwargs or {}):
+            if policy:
+                existing.modify(**policy)
+            logger.info(f"Kept persisted crontab job {job_id} (next run {existing.next_run_time})")
+            return
+
+        self.remove_job(job_id)
         self.scheduler.add_job(
             func,
             trigger,
             id=job_id,
             args=args or [],
             kwargs=kwargs or {},
-            replace_existing=True
+            replace_existing=True,
+            **policy
         )
         logger.info(f"Added crontab job {job_id}: '{crontab}' tz={timezone or 'scheduler default'}")
 
-    def add_interval_job(self, func, job_id, seconds, args=None, kwargs=None):
-        """Add or replace a job on a fixed interval in seconds."""
+    @staticmethod
+    def _is_same_job(existing, func, trigger, args, kwargs):
+        """Check whether a stored job matches the requested callable, trigger and arguments."""
+        try:
+            return (
+                existing.func_ref == obj_to_ref(func)
+                and str(existing.trigger) == str(trigger)
+                and str(existing.trigger.timezone) == str(trigger.timezone)
+                and list(existing.args) == list(args)
+                and dict(existing.kwargs) == dict(kwargs)
+            )
+        except Exception:
+            return False
+
+    def add_interval_job(self, func, job_id, seconds, args=None, kwargs=None, misfire_grace_time=None):
+        """Add or replace a job on a fixed interval in seconds.
+
+        An unchanged persisted job is kept so its interval doesn't restart with every process start.
+        """
+        trigger = IntervalTrigger(seconds=seconds)
+        policy = {'misfire_grace_time': misfire_grace_time} if misfire_grace_time is not None else {}
+
+        existing = self.scheduler.get_job(job_id)
+        if existing and self._is_same_job(existing, func, trigger, args or [], kwargs or {}):
+            if policy:
+                existing.modify(**policy)
+            logger.info(f"Kept persisted interval job {job_id} (next run {existing.next_run_time})")
+            return
+
         self.remove_job(job_id)
         self.scheduler.add_job(
             func,
-            'interval',
-            seconds=seconds,
+            trigger,
             id=job_id,
             args=args or [],
             kwargs=kwargs or {},
-            replace_existing=True
+            replace_existing=True,
+            **policy
         )
         logger.info(f"Added interval job {job_id} every {seconds} seconds")
 
+    def add_date_job(self, func, job_id, run_date=None, args=None, kwargs=None, misfire_grace_time=None, name=None):
+        """Add or replace a one-shot job (run_date None means as soon as possible)."""
+        policy = {'misfire_grace_time': misfire_grace_time} if misfire_grace_time is not None else {}
+        if name:
+            policy['name'] = name
+        self.scheduler.add_job(
+            func,
+            'date',
+            run_date=run_date,
+            id=job_id,
+            args=args or [],
+            kwargs=kwargs or {},
+            replace_existing=True,
+            **policy
+        )
+        logger.info(f"Added one-shot job {job_id} at {run_date or 'now'}")
+
+    def get_job_ids(self, prefix: str = "") -> list:
+        """List scheduled job ids, optionally filtered by prefix."""
+        return [job.id for job in self.scheduler.get_jobs() if job.id.startswith(prefix)]
+
     def remove_job(self, job_id):
         """Remove a job if it exists."""
         try:
@@ -67,4 +168,3 @@ class SchedulerService:
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
             logger.info("SchedulerService stopped")
-
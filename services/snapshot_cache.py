@@ -0,0 +1,79 @@
+"""
+Snapshot list cache
+Per-repository cache of `restic snapshots` results, refreshed in the background when a backup or
+maintenance run on the repository finishes; a TTL and manual refresh cover changes made elsewhere
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class SnapshotListCache:
+    """Process-wide cache of formatted snapshot listings keyed by repository (see RepositoryIdentity)"""
+
+    ttl_seconds = 900   # entries older than this are re-listed on the next request
+
+    _entries: Dict[str, Dict[str, Any]] = {}
+    _refreshing: set = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, global_settings: Dict):
+        """Apply snapshot_cache_ttl_seconds from global settings"""
+        cls.ttl_seconds = int(global_settings.get('snapshot_cache_ttl_seconds', 900))
+
+    @classmethod
+    def get(cls, repository_key: str) -> Optional[Dict[str, Any]]:
+        """Cached listing result (with cached/age_seconds added) while fresh, else None"""
+        with cls._lock:
+            entry = cls._entries.get(repository_key)
+        if entry is None:
+            return None
+        age = time.time() - entry['fetched_at']
+        if age > cls.ttl_seconds:
+            return None
+        return {**entry['result'], 'cached': True, 'age_seconds': round(age, 1)}
+
+    @classmethod
+    def put(cls, repository_key: str, result: Dict[str, Any]):
+        """Store a successful listing result"""
+        with cls._lock:
+            cls._entries[repository_key] = {'result': result, 'fetched_at': time.time()}
+
+    @classmethod
+    def invalidate(cls, repository_key: str):
+        """Drop a repository's listing so the next request goes to the repository"""
+        with cls._lock:
+            cls._entries.pop(repository_key, None)
+
+    @classmethod
+    def refresh_async(cls, job_config: Dict[str, Any]):
+        """Re-list a job's repository on a daemon thread (the stale entry is dropped immediately)"""
+        from services.repository_identity import RepositoryIdentity
+        from services.restic_runner import ResticRunner
+
+        repository_key = RepositoryIdentity.key(
+            ResticRunner()._build_repository_url(job_config.get('dest_config', {})), job_config.get('source_config')
+        )
+        cls.invalidate(repository_key)
+        with cls._lock:
+            if repository_key in cls._refreshing:
+                return
+            cls._refreshing.add(repository_key)
+        threading.Thread(
+            target=cls._refresh_in_background, args=(repository_key, job_config), daemon=True,
+            name="snapshot-list-refresh"
+        ).start()
+
+    @classmethod
+    def _refresh_in_background(cls, repository_key: str, job_config: Dict[str, Any]):
+        """Thread body for refresh_async"""
+        from services.restic_repository_service import ResticRepositoryService
+
+        try:
+            result = ResticRepositoryService().list_snapshots(job_config, refresh=True)
+            if not result.get('success'):
+                print(f"WARNING: Snapshot list refresh failed: {result.get('error')}")
+        finally:
+            with cls._lock:
+                cls._refreshing.discard(repository_key)
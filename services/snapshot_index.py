@@ -0,0 +1,521 @@
+"""
+Snapshot tree index
+Disk-backed (SQLite) directory index per restic snapshot keyed by parent directory with interned names
+and paths. A snapshot whose predecessor is indexed stores only the `restic diff` delta on top of it;
+a full `restic ls` rebuild happens when no base is indexed or the delta chain gets too long
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+SCHEMA_VERSION = 2   # bump to drop and recreate the index after layout changes (it is only a cache)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snap_key INTEGER PRIMARY KEY,
+    repo_id TEXT NOT NULL,
+    snapshot_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    hostname TEXT,
+    paths TEXT,
+    snapshot_time TEXT,
+    base_key INTEGER,
+    depth INTEGER DEFAULT 0,
+    entry_count INTEGER DEFAULT 0,
+    indexed_at REAL,
+    last_used REAL,
+    UNIQUE (repo_id, snapshot_id)
+);
+CREATE TABLE IF NOT EXISTS names (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS dirs (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS entries (
+    snap_key INTEGER NOT NULL,
+    parent_id INTEGER NOT NULL,
+    name_id INTEGER NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_by_parent ON entries (snap_key, parent_id);
+"""
+
+# restic diff modifiers whose entries are re-read from the new snapshot ('U' is metadata only)
+CHANGED_MODIFIERS = ('+', 'M', 'T')
+
+
+class SnapshotIndex:
+    """Builds, queries and evicts per-snapshot directory indexes in one SQLite database"""
+
+    enabled = True
+    db_path = os.path.join(os.environ.get('HIGHBALL_CACHE_DIR', '/var/cache/highball'), 'snapshot_index.sqlite')
+    max_snapshots = 20          # indexed snapshots kept across all repositories (least recently browsed dropped)
+    max_unused_days = 30        # indexes not browsed for this long are dropped
+    index_after_backup = False  # build the new snapshot's index right after each backup
+    full_rebuild_every = 10     # delta chain length after which the next index is a full listing again
+    vacuum_free_ratio = 0.25    # database file is rewritten when this share of its pages is free
+    batch_size = 5000
+    ls_chunk_size = 200         # directories re-listed per `restic ls` call when applying a delta
+
+    _building: set = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, global_settings: Dict):
+        """Apply snapshot_index_* settings from global settings"""
+        cls.enabled = bool(global_settings.get('snapshot_index_enabled', True))
+        cls.db_path = global_settings.get('snapshot_index_path') or cls.db_path
+        cls.max_snapshots = int(global_settings.get('snapshot_index_max_snapshots', cls.max_snapshots))
+        cls.max_unused_days = int(global_settings.get('snapshot_index_max_unused_days', cls.max_unused_days))
+        cls.index_after_backup = bool(global_settings.get('snapshot_index_after_backup', cls.index_after_backup))
+        cls.full_rebuild_every = max(1, int(global_settings.get('snapshot_index_full_rebuild_every', cls.full_rebuild_every)))
+
+    @staticmethod
+    def repository_id(job_config: Dict[str, Any]) -> str:
+        """Index key for a job's repository (hashed like the restic cache directories; per host for local paths)"""
+        from services.repository_identity import RepositoryIdentity
+        from services.restic_cache import ResticCache
+        from services.restic_runner import ResticRunner
+        repository_url = ResticRunner()._build_repository_url(job_config.get('dest_config', {}))
+        return ResticCache.repository_id(RepositoryIdentity.key(repository_url, job_config.get('source_config')))
+
+    @classmethod
+    def list_directory(cls, job_config: Dict[str, Any], snapshot_id: str, path: str) -> Optional[List[Dict[str, Any]]]:
+        """Children of path in an indexed snapshot (name/type/path/size), None when not indexed"""
+        if not cls.enabled or not os.path.exists(cls.db_path):
+            return None
+        repo_id = cls.repository_id(job_config)
+        parent = cls._normalize(path)
+
+        with cls._connect() as db:
+            row = db.execute(
+                "SELECT snap_key FROM snapshots WHERE repo_id = ? AND snapshot_id = ? AND status = 'ready'",
+                (repo_id, snapshot_id)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE snapshots SET last_used = ? WHERE snap_key = ?", (time.time(), row[0]))
+
+            # Nearest delta wins: the snapshot's own entries, then each base down to the full listing
+            children: Dict[str, Optional[Tuple[bool, Any]]] = {}
+            for snap_key in cls._chain(db, row[0]):
+                for name, is_dir, size, deleted in db.execute(
+                    "SELECT n.name, e.is_dir, e.size, e.deleted FROM entries e "
+                    "JOIN dirs d ON d.id = e.parent_id JOIN names n ON n.id = e.name_id "
+                    "WHERE e.snap_key = ? AND d.path = ?",
+                    (snap_key, parent)
+                ):
+                    if name not in children:
+                        children[name] = None if deleted else (bool(is_dir), size)
+
+        prefix = '' if parent == '/' else parent
+        return [{
+            'name': name,
+            'type': 'directory' if entry[0] else 'file',
+            'path': f"{prefix}/{name}",
+            'size': entry[1],
+        } for name, entry in sorted(children.items()) if entry is not None]
+
+    @classmethod
+    def is_indexed(cls, job_config: Dict[str, Any], snapshot_id: str) -> bool:
+        """Whether a snapshot has a finished index"""
+        if not os.path.exists(cls.db_path):
+            return False
+        with cls._connect() as db:
+            row = db.execute(
+                "SELECT 1 FROM snapshots WHERE repo_id = ? AND snapshot_id = ? AND status = 'ready'",
+                (cls.repository_id(job_config), snapshot_id)
+            ).fetchone()
+        return row is not None
+
+    @classmethod
+    def build_async(cls, job_config: Dict[str, Any], snapshot_id: str) -> bool:
+        """Index a snapshot on a daemon thread unless it is indexed or already being built"""
+        if not cls.enabled or not snapshot_id:
+            return False
+        key = (cls.repository_id(job_config), snapshot_id)
+        with cls._lock:
+            if key in cls._building:
+                return False
+            cls._building.add(key)
+
+        def run():
+            try:
+                if not cls.is_indexed(job_config, snapshot_id):
+                    result = cls.build(job_config, snapshot_id)
+                    level = "INFO" if result['success'] else "WARNING"
+                    print(f"{level}: {result['message']}")
+            finally:
+                with cls._lock:
+                    cls._building.discard(key)
+
+        threading.Thread(target=run, daemon=True, name=f"snapshot-index-{snapshot_id[:8]}").start()
+        return True
+
+    @classmethod
+    def build(cls, job_config: Dict[str, Any], snapshot_id: str) -> Dict[str, Any]:
+        """Index a snapshot as a delta on an indexed predecessor when possible, else from a full listing"""
+        from services.restic_runner import ResticRunner
+
+        runner = ResticRunner()
+        dest_config = job_config.get('dest_config', {})
+        repo_url = runner._build_repository_url(dest_config)
+        env_vars = runner._build_environment(dest_config)
+        repo_id = cls.repository_id(job_config)
+        start_time = time.time()
+
+        info = cls._snapshot_info(repo_url, env_vars, snapshot_id)
+        with cls._connect() as db:
+            snap_key = cls._begin(db, repo_id, snapshot_id, info)
+            base = cls._find_base(db, repo_id, snap_key, info)
+            if base is not None:
+                # Record the base in the same transaction so eviction keeps it alive while the delta is built
+                db.execute("UPDATE snapshots SET base_key = ? WHERE snap_key = ?", (base[0], snap_key))
+
+        result = None
+        if base is not None:
+            base_key, base_snapshot_id, base_depth = base
+            result = cls._index_delta(repo_url, env_vars, snap_key, base_snapshot_id, snapshot_id)
+            if result['success'] and cls._mark_ready(snap_key, base_key, base_depth + 1, result['entries']):
+                mode = f'delta on {base_snapshot_id[:8]}'
+            else:
+                reason = result.get('error') or 'its base index was removed'
+                print(f"WARNING: Incremental index of {snapshot_id[:8]} failed ({reason}) - doing a full listing")
+                cls._clear_entries(snap_key)
+                result = None
+        if result is None:
+            mode = 'full listing'
+            result = cls._index_full(repo_url, env_vars, snap_key, snapshot_id)
+            if not result['success']:
+                cls._drop(snap_key)
+                return {'success': False, 'message': f"Indexing snapshot {snapshot_id[:8]} failed: {result['error']}"}
+            cls._mark_ready(snap_key, None, 0, result['entries'])
+
+        cls.evict()
+        return {
+            'success': True,
+            'entries': result['entries'],
+            'message': f"Indexed snapshot {snapshot_id[:8]} ({mode}): {result['entries']} entries "
+                       f"in {time.time() - start_time:.1f}s"
+        }
+
+    @classmethod
+    def evict(cls, now: Optional[float] = None) -> int:
+        """
+        Drop indexes beyond max_snapshots (least recently browsed first) or unused too long.
+        A base counts as used whenever a snapshot built on it is, is kept while any kept or building snapshot
+        stacks on it, and dependants are dropped before their base.
+        """
+        if not os.path.exists(cls.db_path):
+            return 0
+        now = now or time.time()
+        cutoff = now - cls.max_unused_days * 86400
+        with cls._connect() as db:
+            rows = db.execute(
+                "SELECT snap_key, base_key, depth, status, COALESCE(last_used, indexed_at) FROM snapshots"
+            ).fetchall()
+
+        # Propagate use down each chain (a building snapshot keeps its base alive)
+        recency = {snap_key: used if status == 'ready' else now for snap_key, _, _, status, used in rows}
+        bases = {snap_key: base_key for snap_key, base_key, _, _, _ in rows}
+        for snap_key in list(recency):
+            used, base_key = recency[snap_key], bases[snap_key]
+            while base_key in recency:
+                recency[base_key] = max(recency[base_key] or 0, used or 0)
+                base_key = bases[base_key]
+
+        ready = sorted(((snap_key, depth) for snap_key, _, depth, status, _ in rows if status == 'ready'),
+                       key=lambda item: (-(recency[item[0]] or 0), item[1]))
+        stale = [snap_key for position, (snap_key, _) in enumerate(ready)
+                 if position >= cls.max_snapshots or (recency[snap_key] or 0) < cutoff]
+
+        # Never drop a base that a kept or building snapshot still stacks on
+        protected = set()
+        for snap_key in set(recency) - set(stale):
+            base_key = bases[snap_key]
+            while base_key in recency and base_key not in protected:
+                protected.add(base_key)
+                base_key = bases[base_key]
+        stale = [snap_key for snap_key in stale if snap_key not in protected]
+        for snap_key in reversed(stale):
+            cls._drop(snap_key)
+        if stale:
+            cls._compact()
+        return len(stale)
+
+    @classmethod
+    def _compact(cls):
+        """
+        Delete interned names and paths no entry references any more, then VACUUM once enough pages
+        are free - dropped indexes otherwise leave the file at its high-water size
+        """
+        with cls._connect() as db:
+            names = db.execute("DELETE FROM names WHERE id NOT IN (SELECT name_id FROM entries)").rowcount
+            dirs = db.execute("DELETE FROM dirs WHERE id NOT IN (SELECT parent_id FROM entries)").rowcount
+            building = db.execute("SELECT COUNT(*) FROM snapshots WHERE status = 'building'").fetchone()[0]
+        if names or dirs:
+            print(f"INFO: Snapshot index released {names} unused name(s) and {dirs} unused path(s)")
+
+        # VACUUM rewrites the whole file under an exclusive lock - leave it for a quiet run
+        if building:
+            return
+        try:
+            with cls._connect() as db:
+                page_count = db.execute("PRAGMA page_count").fetchone()[0]
+                free_count = db.execute("PRAGMA freelist_count").fetchone()[0]
+            if page_count and free_count / page_count >= cls.vacuum_free_ratio:
+                db = sqlite3.connect(cls.db_path, timeout=30)
+                try:
+                    db.execute("VACUUM")
+                finally:
+                    db.close()
+                print(f"INFO: Snapshot index vacuumed ({free_count} of {page_count} pages were free)")
+        except sqlite3.Error as e:
+            print(f"WARNING: Snapshot index vacuum failed: {str(e)}")
+
+    @classmethod
+    def _index_full(cls, repo_url: str, env_vars: Dict[str, str], snap_key: int, snapshot_id: str) -> Dict[str, Any]:
+        """Store every node of a snapshot from a streamed `restic ls --json` listing"""
+        pending: List[Tuple[str, str, bool, Any, bool]] = []
+        count = 0
+
+        def on_node(node):
+            nonlocal count
+            pending.append(node + (False,))
+            count += 1
+            if len(pending) >= cls.batch_size:
+                cls._insert(snap_key, pending)
+                pending.clear()
+
+        result = cls._stream_ls(repo_url, env_vars, snapshot_id, [], on_node)
+        if pending:
+            cls._insert(snap_key, pending)
+        if not result.success:
+            return {'success': False, 'error': result.stderr.strip()}
+        return {'success': True, 'entries': count}
+
+    @classmethod
+    def _index_delta(cls, repo_url: str, env_vars: Dict[str, str], snap_key: int,
+                     base_snapshot_id: str, snapshot_id: str) -> Dict[str, Any]:
+        """
+        Store only what changed since the base: `restic diff --json` names the paths, then just their
+        parent directories are re-listed for types and sizes; removals become tombstones
+        """
+        from services.command_execution_service import CommandExecutionService, ExecutionConfig
+
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+
+        def on_change(stream_name, line):
+            if stream_name != 'stdout' or not line.startswith('{'):
+                return False
+            try:
+                change = json.loads(line)
+            except json.JSONDecodeError:
+                return True
+            if change.get('message_type') == 'change' and change.get('path'):
+                path = cls._normalize(change['path'])
+                if change.get('modifier') in CHANGED_MODIFIERS:
+                    changed.add(path)
+                elif change.get('modifier') == '-':
+                    removed.add(path)
+            return True
+
+        command = ['restic', '-r', repo_url, 'diff', base_snapshot_id, snapshot_id, '--no-lock', '--json']
+        executor = CommandExecutionService(ExecutionConfig(timeout=None))
+        result = executor.execute_streaming(command, on_change, env_vars=env_vars)
+        if not result.success:
+            return {'success': False, 'error': result.stderr.strip() or 'restic diff failed'}
+
+        # A path both removed and added changed type; the re-listed entry replaces it
+        removed -= changed
+        delta = [(os.path.dirname(path) or '/', os.path.basename(path), False, None, True) for path in removed]
+        found: Set[str] = set()
+
+        def on_node(node):
+            path = f"{'' if node[0] == '/' else node[0]}/{node[1]}"
+            if path in changed and path not in found:
+                found.add(path)
+                delta.append(node + (False,))
+
+        directories = sorted({os.path.dirname(path) or '/' for path in changed})
+        for start in range(0, len(directories), cls.ls_chunk_size):
+            result = cls._stream_ls(repo_url, env_vars, snapshot_id, directories[start:start + cls.ls_chunk_size], on_node)
+            if not result.success:
+                return {'success': False, 'error': result.stderr.strip() or 'restic ls failed'}
+        if found != changed:
+            return {'success': False, 'error': f'{len(changed - found)} changed paths missing from the listing'}
+
+        for start in range(0, len(delta), cls.batch_size):
+            cls._insert(snap_key, delta[start:start + cls.batch_size])
+        return {'success': True, 'entries': len(delta)}
+
+    @classmethod
+    def _stream_ls(cls, repo_url: str, env_vars: Dict[str, str], snapshot_id: str, directories: List[str], on_node):
+        """Run `restic ls --json` (optionally limited to directories), handing each parsed node to on_node"""
+        from services.command_execution_service import CommandExecutionService, ExecutionConfig
+
+        def on_line(stream_name, line):
+            if stream_name != 'stdout' or not line.startswith('{'):
+                return False
+            node = cls._parse_node(line)
+            if node is not None:
+                on_node(node)
+            return True
+
+        command = ['restic', '-r', repo_url, 'ls', snapshot_id, '--no-lock', '--json'] + directories
+        executor = CommandExecutionService(ExecutionConfig(timeout=None))
+        return executor.execute_streaming(command, on_line, env_vars=env_vars)
+
+    @staticmethod
+    def _snapshot_info(repo_url: str, env_vars: Dict[str, str], snapshot_id: str) -> Dict[str, Any]:
+        """parent/hostname/paths/time of a snapshot from `restic snapshots --json` ({} when unavailable)"""
+        from services.command_execution_service import CommandExecutionService
+
+        command = ['restic', '-r', repo_url, 'snapshots', snapshot_id, '--no-lock', '--json']
+        result = CommandExecutionService().execute_locally(command, env_vars)
+        if not result.success:
+            return {}
+        try:
+            snapshots = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            return {}
+        return snapshots[0] if snapshots else {}
+
+    @classmethod
+    def _find_base(cls, db: sqlite3.Connection, repo_id: str, snap_key: int,
+                   info: Dict[str, Any]) -> Optional[Tuple[int, str, int]]:
+        """
+        Indexed snapshot to diff against: restic's recorded parent if indexed, else the latest indexed
+        snapshot of the same host and paths. None (full rebuild) when the chain would get too long.
+        """
+        if not info:
+            return None
+        candidates = []
+        if info.get('parent'):
+            candidates.append(db.execute(
+                "SELECT snap_key, snapshot_id, depth FROM snapshots "
+                "WHERE repo_id = ? AND snapshot_id = ? AND status = 'ready'",
+                (repo_id, info['parent'])
+            ).fetchone())
+        candidates.append(db.execute(
+            "SELECT snap_key, snapshot_id, depth FROM snapshots "
+            "WHERE repo_id = ? AND hostname = ? AND paths = ? AND status = 'ready' AND snap_key != ? "
+            "ORDER BY snapshot_time DESC LIMIT 1",
+            (repo_id, info.get('hostname'), json.dumps(sorted(info.get('paths') or [])), snap_key)
+        ).fetchone())
+        for candidate in candidates:
+            if candidate is not None and candidate[2] + 1 < cls.full_rebuild_every:
+                return candidate
+        return None
+
+    @staticmethod
+    def _chain(db: sqlite3.Connection, snap_key: int) -> List[int]:
+        """Snapshot key followed by its bases, nearest first"""
+        chain = []
+        while snap_key is not None and snap_key not in chain:
+            chain.append(snap_key)
+            row = db.execute("SELECT base_key FROM snapshots WHERE snap_key = ?", (snap_key,)).fetchone()
+            snap_key = row[0] if row else None
+        return chain
+
+    @classmethod
+    @contextmanager
+    def _connect(cls):
+        """Committed-and-closed connection with the schema in place (WAL so browsing doesn't wait on a build)"""
+        os.makedirs(os.path.dirname(cls.db_path), exist_ok=True)
+        db = sqlite3.connect(cls.db_path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.executescript("DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS snapshots; "
+                                 "DROP TABLE IF EXISTS names; DROP TABLE IF EXISTS dirs;")
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            db.executescript(SCHEMA)
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def _begin(db: sqlite3.Connection, repo_id: str, snapshot_id: str, info: Dict[str, Any]) -> int:
+        """Register a snapshot as building, clearing any partial earlier attempt"""
+        details = (info.get('hostname'), json.dumps(sorted(info.get('paths') or [])), info.get('time'))
+        row = db.execute(
+            "SELECT snap_key FROM snapshots WHERE repo_id = ? AND snapshot_id = ?", (repo_id, snapshot_id)
+        ).fetchone()
+        if row is not None:
+            db.execute("DELETE FROM entries WHERE snap_key = ?", (row[0],))
+            db.execute(
+                "UPDATE snapshots SET status = 'building', hostname = ?, paths = ?, snapshot_time = ?, "
+                "base_key = NULL, depth = 0, entry_count = 0 WHERE snap_key = ?",
+                details + (row[0],)
+            )
+            return row[0]
+        cursor = db.execute(
+            "INSERT INTO snapshots (repo_id, snapshot_id, status, hostname, paths, snapshot_time) "
+            "VALUES (?, ?, 'building', ?, ?, ?)",
+            (repo_id, snapshot_id) + details
+        )
+        return cursor.lastrowid
+
+    @classmethod
+    def _insert(cls, snap_key: int, nodes: List[Tuple[str, str, bool, Any, bool]]):
+        """Insert one batch of (parent, name, is_dir, size, deleted) rows, interning names and parent paths"""
+        with cls._connect() as db:
+            db.executemany("INSERT OR IGNORE INTO dirs (path) VALUES (?)", {(node[0],) for node in nodes})
+            db.executemany("INSERT OR IGNORE INTO names (name) VALUES (?)", {(node[1],) for node in nodes})
+            db.executemany(
+                "INSERT INTO entries (snap_key, parent_id, name_id, is_dir, size, deleted) "
+                "VALUES (?, (SELECT id FROM dirs WHERE path = ?), (SELECT id FROM names WHERE name = ?), ?, ?, ?)",
+                [(snap_key, parent, name, int(is_dir), size, int(deleted))
+                 for parent, name, is_dir, size, deleted in nodes]
+            )
+
+    @classmethod
+    def _mark_ready(cls, snap_key: int, base_key: Optional[int], depth: int, entry_count: int) -> bool:
+        """Publish a finished index; a delta is only published while its base row still exists"""
+        with cls._connect() as db:
+            cursor = db.execute(
+                "UPDATE snapshots SET status = 'ready', base_key = ?, depth = ?, entry_count = ?, "
+                "indexed_at = ?, last_used = ? WHERE snap_key = ? "
+                "AND (? IS NULL OR EXISTS (SELECT 1 FROM snapshots WHERE snap_key = ? AND status = 'ready'))",
+                (base_key, depth, entry_count, time.time(), time.time(), snap_key, base_key, base_key)
+            )
+        return cursor.rowcount == 1
+
+    @classmethod
+    def _clear_entries(cls, snap_key: int):
+        """Remove a snapshot's stored entries and base (before retrying with a full listing)"""
+        with cls._connect() as db:
+            db.execute("DELETE FROM entries WHERE snap_key = ?", (snap_key,))
+            db.execute("UPDATE snapshots SET base_key = NULL WHERE snap_key = ?", (snap_key,))
+
+    @classmethod
+    def _drop(cls, snap_key: int):
+        """Remove one snapshot's index (interned strings are shared and kept)"""
+        with cls._connect() as db:
+            db.execute("DELETE FROM entries WHERE snap_key = ?", (snap_key,))
+            db.execute("DELETE FROM snapshots WHERE snap_key = ?", (snap_key,))
+
+    @staticmethod
+    def _parse_node(line: str) -> Optional[Tuple[str, str, bool, Any]]:
+        """(parent, name, is_dir, size) from one `restic ls --json` node line"""
+        try:
+            node = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        path = node.get('path')
+        if node.get('struct_type', node.get('message_type')) != 'node' or not path:
+            return None
+        parent = os.path.dirname(path.rstrip('/')) or '/'
+        return parent, node.get('name') or os.path.basename(path), node.get('type') == 'dir', node.get('size')
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        """Path as stored in the index ('/' for the root, no trailing slash)"""
+        return '/' + (path or '').strip('/')
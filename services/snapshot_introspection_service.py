@@ -70,18 +70,20 @@ class SnapshotIntrospectionService:
         # Build container command for snapshot introspection
         container_cmd = [container_runtime, 'run', '--rm', '--user', '$(id -u):$(id -g)']
         
-        # Add environment variables
+        # Add environment variables (the cache location comes from the mounted host cache instead)
         for key, value in environment_vars.items():
-            container_cmd.extend(['-e', f'{key}={value}'])
+            if key != 'RESTIC_CACHE_DIR':
+                container_cmd.extend(['-e', f'{key}={value}'])
+        
+        # Persistent per-repository cache on the remote host
+        from services.restic_cache import ResticCache
+        container_cmd.extend(ResticCache.container_flags(repository_url))
         
         # Use restic container for ls command
-        container_cmd.extend(['restic/restic:0.18.0', '-r', repository_url, 'ls', snapshot_id])
+        from services.container_command_builder import ContainerCommandBuilder
+        container_cmd.extend([ContainerCommandBuilder(container_runtime).restic_image, '-r', repository_url, 'ls', snapshot_id])
         
         # Execute container command via SSH
-        import shlex
-        container_cmd_str = shlex.join(container_cmd)
-        container_cmd_str = container_cmd_str.replace("'$(id -u):$(id -g)'", "$(id -u):$(id -g)")
-        
         executor = CommandExecutionService()
         result = executor.execute_container_via_ssh(hostname, username, container_cmd)
         return {
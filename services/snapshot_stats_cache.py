@@ -0,0 +1,108 @@
+"""
+Snapshot statistics memo
+Persistent restore-size statistics per repository and snapshot ID (a snapshot never changes once written),
+filled in the background after each backup and purged when a listing shows the snapshot was forgotten
+"""
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+from services.job_logger import LogPaths, YAMLFileManager
+
+
+# Only full snapshot IDs are memoized ('latest' and short prefixes are not stable keys)
+FULL_SNAPSHOT_ID = re.compile(r'[0-9a-f]{64}')
+
+
+class SnapshotStatsCache:
+    """Process-wide memo backed by a YAML file: repository ID -> snapshot ID -> stats"""
+
+    _data: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
+    _filling: set = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, repository: str, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Memoized stats (total_size, total_file_count) for a snapshot, else None"""
+        if not FULL_SNAPSHOT_ID.fullmatch(snapshot_id or ''):
+            return None
+        with cls._lock:
+            entry = cls._load().get(cls._repository_key(repository), {}).get(snapshot_id)
+        if entry is None:
+            return None
+        return {'total_size': entry['total_size'], 'total_file_count': entry['total_file_count']}
+
+    @classmethod
+    def put(cls, repository: str, snapshot_id: str, stats: Dict[str, Any]):
+        """Memoize a snapshot's stats"""
+        if not FULL_SNAPSHOT_ID.fullmatch(snapshot_id or ''):
+            return
+        with cls._lock:
+            data = cls._load()
+            data.setdefault(cls._repository_key(repository), {})[snapshot_id] = {
+                'total_size': stats.get('total_size', 0),
+                'total_file_count': stats.get('total_file_count', 0),
+                'computed_at': time.time(),
+            }
+            cls._save(data)
+
+    @classmethod
+    def retain(cls, repository: str, snapshot_ids: Iterable[str], listed_at: float) -> int:
+        """Purge stats of snapshots missing from a repository listing taken at listed_at"""
+        keep = set(snapshot_ids)
+        with cls._lock:
+            data = cls._load()
+            entries = data.get(cls._repository_key(repository), {})
+            # Entries computed after the listing started may belong to a snapshot it could not see yet
+            forgotten = [snapshot_id for snapshot_id, entry in entries.items()
+                         if snapshot_id not in keep and entry.get('computed_at', 0) < listed_at]
+            for snapshot_id in forgotten:
+                del entries[snapshot_id]
+            if forgotten:
+                cls._save(data)
+        return len(forgotten)
+
+    @classmethod
+    def fill_async(cls, job_config: Dict[str, Any], snapshot_id: str):
+        """Compute and memoize a new snapshot's stats on a daemon thread"""
+        if not FULL_SNAPSHOT_ID.fullmatch(snapshot_id or ''):
+            return
+        with cls._lock:
+            if snapshot_id in cls._filling:
+                return
+            cls._filling.add(snapshot_id)
+        threading.Thread(
+            target=cls._fill_in_background, args=(job_config, snapshot_id), daemon=True,
+            name=f"snapshot-stats-{snapshot_id[:8]}"
+        ).start()
+
+    @classmethod
+    def _fill_in_background(cls, job_config: Dict[str, Any], snapshot_id: str):
+        """Thread body for fill_async (get_snapshot_statistics memoizes its result)"""
+        from services.restic_repository_service import ResticRepositoryService
+
+        try:
+            result = ResticRepositoryService().get_snapshot_statistics(job_config, snapshot_id)
+            if not result.get('success'):
+                print(f"WARNING: Snapshot statistics for {snapshot_id[:8]} failed: {result.get('error')}")
+        finally:
+            with cls._lock:
+                cls._filling.discard(snapshot_id)
+
+    @staticmethod
+    def _repository_key(repository: str) -> str:
+        """Hashed repository key (URLs may embed credentials and are not written to disk)"""
+        from services.restic_cache import ResticCache
+        return ResticCache.repository_id(repository)
+
+    @classmethod
+    def _load(cls) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Memo contents, read from disk on first use (call with the lock held)"""
+        if cls._data is None:
+            cls._data = YAMLFileManager.load_yaml_file(LogPaths().stats_file)
+        return cls._data
+
+    @classmethod
+    def _save(cls, data: Dict[str, Any]):
+        """Write the memo to disk (call with the lock held)"""
+        YAMLFileManager.save_yaml_file(LogPaths().stats_file, data)
@@ -3,8 +3,7 @@ Source path validator service
 Validates source paths with RX/RWX permission checking for backup/restore capabilities
 """
 
-from typing import Dict, List, Any
-from services.command_execution_service import CommandExecutionService
+from typing import Dict, List, Any, Optional
 import os
 
 
@@ -20,6 +19,15 @@ class SourcePathValidator:
         if not source_paths:
             return {'success': False, 'message': 'No source paths configured'}
         
+        # SSH paths are checked concurrently; local checks need no subprocess
+        ssh_results = {}
+        if source_type == 'ssh':
+            ssh_results = SourcePathValidator._check_ssh_paths(
+                source_config.get('hostname'),
+                source_config.get('username'),
+                [path_config.get('path', '').strip() for path_config in source_paths]
+            )
+        
         # Validate each path
         results = []
         all_valid = True
@@ -31,11 +39,7 @@ class SourcePathValidator:
                 continue
                 
             if source_type == 'ssh':
-                result = SourcePathValidator._check_ssh_path(
-                    source_config.get('hostname'),
-                    source_config.get('username'), 
-                    path
-                )
+                result = dict(ssh_results[path])
             elif source_type == 'local':
                 result = SourcePathValidator._check_local_path(path)
             else:
@@ -65,41 +69,96 @@ class SourcePathValidator:
         }
     
     @staticmethod
-    def _check_ssh_path(hostname: str, username: str, path: str) -> Dict[str, Any]:
-        """Check SSH path permissions with RX/RWX analysis"""
+    def _check_ssh_paths(hostname: str, username: str, paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Check several SSH paths concurrently; returns results keyed by path"""
+        from services.async_command_execution_service import AsyncCommandExecutionService
+        
+        paths = sorted(set(path for path in paths if path))
         if not hostname or not username:
-            return {'valid': False, 'message': 'SSH hostname and username required'}
+            return {path: {'valid': False, 'message': 'SSH hostname and username required'} for path in paths}
+        
+        agent_results = SourcePathValidator._check_ssh_paths_via_agent(hostname, username, paths)
+        if agent_results is not None:
+            return agent_results
+        
+        async def run_checks():
+            executor = AsyncCommandExecutionService()
+            return await executor.gather({
+                path: executor.execute_via_ssh(hostname, username, SourcePathValidator._build_permission_test(path))
+                for path in paths
+            })
         
         try:
-            executor = CommandExecutionService()
-            
-            # Test RX permissions (required for backup) + write test in one command
-            test_cmd = f'[ -d "{path}" ] && [ -r "{path}" ] && [ -x "{path}" ] && echo "RX_OK" && ([ -w "{path}" ] && echo "W_OK" || echo "W_FAIL") || echo "RX_FAIL"'
-            result = executor.execute_via_ssh(hostname, username, test_cmd)
-            
-            if not result.success:
-                return {'valid': False, 'message': f'SSH connection failed: {result.stderr}'}
-            
-            output = result.stdout.strip()
-            
-            if 'RX_OK' not in output:
-                return {'valid': False, 'message': f'Path not accessible (missing read/execute permissions)'}
-            
-            has_write = 'W_OK' in output
-            response = {
-                'valid': True,
-                'message': f'Path accessible ({"RXW" if has_write else "RX"} permissions)',
-                'can_backup': True,
-                'can_restore_to_source': has_write
-            }
-            
-            if not has_write:
-                response['warning'] = 'No write permissions - restore-to-source will fail'
-            
-            return response
-            
+            exec_results = AsyncCommandExecutionService.run(run_checks()) if paths else {}
         except Exception as e:
-            return {'valid': False, 'message': f'Permission check failed: {str(e)}'}
+            return {path: {'valid': False, 'message': f'Permission check failed: {str(e)}'} for path in paths}
+        
+        return {path: SourcePathValidator._interpret_ssh_result(result) for path, result in exec_results.items()}
+    
+    @staticmethod
+    def _check_ssh_paths_via_agent(hostname: str, username: str, paths: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Check paths through the persistent remote agent; None when no agent is available"""
+        from services.remote_agent import RemoteAgentPool, RemoteAgentError
+        
+        results = {}
+        for path in paths:
+            try:
+                access = RemoteAgentPool.call(username, hostname, 'access', path=path)
+            except RemoteAgentError as e:
+                results[path] = {'valid': False, 'message': f'Permission check failed: {str(e)}'}
+                continue
+            if access is None:
+                return None
+            results[path] = SourcePathValidator._interpret_access(access)
+        return results
+    
+    @staticmethod
+    def _interpret_access(access: Dict[str, bool]) -> Dict[str, Any]:
+        """Turn agent access flags into an RX/RWX validation result"""
+        if not (access['is_dir'] and access['readable'] and access['executable']):
+            return {'valid': False, 'message': 'Path not accessible (missing read/execute permissions)'}
+        
+        has_write = access['writable']
+        response = {
+            'valid': True,
+            'message': f'Path accessible ({"RXW" if has_write else "RX"} permissions)',
+            'can_backup': True,
+            'can_restore_to_source': has_write
+        }
+        
+        if not has_write:
+            response['warning'] = 'No write permissions - restore-to-source will fail'
+        
+        return response
+    
+    @staticmethod
+    def _build_permission_test(path: str) -> str:
+        """Test RX permissions (required for backup) + write test in one command"""
+        return f'[ -d "{path}" ] && [ -r "{path}" ] && [ -x "{path}" ] && echo "RX_OK" && ([ -w "{path}" ] && echo "W_OK" || echo "W_FAIL") || echo "RX_FAIL"'
+    
+    @staticmethod
+    def _interpret_ssh_result(result) -> Dict[str, Any]:
+        """Turn permission test output into an RX/RWX validation result"""
+        if not result.success:
+            return {'valid': False, 'message': f'SSH connection failed: {result.stderr}'}
+        
+        output = result.stdout.strip()
+        
+        if 'RX_OK' not in output:
+            return {'valid': False, 'message': f'Path not accessible (missing read/execute permissions)'}
+        
+        has_write = 'W_OK' in output
+        response = {
+            'valid': True,
+            'message': f'Path accessible ({"RXW" if has_write else "RX"} permissions)',
+            'can_backup': True,
+            'can_restore_to_source': has_write
+        }
+        
+        if not has_write:
+            response['warning'] = 'No write permissions - restore-to-source will fail'
+        
+        return response
     
     @staticmethod
     def _check_local_path(path: str) -> Dict[str, Any]:
@@ -0,0 +1,140 @@
+"""
+Central SSH transport
+Builds every ssh invocation with shared options and per-target ControlMaster multiplexing,
+so repeated commands to one host reuse a single authenticated connection
+"""
+import hashlib
+import os
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class SSHTransport:
+    """Shared ssh argv builder with ControlMaster/ControlPersist sockets per user@host"""
+
+    control_dir = os.environ.get('HIGHBALL_SSH_CONTROL_DIR', '/tmp/highball-ssh')
+    multiplexing = True
+    control_persist_seconds = 300   # idle master connections exit after this long
+    health_check_interval = 60      # seconds between master health checks per target
+
+    _last_checked: Dict[str, float] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, global_settings: Dict):
+        """Apply ssh_multiplexing / ssh_control_persist_seconds from global settings"""
+        cls.multiplexing = bool(global_settings.get('ssh_multiplexing', True))
+        cls.control_persist_seconds = int(global_settings.get('ssh_control_persist_seconds', 300))
+
+    @classmethod
+    def control_path(cls, target: str) -> str:
+        """Socket path for a target (hashed - unix socket paths are length limited)"""
+        digest = hashlib.sha1(target.encode()).hexdigest()[:16]
+        return os.path.join(cls.control_dir, digest)
+
+    @classmethod
+    def options(
+        cls,
+        target: str,
+        connect_timeout: int = 10,
+        batch_mode: bool = True,
+        strict_host_checking: bool = False,
+        known_hosts_file: str = "/dev/null",
+        log_level: Optional[str] = None
+    ) -> List[str]:
+        """ssh -o arguments for a target, including multiplexing when enabled"""
+        args = [
+            '-o', f'ConnectTimeout={connect_timeout}',
+            '-o', f'BatchMode={"yes" if batch_mode else "no"}',
+            '-o', f'StrictHostKeyChecking={"yes" if strict_host_checking else "no"}',
+            '-o', f'UserKnownHostsFile={known_hosts_file}',
+        ]
+        if log_level:
+            args.extend(['-o', f'LogLevel={log_level}'])
+
+        if cls.multiplexing and cls._ensure_control_dir():
+            args.extend([
+                '-o', 'ControlMaster=auto',
+                '-o', f'ControlPath={cls.control_path(target)}',
+                '-o', f'ControlPersist={cls.control_persist_seconds}',
+            ])
+        return args
+
+    @classmethod
+    def build_command(
+        cls,
+        target: str,
+        remote_command: Optional[str] = None,
+        ssh_bin: str = 'ssh',
+        end_of_options: bool = False,
+        **option_kwargs
+    ) -> List[str]:
+        """Full ssh argv for running remote_command on target (user@host or host)"""
+        cls.ensure_healthy(target)
+        cmd = [ssh_bin] + cls.options(target, **option_kwargs) + [target]
+        if end_of_options:
+            cmd.append('--')
+        if remote_command is not None:
+            cmd.append(remote_command)
+        return cmd
+
+    @classmethod
+    def ensure_healthy(cls, target: str):
+        """Drop a stale master socket so the next command re-establishes the connection"""
+        if not cls.multiplexing:
+            return
+
+        path = cls.control_path(target)
+        if not os.path.exists(path):
+            return
+
+        with cls._lock:
+            now = time.time()
+            if now - cls._last_checked.get(target, 0) < cls.health_check_interval:
+                return
+            cls._last_checked[target] = now
+
+        try:
+            result = subprocess.run(
+                ['ssh', '-O', 'check', '-o', f'ControlPath={path}', target],
+                capture_output=True, text=True, timeout=5
+            )
+            healthy = result.returncode == 0
+        except (subprocess.TimeoutExpired, OSError):
+            healthy = False
+
+        if not healthy:
+            print(f"WARNING: Stale SSH master connection for {target} - reconnecting")
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    @classmethod
+    def close(cls, target: str):
+        """Ask the master connection for a target to exit"""
+        path = cls.control_path(target)
+        if not os.path.exists(path):
+            return
+        try:
+            subprocess.run(
+                ['ssh', '-O', 'exit', '-o', f'ControlPath={path}', target],
+                capture_output=True, text=True, timeout=5
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+        with cls._lock:
+            cls._last_checked.pop(target, None)
+
+    @classmethod
+    def _ensure_control_dir(cls) -> bool:
+        """Create the private socket directory; multiplexing is skipped if that fails"""
+        try:
+            os.makedirs(cls.control_dir, mode=0o700, exist_ok=True)
+            return True
+        except OSError as e:
+            print(f"WARNING: SSH multiplexing disabled - cannot create {cls.control_dir}: {e}")
+            cls.multiplexing = False
+            return False
@@ -2,12 +2,11 @@
 SSH validation service for remote backup sources - modernized
 Validates SSH connectivity and permissions using modern patterns
 """
-import subprocess
 import re
 import validators
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple
 
 
 @dataclass
@@ -18,15 +17,6 @@ class SSHConfig:
     strict_host_checking: bool = False
     known_hosts_file: str = "/dev/null"
     timeout_seconds: int = 10
-    
-    def to_ssh_args(self) -> List[str]:
-        """Convert configuration to SSH command arguments"""
-        return [
-            '-o', f'ConnectTimeout={self.connect_timeout}',
-            '-o', f'BatchMode={"yes" if self.batch_mode else "no"}',
-            '-o', f'StrictHostKeyChecking={"yes" if self.strict_host_checking else "no"}',
-            '-o', f'UserKnownHostsFile={self.known_hosts_file}'
-        ]
 
 
 @dataclass
@@ -127,24 +117,25 @@ class SSHValidator:
                 f"Invalid hostname format: {connection.hostname}"
             )
         
-        # Test SSH connection
-        ssh_result = self._test_ssh_connection(connection)
-        if not ssh_result.success:
-            return ssh_result
+        # One SSH round trip covers connectivity, path, tools and restic image
+        probe = self._probe_host(connection)
+        if not probe.success:
+            return ValidationResult.error_result(probe.error)
         
         # Only test path and rsync if path is provided
         details = {
-            'ssh_status': ssh_result.message
+            'ssh_status': 'SSH connection established',
+            'restic_image': self._describe_restic_image(probe)
         }
+        capabilities = self._test_capabilities(probe)
         
         if connection.path:
             # Test remote path accessibility
-            path_result = self._test_remote_path(connection)
+            path_result = self._check_remote_path(connection, probe)
             if not path_result.success:
                 return path_result
             
             # Test backup capabilities (rsync + container runtimes)
-            capabilities = self._test_capabilities(connection)
             analysis = self._analyze_capabilities(capabilities)
             
             # Update details with capability information
@@ -180,7 +171,6 @@ class SSHValidator:
                 )
         else:
             # Connection-only validation - still test backup capabilities
-            capabilities = self._test_capabilities(connection)
             analysis = self._analyze_capabilities(capabilities)
             
             details.update({
@@ -214,139 +204,69 @@ class SSHValidator:
                     tested_from="Highball container"
                 )
     
-    def _test_ssh_connection(self, connection: SSHConnectionDetails) -> ValidationResult:
-        """Test basic SSH connectivity"""
-        try:
-            cmd = ['ssh'] + self.config.to_ssh_args() + [
-                f'{connection.username}@{connection.hostname}',
-                'echo "SSH_OK"'
-            ]
-            
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=self.config.timeout_seconds
-            )
-            
-            if result.returncode == 0 and 'SSH_OK' in result.stdout:
-                return ValidationResult.success_result('SSH connection established')
-            else:
-                error_msg = result.stderr.strip() or 'Connection failed'
-                return ValidationResult.error_result(f'SSH connection failed: {error_msg}')
-                
-        except subprocess.TimeoutExpired:
-            return ValidationResult.error_result('SSH connection timed out')
-        except Exception as e:
-            return ValidationResult.error_result(f'SSH test error: {str(e)}')
+    def _probe_host(self, connection: SSHConnectionDetails):
+        """Run the remote capability probe over a single SSH session"""
+        from services.remote_probe import RemoteProbe
+        from services.host_inventory import HostInventory
+        probe = RemoteProbe(
+            connect_timeout=self.config.connect_timeout,
+            timeout_seconds=self.config.timeout_seconds
+        ).probe(connection.username, connection.hostname, connection.path)
+        
+        # Refresh (or on failure invalidate) the cached inventory for this host
+        HostInventory.record_probe(connection.username, connection.hostname, probe)
+        return probe
     
-    def _test_remote_path(self, connection: SSHConnectionDetails) -> ValidationResult:
-        """Test if remote path exists and is accessible"""
-        try:
-            # Test if path exists and get basic info
-            cmd = ['ssh'] + self.config.to_ssh_args() + [
-                f'{connection.username}@{connection.hostname}',
-                f'test -e "{connection.path}" && echo "PATH_EXISTS" || echo "PATH_MISSING"'
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.config.timeout_seconds
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                if 'PATH_EXISTS' in output:
-                    return ValidationResult.success_result('Remote path exists and is accessible')
-                elif 'PATH_MISSING' in output:
-                    return ValidationResult.error_result(
-                        f'Remote path does not exist: {connection.path}'
-                    )
-                else:
-                    return ValidationResult.error_result('Could not determine path status')
-            else:
-                error_msg = result.stderr.strip() or 'Path test failed'
-                return ValidationResult.error_result(f'Remote path test failed: {error_msg}')
-                
-        except subprocess.TimeoutExpired:
-            return ValidationResult.error_result('Remote path test timed out')
-        except Exception as e:
-            return ValidationResult.error_result(f'Path test error: {str(e)}')
+    def _check_remote_path(self, connection: SSHConnectionDetails, probe) -> ValidationResult:
+        """Check probed path flags for existence and readability"""
+        path_info = probe.path or {}
+        if not path_info.get('exists'):
+            return ValidationResult.error_result(f'Remote path does not exist: {connection.path}')
+        if not path_info.get('readable'):
+            return ValidationResult.error_result(f'Remote path is not readable by {connection.username}: {connection.path}')
+        return ValidationResult.success_result('Remote path exists and is accessible')
     
-    def _test_capabilities(self, connection: SSHConnectionDetails) -> Dict[str, ValidationResult]:
-        """Test all backup capabilities: rsync, container runtimes"""
+    def _test_capabilities(self, probe) -> Dict[str, ValidationResult]:
+        """Turn probed tool versions into rsync/podman/docker capability results"""
+        tools = probe.tools
         capabilities = {}
         
         # Test rsync
-        capabilities['rsync'] = self._test_rsync_availability(connection)
+        rsync_version = (tools.get('rsync') or '').strip()
+        if 'rsync' in rsync_version.lower() and 'version' in rsync_version.lower():
+            capabilities['rsync'] = ValidationResult.success_result(f'Available: {rsync_version}')
+        else:
+            capabilities['rsync'] = ValidationResult.error_result('Not found')
         
         # Test container runtimes (podman preferred, docker fallback)
-        capabilities['podman'] = self._test_container_runtime(connection, 'podman')
-        capabilities['docker'] = self._test_container_runtime(connection, 'docker')
+        for runtime in ('podman', 'docker'):
+            capabilities[runtime] = self._runtime_capability(runtime, (tools.get(runtime) or '').strip())
         
         return capabilities
     
-    def _test_rsync_availability(self, connection: SSHConnectionDetails) -> ValidationResult:
-        """Test rsync availability on remote host"""
-        try:
-            cmd = ['ssh'] + self.config.to_ssh_args() + [
-                f'{connection.username}@{connection.hostname}',
-                'rsync --version 2>/dev/null | head -1 || echo "RSYNC_MISSING"'
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.config.timeout_seconds)
-            
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                if 'rsync' in output.lower() and 'version' in output.lower():
-                    # Extract just the version info for cleaner display
-                    version_line = output.split('\n')[0].strip()
-                    return ValidationResult.success_result(f'Available: {version_line}')
-                elif 'RSYNC_MISSING' in output:
-                    return ValidationResult.error_result('Not found')
-                else:
-                    return ValidationResult.error_result('Could not determine availability')
+    @staticmethod
+    def _runtime_capability(runtime: str, output: str) -> ValidationResult:
+        """Container runtime availability from its --version output"""
+        if not output:
+            return ValidationResult.error_result('Not found')
+        if f'{runtime} version' in output.lower() or f'{runtime} (podman)' in output.lower():
+            # Clean up version string - remove trailing commas and extra text
+            parts = output.split()
+            if len(parts) >= 3:
+                version_str = f'{parts[0]} {parts[2].rstrip(",")}'
             else:
-                return ValidationResult.error_result('Test failed')
-                
-        except subprocess.TimeoutExpired:
-            return ValidationResult.error_result('Test timed out')
-        except Exception as e:
-            return ValidationResult.error_result(f'Test error: {str(e)}')
+                version_str = parts[0] if parts else runtime
+            return ValidationResult.success_result(f'Available: {version_str}')
+        return ValidationResult.error_result('Could not determine availability')
     
-    def _test_container_runtime(self, connection: SSHConnectionDetails, runtime: str) -> ValidationResult:
-        """Test container runtime (podman/docker) availability"""
-        try:
-            cmd = ['ssh'] + self.config.to_ssh_args() + [
-                f'{connection.username}@{connection.hostname}',
-                f'{runtime} --version 2>/dev/null || echo "{runtime.upper()}_MISSING"'
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.config.timeout_seconds)
-            
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                if f'{runtime} version' in output.lower() or f'{runtime} (podman)' in output.lower():
-                    # Clean up version string - remove trailing commas and extra text
-                    parts = output.split()
-                    if len(parts) >= 3:
-                        version_str = f'{parts[0]} {parts[2].rstrip(",")}'
-                    else:
-                        version_str = parts[0] if parts else runtime
-                    return ValidationResult.success_result(f'Available: {version_str}')
-                elif f'{runtime.upper()}_MISSING' in output:
-                    return ValidationResult.error_result('Not found')
-                else:
-                    return ValidationResult.error_result('Could not determine availability')
-            else:
-                return ValidationResult.error_result('Test failed')
-                
-        except subprocess.TimeoutExpired:
-            return ValidationResult.error_result('Test timed out')
-        except Exception as e:
-            return ValidationResult.error_result(f'Test error: {str(e)}')
+    @staticmethod
+    def _describe_restic_image(probe) -> str:
+        """Whether the restic image is already pulled on the remote host"""
+        image = probe.restic_image
+        present_in = [runtime for runtime in ('podman', 'docker') if image.get(runtime)]
+        if present_in:
+            return f"{image.get('reference')} present ({', '.join(present_in)})"
+        return f"{image.get('reference')} not pulled yet - first restic run will pull it"
     
     def _analyze_capabilities(self, capabilities: Dict[str, ValidationResult]) -> Dict[str, Any]:
         """Analyze available capabilities and determine supported backends"""
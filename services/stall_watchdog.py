@@ -0,0 +1,158 @@
+"""
+Stall watchdog for long-running commands
+Per-operation-type idle (no output) and absolute limits for backups, maintenance and restores;
+a tripped watchdog terminates, then kills the process and removes its remote container
+"""
+import shlex
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+# Seconds; None disables a limit. startup_seconds is the idle limit before the first output line.
+WATCHDOG_DEFAULTS = {
+    'backup': {'startup_seconds': None, 'idle_seconds': 1800, 'max_seconds': None},
+    'maintenance': {'startup_seconds': None, 'idle_seconds': 3600, 'max_seconds': 14400},
+    'restore': {'startup_seconds': 30, 'idle_seconds': 60, 'max_seconds': None},
+}
+
+# Container label identifying the job a restic container runs for (see ContainerCommandBuilder)
+CONTAINER_JOB_LABEL = 'highball.job'
+
+
+class StallWatchdog:
+    """Watches one process; feed output with touch(), stop() when the process has exited"""
+
+    poll_interval = 5            # seconds between limit checks
+    terminate_grace_seconds = 10  # SIGTERM -> SIGKILL escalation delay
+
+    _limits: Dict[str, Dict[str, Optional[int]]] = {key: dict(value) for key, value in WATCHDOG_DEFAULTS.items()}
+    _active: Dict[str, 'StallWatchdog'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, operation_type: str, name: str, cleanup: Optional[Callable[[], None]] = None,
+                 limits: Optional[Dict[str, Optional[int]]] = None):
+        self.operation_type = operation_type
+        self.name = name
+        self.cleanup = cleanup
+        self.limits = {**self.limits_for(operation_type), **(limits or {})}
+        self.started_at = time.time()
+        self.last_output_at: Optional[float] = None
+        self.tripped: Optional[str] = None   # reason, once the watchdog has stopped the process
+        self._process: Optional[subprocess.Popen] = None
+        self._stopped = threading.Event()
+
+    @classmethod
+    def configure(cls, global_settings: Dict):
+        """Apply the watchdog mapping (operation type -> limits) from global settings"""
+        overrides = global_settings.get('watchdog') or {}
+        cls._limits = {
+            operation_type: {**defaults, **(overrides.get(operation_type) or {})}
+            for operation_type, defaults in WATCHDOG_DEFAULTS.items()
+        }
+
+    @classmethod
+    def limits_for(cls, operation_type: str) -> Dict[str, Optional[int]]:
+        """Configured limits for an operation type"""
+        return dict(cls._limits.get(operation_type, WATCHDOG_DEFAULTS['backup']))
+
+    @classmethod
+    def get_all(cls) -> Dict[str, Dict[str, Any]]:
+        """Watched processes keyed by name"""
+        with cls._registry_lock:
+            return {name: watchdog.to_dict() for name, watchdog in cls._active.items()}
+
+    def attach(self, process: subprocess.Popen):
+        """Start watching a launched process"""
+        self._process = process
+        self.started_at = time.time()
+        with self._registry_lock:
+            self._active[self.name] = self
+        threading.Thread(target=self._watch, daemon=True, name=f"watchdog-{self.name}").start()
+
+    def touch(self):
+        """Record output activity"""
+        self.last_output_at = time.time()
+
+    def stop(self):
+        """Stop watching (call once the process has exited)"""
+        self._stopped.set()
+        with self._registry_lock:
+            if self._active.get(self.name) is self:
+                del self._active[self.name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable state for status views"""
+        now = time.time()
+        return {
+            'operation_type': self.operation_type,
+            'running_seconds': round(now - self.started_at, 1),
+            'idle_seconds': round(now - (self.last_output_at or self.started_at), 1),
+            'limits': self.limits,
+            'tripped': self.tripped,
+        }
+
+    def check(self, now: Optional[float] = None) -> Optional[str]:
+        """Reason the process should be stopped, or None while it is within limits"""
+        now = now or time.time()
+        max_seconds = self.limits.get('max_seconds')
+        if max_seconds and now - self.started_at > max_seconds:
+            return f"exceeded the {max_seconds}s limit for {self.operation_type} operations"
+
+        if self.last_output_at is None:
+            startup_seconds = self.limits.get('startup_seconds') or self.limits.get('idle_seconds')
+            if startup_seconds and now - self.started_at > startup_seconds:
+                return f"produced no output within {startup_seconds}s"
+            return None
+
+        idle_seconds = self.limits.get('idle_seconds')
+        if idle_seconds and now - self.last_output_at > idle_seconds:
+            return f"produced no output for {idle_seconds}s"
+        return None
+
+    def _watch(self):
+        """Thread body: check limits until stopped, then escalate if tripped"""
+        while not self._stopped.wait(self.poll_interval):
+            if self._process is None or self._process.poll() is not None:
+                return
+            reason = self.check()
+            if reason:
+                self.tripped = reason
+                print(f"WARNING: {self.operation_type} {self.name} stalled - {reason}; stopping it")
+                self._stop_process()
+                return
+
+    def _stop_process(self):
+        """SIGTERM, SIGKILL after the grace period, then run cleanup (e.g. remote container removal)"""
+        process = self._process
+        try:
+            process.terminate()
+            process.wait(timeout=self.terminate_grace_seconds)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        except OSError:
+            pass
+
+        if self.cleanup is not None:
+            try:
+                self.cleanup()
+            except Exception as e:
+                print(f"WARNING: Watchdog cleanup for {self.name} failed: {str(e)}")
+
+    @staticmethod
+    def remote_container_cleanup(username: str, hostname: str, job_name: str,
+                                 runtime: Optional[str] = None) -> Callable[[], None]:
+        """Cleanup callable force-removing a job's restic containers on an SSH host"""
+        def cleanup():
+            from services.ssh_transport import SSHTransport
+
+            rt = shlex.quote(runtime or 'docker')
+            label = shlex.quote(f"label={CONTAINER_JOB_LABEL}={job_name}")
+            remote_command = f"{rt} ps -q --filter {label} | xargs -r {rt} rm -f"
+            cmd = SSHTransport.build_command(f'{username}@{hostname}', remote_command, log_level='ERROR')
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or 'container removal failed')
+            print(f"INFO: Removed stalled containers for {job_name} on {hostname}")
+        return cleanup
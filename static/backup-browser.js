@@ -83,8 +83,8 @@ function detectJobType(jobName) {
     return 'unknown';
 }
 
-// Multi-provider loading function
-function loadBackupJob() {
+// Multi-provider loading function (refresh re-reads a cached snapshot list from the repository)
+function loadBackupJob(refresh = false) {
     const backupJobSelect = document.getElementById('backupJobSelect');
     const browserContent = document.getElementById('browserContent');
     const repositoryInfo = document.getElementById('repositoryInfo');
@@ -111,12 +111,14 @@ function loadBackupJob() {
         
         if (provider.supports_snapshots) {
             // Repository-based provider (Restic, Borg, etc.) - load snapshots
-            fetch(`${provider.endpoints.list}?job=${encodeURIComponent(currentJob)}`)
+            const refreshParam = refresh ? '&refresh=1' : '';
+            fetch(`${provider.endpoints.list}?job=${encodeURIComponent(currentJob)}${refreshParam}`)
                 .then(response => response.json())
                 .then(data => {
                     if (data.success) {
                         populateSnapshots(data.snapshots, provider);
-                        repositoryInfo.innerHTML = `<strong>${provider.terminology.browser_title}:</strong> ${currentJob} (${data.count} ${provider.terminology.units})`;
+                        repositoryInfo.innerHTML = `<strong>${provider.terminology.browser_title}:</strong> ${currentJob} (${data.count} ${provider.terminology.units})` +
+                            ` <a href="#" onclick="loadBackupJob(true); return false;">Refresh</a>`;
                         updateSnapshotSectionLabels(provider);
                         snapshotSection.classList.remove('hidden');
                     } else {